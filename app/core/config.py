@@ -1,7 +1,7 @@
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 import os
-from typing import List,Optional
+from typing import Dict,List,Optional
 
 load_dotenv()  # ✅ This makes sure your updated .env is loaded
 
@@ -55,6 +55,41 @@ class Settings(BaseSettings):
     OTP_TTL_SECONDS: int = 300
     RESET_TOKEN_TTL_SECONDS: int = 900
     APP_NAME: str = "TripMate"
+
+    # In-process service catalog used by recommendations
+    SERVICE_CATALOG_ENABLED: bool = True
+    SERVICE_CATALOG_SYNC_SECONDS: float = 1.0  # how often workers poll for catalog changes
+    SERVICE_CATALOG_MAX_AGE_SECONDS: int = 3600  # full reload interval
+    RECOMMENDATION_RECOMPUTE_DEBOUNCE_SECONDS: float = 5.0  # quiet period before a recompute runs
+    RECOMMENDATION_RADIUS_KM: float = 25.0  # search radius around trips that have coordinates
+
+    # LLM client
+    LLM_MODEL: str = "google/gemini-2.0-flash-001"
+    LLM_MAX_CONCURRENCY: int = 8  # in-flight LLM requests per worker
+    LLM_TIMEOUT_SECONDS: float = 60.0  # per attempt
+    LLM_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    LLM_MAX_RETRIES: int = 2
+    LLM_RETRY_BASE_SECONDS: float = 0.5  # backoff is uniform(0, min(max, base * 2^attempt))
+    LLM_RETRY_MAX_SECONDS: float = 8.0
+    # extra routes tried by expected latency with the primary (LLM_MODEL at BASE_URL), as JSON:
+    # [{"model": "...", "base_url": "...", "api_key": "..."}]; base_url and api_key default to the primary's
+    LLM_FALLBACK_ROUTES: List[Dict[str, str]] = []
+    LLM_HEDGE_ENABLED: bool = True  # duplicate slow calls to the next best route
+    LLM_HEDGE_QUANTILE: float = 0.95  # hedge once a call is slower than this share of recent ones
+    LLM_HEDGE_DEFAULT_DELAY_SECONDS: float = 5.0  # hedge delay until a route has enough samples
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = 0.25
+    LLM_ROUTER_WINDOW: int = 200  # recent calls kept per route
+    LLM_ROUTER_MIN_SAMPLES: int = 20  # calls needed before a route's p95 is trusted for hedging
+    LLM_ROUTER_EXPLORE_RATE: float = 0.05  # share of calls sent to another route first to keep its samples fresh
+    LLM_STRUCTURED_OUTPUT: bool = True  # send a JSON schema with itinerary prompts; off for backends without it
+    LLM_USER_TOKENS_PER_MINUTE: int = 20000  # per-user budget refill; 0 disables budgets
+    LLM_USER_TOKEN_BURST: int = 200000  # per-user budget capacity
+    LLM_BUDGET_MAX_WAIT_SECONDS: float = 10.0  # interactive requests wait this long for budget, then get 429
+    LLM_USAGE_RETENTION_DAYS: int = 35
+    AI_ITINERARY_CHUNK_DAYS: int = 4  # long trips are generated in day ranges of this size
+    AI_ITINERARY_PARALLEL_CHUNKS: int = 4  # day ranges generated concurrently per preview
+    AI_JOB_TTL_SECONDS: int = 86400  # how long job status and results are kept
+    AI_JOB_STALE_SECONDS: int = 600  # unfinished jobs silent this long are not shared
     
 
 
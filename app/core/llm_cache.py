@@ -0,0 +1,128 @@
+# core/llm_cache.py
+#
+# Content-addressed cache for LLM completions. The key is a hash of the
+# model, messages, temperature and output schema, so any caller asking the same question
+# gets the same stored answer. Concurrent identical requests in a worker
+# share one upstream call (single flight); the result is stored in Redis
+# for every other worker. Counters live in a Redis hash so the hit rate is
+# visible across workers.
+
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.logger import logger
+from app.core.redis_lifecyle import init_redis_client
+
+LLM_CACHE_TTL_SECONDS = 7 * 86400
+LLM_CACHE_STATS_KEY = "llm:cache:stats"
+STAT_FIELDS = ("hits", "coalesced", "misses", "forced")
+
+
+@dataclass
+class _Flight:
+    task: "asyncio.Task[str]"
+    waiters: int = 0
+
+
+# key -> in-flight upstream call in this worker
+_inflight: Dict[str, _Flight] = {}
+
+
+def completion_key(
+    model: str,
+    messages: List[Dict[str, Any]],
+    temperature: float,
+    response_format: Optional[Dict[str, Any]] = None
+) -> str:
+    request = {"model": model, "messages": messages, "temperature": temperature}
+    if response_format is not None:
+        # only when set, so keys for unconstrained completions stay the same
+        request["response_format"] = response_format
+    payload = json.dumps(request, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return f"llm:completion:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+
+async def count_cache_event(field: str) -> None:
+    try:
+        redis_client = await init_redis_client()
+        await redis_client.hincrby(LLM_CACHE_STATS_KEY, field, 1)
+    except Exception as e:
+        logger.error(f"🔥 [LLM Cache] Failed to record {field}: {e}")
+
+
+async def read_completion(key: str) -> Optional[str]:
+    try:
+        redis_client = await init_redis_client()
+        return await redis_client.get(key)
+    except Exception as e:
+        logger.error(f"🔥 [LLM Cache] Read failed for {key}: {e}")
+        return None
+
+
+async def store_completion(key: str, content: str, accept: Optional[Callable[[str], bool]] = None) -> None:
+    if accept is None or accept(content):
+        try:
+            redis_client = await init_redis_client()
+            await redis_client.set(key, content, ex=LLM_CACHE_TTL_SECONDS)
+        except Exception as e:
+            logger.error(f"🔥 [LLM Cache] Write failed for {key}: {e}")
+    else:
+        logger.warning(f"⚠️ [LLM Cache] Not caching rejected completion {key}")
+
+
+async def _fetch_and_store(key: str, fetch: Callable[[], Awaitable[str]], accept: Optional[Callable[[str], bool]]) -> str:
+    content = await fetch()
+    await store_completion(key, content, accept)
+    return content
+
+
+async def cached_completion(
+    key: str,
+    fetch: Callable[[], Awaitable[str]],
+    force_refresh: bool = False,
+    accept: Optional[Callable[[str], bool]] = None
+) -> str:
+    """
+    Return the stored completion for `key`, or call `fetch` once for all
+    concurrent callers of the same key and store its result. `force_refresh`
+    skips the stored value (it still replaces it). `accept` can veto caching
+    a completion the caller could not use.
+    """
+    if not force_refresh:
+        cached = await read_completion(key)
+        if cached is not None:
+            await count_cache_event("hits")
+            return cached
+
+    # no await between the lookup and the registration, so callers can't both start a call
+    flight = _inflight.get(key)
+    if flight is not None:
+        stat = "coalesced"
+    else:
+        stat = "forced" if force_refresh else "misses"
+        flight = _Flight(asyncio.ensure_future(_fetch_and_store(key, fetch, accept)))
+        _inflight[key] = flight
+        flight.task.add_done_callback(lambda _: _inflight.pop(key, None))
+    flight.waiters += 1
+
+    try:
+        await count_cache_event(stat)
+        # shield: one caller going away must not cancel the call the others share
+        return await asyncio.shield(flight.task)
+    finally:
+        flight.waiters -= 1
+        if not flight.waiters and not flight.task.done():
+            # everyone left (e.g. clients disconnected): free the upstream slot
+            flight.task.cancel()
+
+
+async def get_llm_cache_stats() -> Dict[str, Any]:
+    redis_client = await init_redis_client()
+    raw = await redis_client.hgetall(LLM_CACHE_STATS_KEY)
+    stats = {field: int(raw.get(field, 0)) for field in STAT_FIELDS}
+    total = sum(stats.values())
+    stats["hit_rate"] = round((stats["hits"] + stats["coalesced"]) / total, 4) if total else 0.0
+    return stats
@@ -1,39 +1,295 @@
-from openai import OpenAI
-import os
+import asyncio
+import random
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+import httpx
+from fastapi import HTTPException, Request
+from openai import (
+    APIConnectionError, APIStatusError, APITimeoutError, AsyncOpenAI,
+    InternalServerError, OpenAIError, RateLimitError
+)
+
 from app.core.config import settings
 from app.core.logger import logger
-from fastapi import HTTPException, status
-from typing import List, Dict, Any
-from openai import OpenAIError
-
-client = OpenAI(
-    api_key=settings.OPENROUTER_API_KEY,
-    base_url=settings.BASE_URL,
+from app.core.llm_router import LLMRouter, Route
+from app.core.llm_usage import estimate_tokens, record_usage
+from app.core.llm_cache import (
+    cached_completion, completion_key, count_cache_event, read_completion, store_completion
 )
 
+T = TypeVar("T")
 
+SYSTEM_PROMPT = "You are an expert travel planner and itinerary creator. Your goal is to design detailed, day-by-day travel plans based on user requests, ensuring the output is always a well-structured JSON array."
 
-def get_ai_completion(prompt: str) -> str:
-    try:
-        response = client.chat.completions.create(
-            model="google/gemini-2.0-flash-001",
-            messages=[
-            {"role": "system", "content": "You are an expert travel planner and itinerary creator. Your goal is to design detailed, day-by-day travel plans based on user requests, ensuring the output is always a well-structured JSON array."},
-            {"role": "user", "content": prompt},
-            ],
-            temperature=0.7
+# Failures worth another attempt; 4xx other than 429 are the caller's fault
+RETRYABLE_ERRORS = (APITimeoutError, APIConnectionError, RateLimitError, InternalServerError, asyncio.TimeoutError)
+
+
+class LLMClient:
+    """
+    Async chat-completion client. One pooled HTTP client is shared by all
+    calls; a semaphore caps how many requests are in flight per worker, and
+    each attempt has its own timeout. Retries back off with full jitter and
+    do not hold a concurrency slot while sleeping.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        model: str = settings.LLM_MODEL,
+        max_concurrency: int = settings.LLM_MAX_CONCURRENCY,
+        timeout: float = settings.LLM_TIMEOUT_SECONDS,
+        max_retries: int = settings.LLM_MAX_RETRIES,
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
+        self.model = model
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._http = http_client or httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout, connect=settings.LLM_CONNECT_TIMEOUT_SECONDS),
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
         )
-    except OpenAIError as e:
-        logger.error(f"🔥 LLM backend error: {e}")
-        raise HTTPException(status_code=502, detail="AI model is temporarily unavailable.")
-    logger.info("✅ LLM connection successful. Response received.")
-    
-    # print(response.choices[0].message.content)
-  
-    if not response.choices:
-        logger.error("❌ No choices returned from LLM!")
-        raise ValueError("LLM did not return any content.")
-  
-    return response.choices[0].message.content
+        # retries are ours, so the SDK must not retry underneath them
+        self._client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=self._http, max_retries=0)
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(settings.LLM_RETRY_MAX_SECONDS, settings.LLM_RETRY_BASE_SECONDS * 2 ** attempt))
+
+    @staticmethod
+    def _give_up(e: Exception, attempts: int) -> HTTPException:
+        logger.error(f"🔥 LLM call failed after {attempts} attempt(s): {e!r}")
+        if isinstance(e, (APITimeoutError, asyncio.TimeoutError)):
+            return HTTPException(status_code=504, detail="AI model timed out.")
+        return HTTPException(status_code=502, detail="AI model is temporarily unavailable.")
+
+    @staticmethod
+    def _format_args(response_format: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        # left out entirely when unset; not every backend accepts the parameter
+        return {"response_format": response_format} if response_format is not None else {}
+
+    async def _record_usage(self, messages: List[Dict[str, Any]], content: str, usage: Any, started: float) -> None:
+        latency = time.monotonic() - started
+        if usage is not None and usage.prompt_tokens is not None:
+            await record_usage(self.model, usage.prompt_tokens, usage.completion_tokens or 0, latency)
+        else:
+            prompt = "".join(str(message.get("content", "")) for message in messages)
+            await record_usage(self.model, estimate_tokens(prompt), estimate_tokens(content), latency, estimated=True)
+
+    async def complete(
+        self,
+        messages: List[Dict[str, Any]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> str:
+        timeout = timeout or self.timeout
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._semaphore:
+                    started = time.monotonic()
+                    response = await asyncio.wait_for(
+                        self._client.chat.completions.create(
+                            model=model or self.model,
+                            messages=messages,
+                            temperature=temperature,
+                            timeout=timeout,
+                            **self._format_args(response_format),
+                        ),
+                        timeout
+                    )
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_retries:
+                    raise self._give_up(e, attempt + 1)
+                delay = self._backoff(attempt)
+                logger.warning(f"⚡ LLM attempt {attempt + 1} failed ({type(e).__name__}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+            except (APIStatusError, OpenAIError) as e:
+                logger.error(f"🔥 LLM backend error: {e}")
+                raise HTTPException(status_code=502, detail="AI model is temporarily unavailable.")
+
+            if not response.choices:
+                logger.error("❌ No choices returned from LLM!")
+                raise ValueError("LLM did not return any content.")
+            logger.info("✅ LLM connection successful. Response received.")
+            content = response.choices[0].message.content
+            await self._record_usage(messages, content or "", getattr(response, "usage", None), started)
+            return content
+
+    async def stream(
+        self,
+        messages: List[Dict[str, Any]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Yield content deltas as the model produces them. The concurrency slot
+        is held until the stream ends or the consumer stops iterating. Only
+        failures before the first delta are retried; `timeout` bounds the wait
+        for the response to start and for each following chunk.
+        """
+        timeout = timeout or self.timeout
+        for attempt in range(self.max_retries + 1):
+            started = False
+            try:
+                async with self._semaphore:
+                    began = time.monotonic()
+                    stream = await asyncio.wait_for(
+                        self._client.chat.completions.create(
+                            model=model or self.model,
+                            messages=messages,
+                            temperature=temperature,
+                            stream=True,
+                            timeout=timeout,
+                            **self._format_args(response_format),
+                        ),
+                        timeout
+                    )
+                    parts, usage = [], None
+                    try:
+                        async for chunk in stream:
+                            # some backends report usage on the last chunk; otherwise it's estimated
+                            usage = getattr(chunk, "usage", None) or usage
+                            delta = chunk.choices[0].delta.content if chunk.choices else None
+                            if delta:
+                                started = True
+                                parts.append(delta)
+                                yield delta
+                    finally:
+                        await stream.close()
+                await self._record_usage(messages, "".join(parts), usage, began)
+                return
+            except RETRYABLE_ERRORS as e:
+                if started or attempt == self.max_retries:
+                    raise self._give_up(e, attempt + 1)
+                delay = self._backoff(attempt)
+                logger.warning(f"⚡ LLM stream attempt {attempt + 1} failed ({type(e).__name__}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+            except (APIStatusError, OpenAIError) as e:
+                logger.error(f"🔥 LLM backend error: {e}")
+                raise HTTPException(status_code=502, detail="AI model is temporarily unavailable.")
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
 
+_llm_client: Optional[LLMRouter] = None
 
+
+def build_routes() -> List[Route]:
+    """The primary route (LLM_MODEL at BASE_URL) followed by LLM_FALLBACK_ROUTES."""
+    configs = [{"model": settings.LLM_MODEL}] + settings.LLM_FALLBACK_ROUTES
+    routes = []
+    for config in configs:
+        base_url = config.get("base_url", settings.BASE_URL)
+        client = LLMClient(
+            base_url=base_url,
+            api_key=config.get("api_key", settings.OPENROUTER_API_KEY),
+            model=config["model"]
+        )
+        routes.append(Route(f"{config['model']}@{base_url}", client))
+    return routes
+
+
+def get_llm_client() -> LLMRouter:
+    global _llm_client
+    if _llm_client is None:
+        _llm_client = LLMRouter(build_routes())
+    return _llm_client
+
+
+async def close_llm_client() -> None:
+    """Close the pooled HTTP clients of every route on application shutdown."""
+    global _llm_client
+    if _llm_client is not None:
+        await _llm_client.aclose()
+        _llm_client = None
+
+
+def build_messages(prompt: str) -> List[Dict[str, Any]]:
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+async def get_ai_completion(
+    prompt: str,
+    timeout: Optional[float] = None,
+    temperature: float = 0.7,
+    force_refresh: bool = False,
+    accept: Optional[Callable[[str], bool]] = None,
+    response_format: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Cached completion for `prompt` (see app.core.llm_cache). `force_refresh`
+    generates a fresh answer; `accept` rejects answers not worth caching;
+    `response_format` asks the backend to constrain the output (e.g. to a
+    JSON schema).
+    """
+    client = get_llm_client()
+    messages = build_messages(prompt)
+    return await cached_completion(
+        completion_key(client.model, messages, temperature, response_format),
+        lambda: client.complete(messages, temperature=temperature, timeout=timeout, response_format=response_format),
+        force_refresh=force_refresh,
+        accept=accept
+    )
+
+
+async def stream_ai_completion(
+    prompt: str,
+    timeout: Optional[float] = None,
+    temperature: float = 0.7,
+    force_refresh: bool = False,
+    accept: Optional[Callable[[str], bool]] = None,
+    response_format: Optional[Dict[str, Any]] = None
+) -> AsyncIterator[str]:
+    """
+    Streaming counterpart of get_ai_completion, sharing its cache: a stored
+    answer is yielded in one piece, a fresh one chunk by chunk and stored
+    once complete (if `accept` allows).
+    """
+    client = get_llm_client()
+    messages = build_messages(prompt)
+    key = completion_key(client.model, messages, temperature, response_format)
+    if not force_refresh:
+        cached = await read_completion(key)
+        if cached is not None:
+            await count_cache_event("hits")
+            yield cached
+            return
+
+    await count_cache_event("forced" if force_refresh else "misses")
+    parts = []
+    async for delta in client.stream(messages, temperature=temperature, timeout=timeout, response_format=response_format):
+        parts.append(delta)
+        yield delta
+    await store_completion(key, "".join(parts), accept)
+
+
+async def cancel_on_disconnect(request: Request, awaitable: Awaitable[T], poll_interval: float = 0.5) -> T:
+    """
+    Await `awaitable`, cancelling it if the HTTP client goes away first, so
+    abandoned requests stop holding LLM concurrency slots and connections.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                logger.info("⚡ Client disconnected, cancelling LLM request")
+                task.cancel()
+                # 499: client closed request (nobody is left to read it)
+                raise HTTPException(status_code=499, detail="Client closed request")
+    finally:
+        if not task.done():
+            task.cancel()
@@ -0,0 +1,49 @@
+# core/llm_metrics.py
+#
+# Counters for how usable LLM answers are. Every parsed answer bumps
+# "parsed"; answers that needed local repair also bump "repaired" and one
+# counter per kind of repair, so a rising rate shows up before answers
+# start failing outright. Kept in a Redis hash so all workers add up.
+
+from typing import Any, Dict, Iterable
+
+from app.core.logger import logger
+from app.core.redis_lifecyle import init_redis_client
+
+LLM_PARSE_STATS_KEY = "llm:parse:stats"
+PARSE_FIELDS = ("parsed", "repaired", "failed")
+REPAIR_FIELDS = ("wrapper", "trailing_comma", "truncated", "single_day", "key_alias", "dropped_day")
+
+
+async def record_parse(repairs: Iterable[str]) -> None:
+    repairs = set(repairs)
+    try:
+        redis_client = await init_redis_client()
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.hincrby(LLM_PARSE_STATS_KEY, "parsed", 1)
+            if repairs:
+                pipe.hincrby(LLM_PARSE_STATS_KEY, "repaired", 1)
+            for repair in repairs:
+                pipe.hincrby(LLM_PARSE_STATS_KEY, repair, 1)
+            await pipe.execute()
+    except Exception as e:
+        logger.error(f"🔥 [LLM Metrics] Failed to record parse: {e}")
+
+
+async def count_parse_failure() -> None:
+    try:
+        redis_client = await init_redis_client()
+        await redis_client.hincrby(LLM_PARSE_STATS_KEY, "failed", 1)
+    except Exception as e:
+        logger.error(f"🔥 [LLM Metrics] Failed to record parse failure: {e}")
+
+
+async def get_llm_parse_stats() -> Dict[str, Any]:
+    redis_client = await init_redis_client()
+    raw = await redis_client.hgetall(LLM_PARSE_STATS_KEY)
+    stats: Dict[str, Any] = {field: int(raw.get(field, 0)) for field in PARSE_FIELDS}
+    stats["repairs"] = {field: int(raw.get(field, 0)) for field in REPAIR_FIELDS}
+    total = stats["parsed"] + stats["failed"]
+    stats["repair_rate"] = round(stats["repaired"] / stats["parsed"], 4) if stats["parsed"] else 0.0
+    stats["failure_rate"] = round(stats["failed"] / total, 4) if total else 0.0
+    return stats
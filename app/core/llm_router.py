@@ -0,0 +1,243 @@
+# core/llm_router.py
+#
+# Routes LLM calls across several model endpoints. Each route keeps a
+# rolling window of its latencies and failures; calls go to the route with
+# the lowest expected latency, and if it has not answered by its p95 a
+# hedged copy goes to the next best route. Whichever answers first wins and
+# the other call is cancelled. A failed call fails over to the next route.
+# A small share of calls goes to another route first so every route keeps
+# fresh samples (new routes get measured, demoted ones can recover); those
+# calls hedge to the best route on its usual delay. Streams are routed the
+# same way on time to first token.
+
+import asyncio
+import random
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+from app.core.config import settings
+from app.core.logger import logger
+
+if TYPE_CHECKING:
+    from app.core.llm_client import LLMClient
+
+T = TypeVar("T")
+
+MEDIAN_MIN_SAMPLES = 5  # a median settles long before a p95 does
+
+
+class RouteStats:
+    """Rolling latency and outcome samples for one route."""
+
+    def __init__(self, window: int = settings.LLM_ROUTER_WINDOW):
+        self.latencies: Deque[float] = deque(maxlen=window)  # full completions
+        self.first_tokens: Deque[float] = deque(maxlen=window)  # streams
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+
+    def record(self, seconds: float, first_token: bool = False) -> None:
+        (self.first_tokens if first_token else self.latencies).append(seconds)
+        self.outcomes.append(True)
+
+    def record_error(self) -> None:
+        self.outcomes.append(False)
+
+    def error_rate(self) -> float:
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def quantile(
+        self, q: float, first_token: bool = False, min_samples: int = settings.LLM_ROUTER_MIN_SAMPLES
+    ) -> Optional[float]:
+        """None until the window has enough samples to trust."""
+        samples = self.first_tokens if first_token else self.latencies
+        if len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def expected_latency(self, first_token: bool = False) -> Optional[float]:
+        median = self.quantile(0.5, first_token, MEDIAN_MIN_SAMPLES)
+        if median is None:
+            return None
+        # a failed call costs another attempt: expect 1 / (1 - error rate) of them
+        return median / (1 - min(self.error_rate(), 0.9))
+
+
+class Route:
+    def __init__(self, name: str, client: "LLMClient"):
+        self.name = name
+        self.client = client
+        self.stats = RouteStats()
+
+
+class LLMRouter:
+    """
+    Drop-in for LLMClient over several routes. `model` is the first route's
+    model, so completion cache keys don't depend on which route answered.
+    """
+
+    def __init__(self, routes: List[Route], hedge: bool = settings.LLM_HEDGE_ENABLED):
+        if not routes:
+            raise ValueError("LLMRouter needs at least one route")
+        self.routes = routes
+        self.hedge = hedge
+        self.model = routes[0].client.model
+
+    def ranked(self, first_token: bool = False, model: Optional[str] = None) -> List[Route]:
+        """Routes by expected latency; routes without enough samples keep their configured order after them."""
+        routes = [route for route in self.routes if route.client.model == model] if model else self.routes
+        routes = routes or self.routes
+
+        def key(indexed: Tuple[int, Route]):
+            index, route = indexed
+            expected = route.stats.expected_latency(first_token)
+            return (expected is None, expected or 0.0, index)
+
+        return [route for _, route in sorted(enumerate(routes), key=key)]
+
+    def hedge_delay(self, route: Route, first_token: bool = False) -> float:
+        p = route.stats.quantile(settings.LLM_HEDGE_QUANTILE, first_token)
+        if p is None:
+            return settings.LLM_HEDGE_DEFAULT_DELAY_SECONDS
+        return max(settings.LLM_HEDGE_MIN_DELAY_SECONDS, p)
+
+    def plan(self, first_token: bool = False, model: Optional[str] = None) -> Tuple[List[Route], float]:
+        """Routes in the order to try them, and how long to wait before hedging."""
+        ranked = self.ranked(first_token, model)
+        delay = self.hedge_delay(ranked[0], first_token)
+        if len(ranked) > 1 and random.random() < settings.LLM_ROUTER_EXPLORE_RATE:
+            explore = random.choice(ranked[1:])
+            ranked = [explore] + [route for route in ranked if route is not explore]
+        return ranked, delay
+
+    async def _race(
+        self,
+        ranked: List[Route],
+        call: Callable[[Route], Awaitable[T]],
+        delay: float,
+        discard: Optional[Callable[[T], Awaitable[None]]] = None
+    ) -> T:
+        """
+        Run `call` on the best route, hedging to the next one after `delay`
+        and failing over when a call fails. At most two calls are in flight.
+        `discard` releases results that arrive after another call has won.
+        """
+        queue = list(ranked[1:])
+        pending: Dict["asyncio.Future[T]", Route] = {asyncio.ensure_future(call(ranked[0])): ranked[0]}
+        hedge_at = time.monotonic() + delay if self.hedge and queue else None
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                wait = max(0.0, hedge_at - time.monotonic()) if hedge_at is not None else None
+                done, _ = await asyncio.wait(pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    route = queue.pop(0)
+                    logger.info(f"⚡ [LLM Router] No answer after {delay:.2f}s, hedging to {route.name}")
+                    pending[asyncio.ensure_future(call(route))] = route
+                    hedge_at = None
+                    continue
+                winner = None
+                for task in done:
+                    route = pending.pop(task)
+                    if task.exception() is not None:
+                        error = task.exception()
+                        logger.warning(f"⚠️ [LLM Router] {route.name} failed: {error!r}")
+                    elif winner is None:
+                        winner = task
+                    elif discard is not None:
+                        await discard(task.result())
+                if winner is not None:
+                    return winner.result()
+                if not pending and queue:
+                    route = queue.pop(0)
+                    logger.info(f"⚡ [LLM Router] Failing over to {route.name}")
+                    pending[asyncio.ensure_future(call(route))] = route
+            raise error
+        finally:
+            def release(task: "asyncio.Future[T]") -> None:
+                if not task.cancelled() and task.exception() is None:
+                    asyncio.ensure_future(discard(task.result()))
+
+            for task in pending:
+                task.cancel()
+                if discard is not None:
+                    # a call may finish before the cancellation lands; don't leak what it opened
+                    task.add_done_callback(release)
+
+    async def _timed_complete(self, route: Route, messages: List[Dict[str, Any]], **kwargs: Any) -> str:
+        started = time.monotonic()
+        try:
+            content = await route.client.complete(messages, **kwargs)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            route.stats.record_error()
+            raise
+        route.stats.record(time.monotonic() - started)
+        return content
+
+    async def complete(
+        self,
+        messages: List[Dict[str, Any]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> str:
+        ranked, delay = self.plan(model=model)
+        return await self._race(
+            ranked,
+            lambda route: self._timed_complete(
+                route, messages, temperature=temperature, timeout=timeout, response_format=response_format
+            ),
+            delay
+        )
+
+    async def _open_stream(self, route: Route, messages: List[Dict[str, Any]], **kwargs: Any) -> Tuple[AsyncIterator[str], str]:
+        """Start a stream on `route` and wait for its first delta."""
+        deltas = route.client.stream(messages, **kwargs)
+        started = time.monotonic()
+        try:
+            first = await deltas.__anext__()
+        except StopAsyncIteration:
+            first = ""
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            route.stats.record_error()
+            raise
+        route.stats.record(time.monotonic() - started, first_token=True)
+        return deltas, first
+
+    async def stream(
+        self,
+        messages: List[Dict[str, Any]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        ranked, delay = self.plan(first_token=True, model=model)
+
+        async def close(opened: Tuple[AsyncIterator[str], str]) -> None:
+            await opened[0].aclose()
+
+        deltas, first = await self._race(
+            ranked,
+            lambda route: self._open_stream(
+                route, messages, temperature=temperature, timeout=timeout, response_format=response_format
+            ),
+            delay,
+            discard=close
+        )
+        try:
+            if first:
+                yield first
+            async for delta in deltas:
+                yield delta
+        finally:
+            await deltas.aclose()
+
+    async def aclose(self) -> None:
+        for route in self.routes:
+            await route.client.aclose()
@@ -0,0 +1,218 @@
+# core/llm_usage.py
+#
+# Token and latency accounting for LLM calls, and per-user token budgets.
+#
+# Every upstream response is recorded against the user and trip it was made
+# for (set once per request with set_usage_owner; the value follows the
+# call through the cache, router and chunk tasks). Counters are Redis
+# hashes per UTC day: totals, per user and per trip, plus sorted sets of the
+# heaviest users and trips. Cache hits cost nothing and are not recorded.
+#
+# Budgets are token buckets per user: LLM_USER_TOKEN_BURST tokens, refilled
+# at LLM_USER_TOKENS_PER_MINUTE. A request is admitted while the bucket is
+# positive and its actual usage is charged afterwards (the cost of a
+# completion isn't known up front), so one request can overdraw and the
+# next ones wait for the refill. Each check or charge is one script call.
+
+import asyncio
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.redis_lifecyle import init_redis_client
+
+USAGE_KEY_PREFIX = "llm:usage"
+BUDGET_KEY_PREFIX = "llm:budget:user"
+USAGE_FIELDS = ("calls", "prompt_tokens", "completion_tokens", "latency_ms", "estimated_calls")
+CHARS_PER_TOKEN = 4  # estimate for backends that don't report usage
+
+# KEYS[1] = bucket hash; ARGV = capacity, refill per second, now, cost, ttl.
+# Refills for the time since the last call, subtracts `cost` and returns the
+# new level (as a string: Lua numbers come back from Redis truncated).
+_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local level = tonumber(redis.call('HGET', KEYS[1], 'level'))
+local ts = tonumber(redis.call('HGET', KEYS[1], 'ts'))
+if level == nil then
+    level = capacity
+    ts = now
+end
+level = math.min(capacity, level + math.max(0, now - ts) * rate) - tonumber(ARGV[4])
+redis.call('HSET', KEYS[1], 'level', tostring(level), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+return tostring(level)
+"""
+
+
+@dataclass(frozen=True)
+class UsageOwner:
+    user_id: int
+    trip_id: Optional[int] = None
+
+
+_usage_owner: ContextVar[Optional[UsageOwner]] = ContextVar("llm_usage_owner", default=None)
+
+
+def set_usage_owner(user_id: int, trip_id: Optional[int] = None) -> None:
+    """Attribute LLM calls made for the rest of this request (or job) to the user and trip."""
+    _usage_owner.set(UsageOwner(user_id, trip_id))
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN) if text else 0
+
+
+def usage_key(day: date, scope: str) -> str:
+    return f"{USAGE_KEY_PREFIX}:{day.isoformat()}:{scope}"
+
+
+def budget_key(user_id: int) -> str:
+    return f"{BUDGET_KEY_PREFIX}:{user_id}"
+
+
+def _budget_enabled() -> bool:
+    return settings.LLM_USER_TOKENS_PER_MINUTE > 0
+
+
+async def _bucket(user_id: int, cost: float) -> float:
+    """Refill and charge `cost` tokens; returns the level left."""
+    rate = settings.LLM_USER_TOKENS_PER_MINUTE / 60
+    # an untouched bucket is full again after capacity / rate seconds
+    ttl = int(settings.LLM_USER_TOKEN_BURST / rate) + 60
+    redis_client = await init_redis_client()
+    level = await redis_client.eval(
+        _BUCKET_SCRIPT, 1, budget_key(user_id),
+        settings.LLM_USER_TOKEN_BURST, rate, time.time(), cost, ttl
+    )
+    return float(level)
+
+
+async def record_usage(
+    model: str,
+    prompt_tokens: int,
+    completion_tokens: int,
+    latency_seconds: float,
+    estimated: bool = False
+) -> None:
+    """Record one upstream response against the current owner, and charge their budget."""
+    owner = _usage_owner.get()
+    tokens = prompt_tokens + completion_tokens
+    today = datetime.now(timezone.utc).date()
+    ttl = settings.LLM_USAGE_RETENTION_DAYS * 86400
+    values = {
+        "calls": 1,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "latency_ms": int(latency_seconds * 1000),
+        "estimated_calls": int(estimated),
+    }
+    scopes = ["total", f"model:{model}"]
+    if owner is not None:
+        scopes.append(f"user:{owner.user_id}")
+        if owner.trip_id is not None:
+            scopes.append(f"trip:{owner.trip_id}")
+    try:
+        redis_client = await init_redis_client()
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for scope in scopes:
+                key = usage_key(today, scope)
+                for field, value in values.items():
+                    pipe.hincrby(key, field, value)
+                pipe.expire(key, ttl)
+            if owner is not None:
+                pipe.zincrby(usage_key(today, "top_users"), tokens, owner.user_id)
+                pipe.expire(usage_key(today, "top_users"), ttl)
+                if owner.trip_id is not None:
+                    pipe.zincrby(usage_key(today, "top_trips"), tokens, owner.trip_id)
+                    pipe.expire(usage_key(today, "top_trips"), ttl)
+            await pipe.execute()
+        if owner is not None and _budget_enabled():
+            await _bucket(owner.user_id, tokens)
+    except Exception as e:
+        logger.error(f"🔥 [LLM Usage] Failed to record usage: {e}")
+
+
+async def check_llm_budget(user_id: int, max_wait: float = settings.LLM_BUDGET_MAX_WAIT_SECONDS) -> None:
+    """
+    Admit a request if the user's bucket is positive, waiting up to
+    `max_wait` seconds for it to refill; otherwise 429 with Retry-After.
+    Fails open if Redis is unavailable.
+    """
+    if not _budget_enabled():
+        return
+    deadline = time.monotonic() + max_wait
+    while True:
+        try:
+            level = await _bucket(user_id, 0)
+        except Exception as e:
+            logger.error(f"🔥 [LLM Usage] Budget check failed for user {user_id}: {e}")
+            return
+        if level > 0:
+            return
+        # time until the refill brings the bucket back above zero
+        wait = -level / (settings.LLM_USER_TOKENS_PER_MINUTE / 60) + 0.05
+        if time.monotonic() + wait > deadline:
+            logger.warning(f"⚠️ [LLM Usage] User {user_id} is over their token budget")
+            raise HTTPException(
+                status_code=429,
+                detail="AI usage limit reached, please try again later.",
+                headers={"Retry-After": str(int(wait) + 1)}
+            )
+        await asyncio.sleep(wait)
+
+
+async def get_budget_level(user_id: int) -> Optional[float]:
+    return await _bucket(user_id, 0) if _budget_enabled() else None
+
+
+def _usage_entry(raw: Dict[str, str]) -> Dict[str, Any]:
+    entry: Dict[str, Any] = {field: int(raw.get(field, 0)) for field in USAGE_FIELDS}
+    entry["total_tokens"] = entry["prompt_tokens"] + entry["completion_tokens"]
+    entry["avg_latency_ms"] = round(entry["latency_ms"] / entry["calls"], 1) if entry["calls"] else 0.0
+    return entry
+
+
+async def get_llm_usage(day: date, limit: int = 10) -> Dict[str, Any]:
+    """Totals for `day` plus the `limit` heaviest users and trips."""
+    redis_client = await init_redis_client()
+    top_users = await redis_client.zrevrange(usage_key(day, "top_users"), 0, limit - 1)
+    top_trips = await redis_client.zrevrange(usage_key(day, "top_trips"), 0, limit - 1)
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.hgetall(usage_key(day, "total"))
+        for user_id in top_users:
+            pipe.hgetall(usage_key(day, f"user:{user_id}"))
+        for trip_id in top_trips:
+            pipe.hgetall(usage_key(day, f"trip:{trip_id}"))
+        results = await pipe.execute()
+    total, users, trips = results[0], results[1:1 + len(top_users)], results[1 + len(top_users):]
+    return {
+        "day": day,
+        "total": _usage_entry(total),
+        "top_users": [{"id": int(user_id), **_usage_entry(raw)} for user_id, raw in zip(top_users, users)],
+        "top_trips": [{"id": int(trip_id), **_usage_entry(raw)} for trip_id, raw in zip(top_trips, trips)],
+    }
+
+
+async def get_user_llm_usage(user_id: int, days: int = 7) -> Dict[str, Any]:
+    """A user's daily usage for the last `days` days (today first) and their budget."""
+    today = datetime.now(timezone.utc).date()
+    window: List[date] = [today - timedelta(days=offset) for offset in range(days)]
+    redis_client = await init_redis_client()
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for day in window:
+            pipe.hgetall(usage_key(day, f"user:{user_id}"))
+        results = await pipe.execute()
+    return {
+        "user_id": user_id,
+        "days": [{"day": day, **_usage_entry(raw)} for day, raw in zip(window, results)],
+        "budget_tokens": await get_budget_level(user_id),
+        "budget_capacity": settings.LLM_USER_TOKEN_BURST if _budget_enabled() else None,
+    }
@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.routes import api_router
 from app.core.redis_lifecyle import init_redis_client, close_redis
+from app.core.llm_client import close_llm_client
 from starlette.middleware.sessions import SessionMiddleware
 
 app = FastAPI(
@@ -66,3 +67,4 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     await close_redis()
+    await close_llm_client()
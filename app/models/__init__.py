@@ -2,8 +2,8 @@ from .user.user import User
 from .trips.trip_model import Trip
 from .trips.trip_member import TripMember
 from .trips.trip_invite import TripInvite
-from .trips.trip_member_preference import TripMemberPreference
-from .trips.checklist_models import TripChecklist, ChecklistAssignment, ChecklistCompletion
+from .trips.trip_member_preference import TripMemberPreference, TripPreferenceProfile
+from .trips.checklist_models import TripChecklist, ChecklistAssignment, ChecklistCompletion, ChecklistTemplate, ChecklistTemplateItem
 from .itinerary.itinerary_model import Itinerary
 from .itinerary.activity import Activity
 from .service.service_provider import ServiceProvider, Service, TripSelectedService
@@ -1,6 +1,6 @@
 # app/models/activity.py
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Time
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Time, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -13,12 +13,22 @@ class Activity(Base):
     time = Column(Time, nullable=True)
     title = Column(String, nullable=False)
     description = Column(Text, nullable=True)
+    # Fractional ordering key (see app/utils/ordering.py); "C" collation keeps byte-wise order
+    position = Column(String(collation="C"), nullable=True)
 
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationship back to itinerary
     itinerary = relationship("Itinerary", back_populates="activities")
 
+    __table_args__ = (
+        # Deferred so a rebalance can rewrite keys row by row
+        UniqueConstraint(
+            "itinerary_id", "position", name="uq_activities_itinerary_position",
+            deferrable=True, initially="DEFERRED"
+        ),
+    )
+
     def to_dict(self):
         """Convert Activity instance to dictionary for caching"""
         return {
@@ -27,5 +37,6 @@ class Activity(Base):
             "time": self.time.strftime("%H:%M:%S") if self.time else None,
             "title": self.title,
             "description": self.description,
+            "position": self.position,
             "created_at": self.created_at.isoformat() if self.created_at else None
         }
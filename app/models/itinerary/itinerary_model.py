@@ -15,7 +15,7 @@ class Itinerary(Base):
 
     created_at= Column(DateTime,default=datetime.utcnow())
 
-    activities = relationship("Activity",back_populates="itinerary",cascade="all,delete-orphan")
+    activities = relationship("Activity",back_populates="itinerary",cascade="all,delete-orphan",order_by="[Activity.position, Activity.time]")
     trip = relationship("Trip", back_populates="itineraries")
 
     def to_dict(self):
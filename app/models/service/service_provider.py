@@ -1,10 +1,12 @@
 from sqlalchemy import (
     Column, Integer, String, Float, Boolean, Text, ForeignKey,
-    DateTime, JSON, Index
+    DateTime, JSON, Index, Computed, DDL, event
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from app.core.database import Base
+from app.utils.geo import encode_geohash
 
 
 class ServiceProvider(Base):
@@ -36,10 +38,23 @@ class Service(Base):
     title = Column(String, nullable=False)
     description = Column(Text)
     location = Column(String)
+    # Normalized location (lowercase, punctuation collapsed to single spaces),
+    # maintained by Postgres; see app.utils.normalize.normalize_location
+    location_key = Column(
+        String,
+        Computed("btrim(lower(regexp_replace(location, '[^[:alnum:]]+', ' ', 'g')))", persisted=True)
+    )
+    # Optional coordinates; geohash is derived from them on every write
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String(12, collation="C"), nullable=True)
     rating = Column(Float, nullable=True)
     price = Column(Float)
-    features = Column(JSON, nullable=True)  # flexible structure (room_types, amenities, vehicle info)
+    features = Column(JSONB, nullable=True)  # flexible structure (room_types, amenities, vehicle info)
     is_available = Column(Boolean, default=True)
+    # Weighted title (A) / provider name (B) / description (C) document,
+    # maintained by the triggers below; deferred so normal loads skip it
+    search_vector = deferred(Column(TSVECTOR))
     created_at = Column(DateTime, default=datetime.utcnow)
 
     provider = relationship("ServiceProvider", back_populates="services")
@@ -47,12 +62,80 @@ class Service(Base):
     __table_args__ = (
         Index("ix_service_type", "type"),
         Index("ix_service_location", "location"),
+        Index("ix_service_location_key", "location_key"),
+        # Trigram index so substring matches on location_key are index lookups
+        Index(
+            "ix_service_location_key_trgm", "location_key",
+            postgresql_using="gin",
+            postgresql_ops={"location_key": "gin_trgm_ops"}
+        ),
+        # Serves feature filters (@> containment and @? path checks)
+        Index("ix_service_features", "features", postgresql_using="gin"),
+        # Radius searches scan a few geohash prefix ranges
+        Index("ix_service_geohash", "geohash"),
+        Index("ix_service_search_vector", "search_vector", postgresql_using="gin"),
     )
     @property
     def provider_name(self):
         return self.provider.name if self.provider else None
 
 
+@event.listens_for(Service, "before_insert")
+@event.listens_for(Service, "before_update")
+def _set_service_geohash(mapper, connection, target):
+    if target.latitude is not None and target.longitude is not None:
+        target.geohash = encode_geohash(target.latitude, target.longitude)
+    else:
+        target.geohash = None
+
+
+# gin_trgm_ops needs the pg_trgm extension before the services table is created
+event.listen(
+    Service.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+)
+
+# search_vector is kept current in the database so bulk loads, provider
+# renames and any other writer are covered, not just the ORM paths.
+SEARCH_VECTOR_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION services_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(
+                (SELECT name FROM service_providers WHERE id = NEW.provider_id), '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER services_search_vector
+    BEFORE INSERT OR UPDATE OF title, description, provider_id ON services
+    FOR EACH ROW EXECUTE FUNCTION services_search_vector_update()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION service_providers_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        -- touching title re-runs services_search_vector for the provider's services
+        UPDATE services SET title = title WHERE provider_id = NEW.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER service_providers_search_vector
+    AFTER UPDATE OF name ON service_providers
+    FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION service_providers_search_vector_update()
+    """,
+]
+for statement in SEARCH_VECTOR_DDL:
+    event.listen(Service.__table__, "after_create", DDL(statement))
+
+
 class TripSelectedService(Base):
     __tablename__ = "trip_selected_services"
 
@@ -30,6 +30,8 @@ class TripChecklist(Base):
     priority = Column(Enum(TaskPriority), nullable=False, default=TaskPriority.medium)
     due_date = Column(DateTime, nullable=True)
     is_completed = Column(Boolean, default=False)
+    # Fractional ordering key (see app/utils/ordering.py); "C" collation keeps byte-wise order
+    position = Column(String(collation="C"), nullable=True)
     created_by = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -45,6 +47,11 @@ class TripChecklist(Base):
         Index("ix_trip_checklist_category", "category"),
         Index("ix_trip_checklist_priority", "priority"),
         Index("ix_trip_checklist_due_date", "due_date"),
+        # Deferred so a rebalance can rewrite keys row by row
+        UniqueConstraint(
+            "trip_id", "position", name="uq_trip_checklist_trip_position",
+            deferrable=True, initially="DEFERRED"
+        ),
     )
     @property
     def creator_name(self):
@@ -100,3 +107,40 @@ class ChecklistCompletion(Base):
     @property
     def user_name(self):
         return self.user.username if self.user else None
+
+class ChecklistTemplate(Base):
+    __tablename__ = "checklist_templates"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    description = Column(Text, nullable=True)
+    is_public = Column(Boolean, default=False)
+    created_by = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    creator = relationship("User", foreign_keys=[created_by])
+    items = relationship("ChecklistTemplateItem", back_populates="template", cascade="all, delete")
+
+    __table_args__ = (
+        Index("ix_checklist_templates_created_by", "created_by"),
+    )
+
+class ChecklistTemplateItem(Base):
+    __tablename__ = "checklist_template_items"
+
+    id = Column(Integer, primary_key=True, index=True)
+    template_id = Column(Integer, ForeignKey("checklist_templates.id", ondelete="CASCADE"))
+    title = Column(String, nullable=False)
+    description = Column(Text, nullable=True)
+    category = Column(Enum(TaskCategory), nullable=False, default=TaskCategory.other)
+    priority = Column(Enum(TaskPriority), nullable=False, default=TaskPriority.medium)
+    # Due date is resolved against the trip's start date when the template is cloned
+    due_days_before_start = Column(Integer, nullable=True)
+
+    # Relationships
+    template = relationship("ChecklistTemplate", back_populates="items")
+
+    __table_args__ = (
+        Index("ix_checklist_template_items_template_id", "template_id"),
+    )
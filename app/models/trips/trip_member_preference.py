@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Float, UniqueConstraint
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, UniqueConstraint, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
 from app.core.database import Base
 
 class TripMemberPreference(Base):
@@ -11,5 +13,29 @@ class TripMemberPreference(Base):
     food_preferences = Column(String, nullable=True)
     activity_interests = Column(String, nullable=True)
     pace = Column(String, nullable=True)
+    # hard requirements in the feature filter language, e.g. "amenities contains wifi"
+    feature_requirements = Column(JSONB, nullable=True)
 
     __table_args__ = (UniqueConstraint('trip_id', 'user_id', name='_trip_user_uc'),)
+
+
+class TripPreferenceProfile(Base):
+    """
+    Running aggregate of a trip's member preferences, kept up to date by
+    set_member_preference so recommendations read one row per trip.
+    Frequency maps hold value -> number of members.
+    """
+    __tablename__ = "trip_preference_profiles"
+    trip_id = Column(Integer, ForeignKey("trips.id", ondelete="CASCADE"), primary_key=True)
+    member_count = Column(Integer, nullable=False, default=0)
+    budget_sum = Column(Float, nullable=False, default=0.0)
+    budget_count = Column(Integer, nullable=False, default=0)
+    accommodation_type_counts = Column(JSONB, nullable=False, default=dict)
+    food_preferences_counts = Column(JSONB, nullable=False, default=dict)
+    activity_interests_counts = Column(JSONB, nullable=False, default=dict)
+    pace_counts = Column(JSONB, nullable=False, default=dict)
+    # preference terms (food, activity and pace words) -> number of members
+    term_counts = Column(JSONB, nullable=False, default=dict)
+    # normalized feature requirement -> number of members
+    requirement_counts = Column(JSONB, nullable=False, default=dict)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, Enum, DateTime, func
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Enum, DateTime, Float, func
 from app.core.database import Base
 from sqlalchemy.orm import relationship
 import enum
@@ -20,6 +20,9 @@ class Trip(Base):
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False)
     location = Column(String, nullable=False)
+    # Optional destination centre, used for radius searches
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
     budget = Column(Integer, nullable=False)
     trip_type = Column(Enum(TripTypeEnum), nullable=False)
 
@@ -42,6 +45,8 @@ class Trip(Base):
             "start_date": self.start_date.isoformat(),
             "end_date": self.end_date.isoformat(),
             "location": self.location,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
             "budget": self.budget,
             "trip_type": self.trip_type.value,
             "creator_id": self.creator_id,
@@ -2,14 +2,14 @@
 # app/routes/__init__.py
 from fastapi import APIRouter
 from app.routes.auth import auth, profile
-from app.routes.trip import trip_routes, trip_member, invitation, trip_member_preference, checklist
+from app.routes.trip import trip_routes, trip_member, invitation, trip_member_preference, checklist, checklist_template
 from app.routes.itineraries import itinerary_routes
 from app.routes.recommendations import recommend
 from app.routes.services import service_provider
 
 from app.routes.expense import expense
 from app.routes.auth import password_reset as password_reset_router
-from app.routes.services import service_analytics
+from app.routes.services import service_analytics, service_search
 from app.routes.admin import admin_analytics
 
 api_router = APIRouter()
@@ -61,6 +61,7 @@ api_router.include_router(trip_member.router)
 api_router.include_router(invitation.router)
 api_router.include_router(trip_member_preference.router)
 api_router.include_router(checklist.router)
+api_router.include_router(checklist_template.router)
 
 # Itinerary routes
 api_router.include_router(itinerary_routes.router)
@@ -71,6 +72,7 @@ api_router.include_router(recommend.router)
 
 # Service provider routes
 api_router.include_router(service_provider.router)
+api_router.include_router(service_search.router)
 
 # Alias /service-provider for test compatibility
 service_provider_alias = APIRouter()
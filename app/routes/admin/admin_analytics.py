@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends
+from datetime import date, datetime, timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user.user import UserRole
 from app.core.database import get_db
 from app.dependencies.auth import require_role
-from app.schemas.admin.admin_analytics import AdminAnalyticsResponse, NewUsersCountResponse,DailyUserRegistrationsResponse,DailyUserRegistration,UserMiniResponse
+from app.schemas.admin.admin_analytics import AdminAnalyticsResponse, NewUsersCountResponse,DailyUserRegistrationsResponse,DailyUserRegistration,UserMiniResponse,LLMCacheStatsResponse,LLMParseStatsResponse,LLMUsageResponse,LLMUserUsageResponse
 from app.services.admin.admin_analytics import AdminAnalyticsService
+from app.core.llm_cache import get_llm_cache_stats
+from app.core.llm_metrics import get_llm_parse_stats
+from app.core.llm_usage import get_llm_usage, get_user_llm_usage
 
 router = APIRouter(prefix="/admin/analytics", tags=["Admin Analytics"])
 
@@ -13,6 +18,30 @@ async def get_admin_analytics(db: AsyncSession = Depends(get_db),current_user =
     analytics = await AdminAnalyticsService.get_admin_analytics(db)
     return analytics
 
+@router.get("/llm-cache", response_model=LLMCacheStatsResponse)
+async def llm_cache_stats(current_user = Depends(require_role(UserRole.admin))):
+    return LLMCacheStatsResponse(**await get_llm_cache_stats())
+
+@router.get("/llm-parsing", response_model=LLMParseStatsResponse)
+async def llm_parse_stats(current_user = Depends(require_role(UserRole.admin))):
+    return LLMParseStatsResponse(**await get_llm_parse_stats())
+
+@router.get("/llm-usage", response_model=LLMUsageResponse)
+async def llm_usage(
+    day: Optional[date] = Query(None, description="UTC day, today by default"),
+    limit: int = Query(10, ge=1, le=100),
+    current_user = Depends(require_role(UserRole.admin))
+):
+    return LLMUsageResponse(**await get_llm_usage(day or datetime.now(timezone.utc).date(), limit))
+
+@router.get("/llm-usage/users/{user_id}", response_model=LLMUserUsageResponse)
+async def llm_user_usage(
+    user_id: int,
+    days: int = Query(7, ge=1, le=35),
+    current_user = Depends(require_role(UserRole.admin))
+):
+    return LLMUserUsageResponse(**await get_user_llm_usage(user_id, days))
+
 @router.get("/new-users", response_model=NewUsersCountResponse)
 async def new_users_count(days: int = 7, db: AsyncSession = Depends(get_db)):
     total = await AdminAnalyticsService.get_new_users_count(db, days)
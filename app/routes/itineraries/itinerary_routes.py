@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator
+import json
 from app.core.database import get_db
 from app.core.redis_lifecyle import get_cache
 from app.schemas.itineraries.itinerary import (
@@ -9,15 +11,19 @@ from app.schemas.itineraries.itinerary import (
 )
 from app.models.user.user import User
 from app.services.itineraries.itinerary_service import ItineraryService
+from app.schemas.itineraries.activity import ActivityPositionUpdate
 from app.dependencies.auth import get_current_user
 from app.services.itineraries.planner_service import(
     plan_itinerary_ai,
     plan_itinerary_from_provider,
-    generate_ai_itinerary_preview
+    generate_ai_itinerary_preview,
+    stream_ai_itinerary_preview
 )
 from app.core.logger import logger
+from app.core.llm_client import cancel_on_disconnect
 from datetime import date
-from app.schemas.itineraries.itinerary import AIPreviewRequest
+from app.schemas.itineraries.itinerary import AIPreviewRequest, AIJobResponse
+from app.services.itineraries.ai_jobs import submit_ai_job, get_ai_job
 from app.utils.structure_ai import structure_itinerary_data
 from fastapi import Path
 
@@ -88,27 +94,117 @@ async def delete_itinerary_route(
     )
     return "deleted successfully"
 
+# 🔹 Reorder an activity within its day
+@router.put("/activities/{activity_id}/position")
+async def move_activity_route(
+    activity_id: int,
+    position_update: ActivityPositionUpdate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    itinerary_service: ItineraryService = Depends(get_itinerary_service)
+):
+    position = await itinerary_service.move_activity(
+        db=db,
+        current_user=current_user,
+        activity_id=activity_id,
+        after_id=position_update.after_id,
+        background_tasks=background_tasks
+    )
+    return {"message": "Activity moved successfully", "position": position}
+
 @router.post("/ai-preview/{trip_id}", response_model=ItineraryPreviewResponse)
 async def ai_itinerary_preview(
     ai_preview_data: AIPreviewRequest,
+    request: Request,
     trip_id: int = Path(..., description="ID of the trip"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
    
 ):
     try:
-        preview = await generate_ai_itinerary_preview(
+        # the LLM call can take tens of seconds; stop it if the caller leaves
+        preview = await cancel_on_disconnect(request, generate_ai_itinerary_preview(
             trip_id=trip_id,
             location=ai_preview_data.location,
             days=ai_preview_data.days,
             start_date =ai_preview_data.start_date,
             db=db,
-            user=current_user
-        )
+            user=current_user,
+            force_refresh=ai_preview_data.force_refresh
+        ))
         return ItineraryPreviewResponse(preview=preview)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
+def _sse(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+async def _day_events(days: AsyncIterator[ItineraryDayPreview]) -> AsyncIterator[str]:
+    count = 0
+    try:
+        async for day in days:
+            count += 1
+            yield _sse("day", day.model_dump_json())
+        yield _sse("done", json.dumps({"days": count}))
+    except HTTPException as e:
+        yield _sse("error", json.dumps({"status": e.status_code, "detail": e.detail}))
+    except ValueError as e:
+        logger.error(f"🔥 Streaming AI preview failed after {count} day(s): {e}")
+        yield _sse("error", json.dumps({"status": 502, "detail": str(e)}))
+
+@router.post("/ai-preview/{trip_id}/stream")
+async def ai_itinerary_preview_stream(
+    ai_preview_data: AIPreviewRequest,
+    trip_id: int = Path(..., description="ID of the trip"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Server-Sent Events: one `day` event per ItineraryDayPreview as soon as the
+    model has written it, then `done` (or `error`). The upstream call is
+    cancelled if the client disconnects.
+    """
+    try:
+        days = await stream_ai_itinerary_preview(
+            trip_id=trip_id,
+            location=ai_preview_data.location,
+            days=ai_preview_data.days,
+            start_date=ai_preview_data.start_date,
+            db=db,
+            user=current_user,
+            force_refresh=ai_preview_data.force_refresh
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return StreamingResponse(
+        _day_events(days),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/ai-jobs/{trip_id}", response_model=AIJobResponse, status_code=202)
+async def create_ai_job(
+    ai_preview_data: AIPreviewRequest,
+    background_tasks: BackgroundTasks,
+    trip_id: int = Path(..., description="ID of the trip"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Start generating an AI itinerary (or join the identical job already started); poll GET /itinerary/ai-jobs/{job_id}."""
+    try:
+        return await submit_ai_job(trip_id, ai_preview_data, db, current_user, background_tasks)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.get("/ai-jobs/{job_id}", response_model=AIJobResponse)
+async def read_ai_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await get_ai_job(job_id, db, current_user)
+
 @router.post("/plan/ai-confirm/{trip_id}", status_code=201)
 async def confirm_ai_plan(
     trip_id: int,
@@ -1,13 +1,15 @@
 # routes/recommendation.py
 
-from fastapi import APIRouter, Depends, Path, Query
+from fastapi import APIRouter, Depends, Path, Query, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from app.core.database import get_db
 from app.schemas.recommendation.recommendation import RecommendationResponse, VoteRequest, VoteSummaryResponse, VoteCount, TripSelectionRequest, TripRecommendedListResponse,TripSelectedServiceOut
 from app.services.recommendations.recommend_service import generate_recommendations_for_trip, cast_vote, get_vote_counts, confirm_selection, get_persisted_recommendations_with_votes,get_selected_services
-from app.dependencies.auth import get_current_user
-from app.models.user.user import User
+from app.services.recommendations.vote_tally import reconcile_vote_tallies
+from app.services.recommendations.recompute import refresh_upcoming_trips
+from app.dependencies.auth import get_current_user, require_role
+from app.models.user.user import User, UserRole
 
 router = APIRouter(prefix="/recommendations", tags=["Trip Recommendations"])
 
@@ -19,6 +21,15 @@ async def get_recommendations_for_trip(
 ):
     return await generate_recommendations_for_trip(session, trip_id)
 
+@router.post("/refresh-upcoming", status_code=202)
+async def refresh_upcoming_recommendations(
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(require_role(UserRole.admin))
+):
+    """Recompute recommendations for every trip that has not ended yet."""
+    background_tasks.add_task(refresh_upcoming_trips)
+    return {"status": "scheduled"}
+
 @router.get("/trips/{trip_id}/persisted", response_model=TripRecommendedListResponse)
 async def get_persisted_recommendations(
     trip_id: int,
@@ -49,6 +60,22 @@ async def get_votes(
         counts=[VoteCount(service_id=sid, votes=v) for sid, v in counts.items()]
     )
 
+@router.post("/trips/{trip_id}/votes/reconcile", response_model=List[VoteSummaryResponse])
+async def reconcile_votes(
+    trip_id: int,
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Rebuild the cached vote tallies of a trip from the stored votes."""
+    tallies = await reconcile_vote_tallies(session, trip_id)
+    return [
+        VoteSummaryResponse(
+            service_type=service_type,
+            counts=[VoteCount(service_id=sid, votes=v) for sid, v in counts.items()]
+        )
+        for service_type, counts in tallies.items()
+    ]
+
 @router.post("/trips/{trip_id}/confirm")
 async def confirm_trip_service(
     trip_id: int,
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.dependencies.auth import require_role
@@ -12,10 +12,11 @@ router = APIRouter(prefix="/me/services", tags=["Provider Services"])
 @router.post("", response_model=ServiceResponse)
 async def create_service(
     data: ServiceCreate,
+    background_tasks: BackgroundTasks,
     user: User = Depends(require_role(UserRole.provider)),
     db: AsyncSession = Depends(get_db)
 ):
-    return await ServiceProviderService.create_service(user, data, db)
+    return await ServiceProviderService.create_service(user, data, db, background_tasks)
 
 
 @router.get("/list", response_model=list[ServiceResponse])
@@ -31,16 +32,18 @@ async def list_my_services(
 async def update_service(
     service_id: int,
     data: ServiceUpdate,
+    background_tasks: BackgroundTasks,
     user: User = Depends(require_role(UserRole.provider)),
     db: AsyncSession = Depends(get_db)
 ):
-    return await ServiceProviderService.update_service(user, service_id, data, db)
+    return await ServiceProviderService.update_service(user, service_id, data, db, background_tasks)
 
 
 @router.delete("/{service_id}")
 async def delete_service(
     service_id: int,
+    background_tasks: BackgroundTasks,
     user: User = Depends(require_role(UserRole.provider)),
     db: AsyncSession = Depends(get_db)
 ):
-    return await ServiceProviderService.delete_service(user, service_id, db)
\ No newline at end of file
+    return await ServiceProviderService.delete_service(user, service_id, db, background_tasks)
\ No newline at end of file
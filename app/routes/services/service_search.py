@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.core.database import get_db
+from app.schemas.services.service_schema import NearbyServiceResponse, ServiceResponse, ServiceSearchResponse, ServiceSearchResult
+from app.services.service.geo_search import find_nearby_services
+from app.services.service.text_search import search_services
+
+router = APIRouter(prefix="/services", tags=["Service Search"])
+
+
+@router.get("/search", response_model=ServiceSearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Optional[str] = None,
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    rows, next_cursor = await search_services(
+        db, q, service_type=type, min_price=min_price, max_price=max_price, limit=limit, cursor=cursor
+    )
+    return ServiceSearchResponse(
+        results=[
+            ServiceSearchResult(
+                **ServiceResponse.model_validate(service).model_dump(),
+                provider_name=service.provider_name,
+                rank=rank
+            )
+            for service, rank in rows
+        ],
+        next_cursor=next_cursor
+    )
+
+
+@router.get("/nearby", response_model=List[NearbyServiceResponse])
+async def nearby_services(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(5.0, gt=0, le=100),
+    limit: int = Query(20, ge=1, le=100),
+    type: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    rows = await find_nearby_services(db, lat, lon, radius_km, limit=limit, service_type=type)
+    return [
+        NearbyServiceResponse(**ServiceResponse.model_validate(service).model_dump(), distance_km=round(distance, 3))
+        for service, distance in rows
+    ]
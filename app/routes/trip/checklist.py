@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Path, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
@@ -6,14 +6,19 @@ from app.core.database import get_db
 from app.dependencies.auth import get_current_user
 from app.models.user.user import User
 from app.services.trips.checklist_service import (
-    create_checklist_item, get_checklist_item, get_trip_checklist,
+    create_checklist_item, get_checklist_item, get_checklist_item_ref, get_trip_checklist,
     update_checklist_item, delete_checklist_item, assign_task_to_member,
     remove_task_assignment, mark_task_complete, mark_task_incomplete,
-    get_checklist_progress
+    get_checklist_progress, get_checklist_summary as build_checklist_summary,
+    bulk_create_checklist_items, bulk_assign_tasks, bulk_complete_tasks,
+    bulk_uncomplete_tasks, clone_template_into_trip,
+    move_checklist_item
 )
 from app.schemas.trip.checklist import (
     ChecklistCreate, ChecklistUpdate, ChecklistResponse, ChecklistSummary,
-    AssignmentCreate, CompletionCreate, ChecklistProgress
+    AssignmentCreate, CompletionCreate, ChecklistProgress,
+    BulkChecklistCreate, BulkAssignmentCreate, BulkCompletionCreate,
+    BulkTaskIds, BulkOperationResult, ChecklistPositionUpdate
 )
 
 router = APIRouter(prefix="/trips", tags=["Trip Checklist"])
@@ -21,6 +26,7 @@ router = APIRouter(prefix="/trips", tags=["Trip Checklist"])
 # CRUD Operations
 @router.post("/{trip_id}/checklist", response_model=ChecklistResponse, status_code=status.HTTP_201_CREATED)
 async def create_checklist_task(
+    background_tasks: BackgroundTasks,
     trip_id: int = Path(..., gt=0),
     checklist_data: ChecklistCreate = ...,
     session: AsyncSession = Depends(get_db),
@@ -28,7 +34,7 @@ async def create_checklist_task(
 ):
     """Create a new checklist item for a trip."""
     try:
-        item = await create_checklist_item(session, trip_id, checklist_data, current_user.id)
+        item = await create_checklist_item(session, trip_id, checklist_data, current_user.id, background_tasks)
         # Fetch the created item with all relationships
         return await get_checklist_item(session, item.id)
     except Exception as e:
@@ -40,12 +46,13 @@ async def get_trip_checklist_items(
     category: Optional[str] = Query(None, description="Filter by category"),
     priority: Optional[str] = Query(None, description="Filter by priority"),
     completed: Optional[bool] = Query(None, description="Filter by completion status"),
+    sort: Optional[str] = Query(None, description="Use 'position' for the user-defined order"),
     session: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all checklist items for a trip with optional filters."""
     try:
-        items = await get_trip_checklist(session, trip_id, category, priority, completed)
+        items = await get_trip_checklist(session, trip_id, category, priority, completed, sort)
         return items
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch checklist items: {str(e)}")
@@ -73,23 +80,86 @@ async def get_checklist_summary(
 ):
     """Get a summary of all checklist items for a trip."""
     try:
-        items = await get_trip_checklist(session, trip_id)
-        summaries = []
-        for item in items:
-            summaries.append(ChecklistSummary(
-                id=item.id,
-                title=item.title,
-                category=item.category,
-                priority=item.priority,
-                due_date=item.due_date,
-                is_completed=item.is_completed,
-                assigned_count=len(item.assignments),
-                completed_count=len(item.completions)
-            ))
-        return summaries
+        return await build_checklist_summary(session, trip_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch checklist summary: {str(e)}")
 
+# Bulk Operations
+@router.post("/{trip_id}/checklist/bulk", response_model=BulkOperationResult, status_code=status.HTTP_201_CREATED)
+async def bulk_create_checklist_tasks(
+    background_tasks: BackgroundTasks,
+    trip_id: int = Path(..., gt=0),
+    bulk_data: BulkChecklistCreate = ...,
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Create many checklist items for a trip in one transaction."""
+    try:
+        task_ids = await bulk_create_checklist_items(session, trip_id, bulk_data, current_user.id, background_tasks)
+        return BulkOperationResult(message=f"{len(task_ids)} tasks created", task_ids=task_ids)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create checklist items: {str(e)}")
+
+@router.post("/{trip_id}/checklist/bulk/assign", response_model=BulkOperationResult)
+async def bulk_assign_checklist_tasks(
+    trip_id: int = Path(..., gt=0),
+    bulk_data: BulkAssignmentCreate = ...,
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Assign many tasks to a member in one transaction."""
+    try:
+        task_ids = await bulk_assign_tasks(session, trip_id, bulk_data, current_user.id)
+        return BulkOperationResult(message=f"{len(task_ids)} tasks assigned", task_ids=task_ids)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to assign tasks: {str(e)}")
+
+@router.post("/{trip_id}/checklist/bulk/complete", response_model=BulkOperationResult)
+async def bulk_complete_checklist_tasks(
+    trip_id: int = Path(..., gt=0),
+    bulk_data: BulkCompletionCreate = ...,
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Mark many tasks as complete in one transaction."""
+    try:
+        task_ids = await bulk_complete_tasks(session, trip_id, bulk_data, current_user.id)
+        return BulkOperationResult(message=f"{len(task_ids)} tasks marked as complete", task_ids=task_ids)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to mark tasks complete: {str(e)}")
+
+@router.post("/{trip_id}/checklist/bulk/uncomplete", response_model=BulkOperationResult)
+async def bulk_uncomplete_checklist_tasks(
+    trip_id: int = Path(..., gt=0),
+    bulk_data: BulkTaskIds = ...,
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Mark many tasks as incomplete in one transaction."""
+    try:
+        task_ids = await bulk_uncomplete_tasks(session, trip_id, bulk_data.task_ids, current_user.id)
+        return BulkOperationResult(message=f"{len(task_ids)} tasks marked as incomplete", task_ids=task_ids)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to mark tasks incomplete: {str(e)}")
+
+# Templates
+@router.post("/{trip_id}/checklist/from-template/{template_id}", response_model=BulkOperationResult, status_code=status.HTTP_201_CREATED)
+async def clone_checklist_template(
+    background_tasks: BackgroundTasks,
+    trip_id: int = Path(..., gt=0),
+    template_id: int = Path(..., gt=0),
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Copy every task of a checklist template into the trip's checklist."""
+    try:
+        task_ids = await clone_template_into_trip(session, trip_id, template_id, current_user.id, background_tasks)
+        return BulkOperationResult(message=f"{len(task_ids)} tasks created from template", task_ids=task_ids)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to apply checklist template: {str(e)}")
+
 @router.get("/{trip_id}/checklist/{task_id}", response_model=ChecklistResponse)
 async def get_checklist_task(
     trip_id: int = Path(..., gt=0),
@@ -121,7 +191,7 @@ async def update_checklist_task(
     """Update a checklist item."""
     try:
         # Check if item exists and belongs to trip
-        existing_item = await get_checklist_item(session, task_id)
+        existing_item = await get_checklist_item_ref(session, task_id)
         if not existing_item:
             raise HTTPException(status_code=404, detail="Checklist item not found")
         if existing_item.trip_id != trip_id:
@@ -151,7 +221,7 @@ async def delete_checklist_task(
     """Delete a checklist item."""
     try:
         # Check if item exists and belongs to trip
-        existing_item = await get_checklist_item(session, task_id)
+        existing_item = await get_checklist_item_ref(session, task_id)
         if not existing_item:
             raise HTTPException(status_code=404, detail="Checklist item not found")
         if existing_item.trip_id != trip_id:
@@ -169,6 +239,30 @@ async def delete_checklist_task(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete checklist item: {str(e)}")
 
+@router.put("/{trip_id}/checklist/{task_id}/position", response_model=dict)
+async def move_checklist_task(
+    background_tasks: BackgroundTasks,
+    trip_id: int = Path(..., gt=0),
+    task_id: int = Path(..., gt=0),
+    position_data: ChecklistPositionUpdate = ...,
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Move a task to a new position in the trip's checklist."""
+    try:
+        existing_item = await get_checklist_item_ref(session, task_id)
+        if not existing_item:
+            raise HTTPException(status_code=404, detail="Checklist item not found")
+        if existing_item.trip_id != trip_id:
+            raise HTTPException(status_code=400, detail="Task does not belong to this trip")
+        
+        position = await move_checklist_item(session, trip_id, task_id, position_data.after_id, background_tasks)
+        return {"message": "Task moved successfully", "position": position}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to move task: {str(e)}")
+
 # Assignment Operations
 @router.post("/{trip_id}/checklist/{task_id}/assign", response_model=dict)
 async def assign_task(
@@ -181,7 +275,7 @@ async def assign_task(
     """Assign a task to a member."""
     try:
         # Check if item exists and belongs to trip
-        existing_item = await get_checklist_item(session, task_id)
+        existing_item = await get_checklist_item_ref(session, task_id)
         if not existing_item:
             raise HTTPException(status_code=404, detail="Checklist item not found")
         if existing_item.trip_id != trip_id:
@@ -205,7 +299,7 @@ async def remove_assignment(
     """Remove a task assignment."""
     try:
         # Check if item exists and belongs to trip
-        existing_item = await get_checklist_item(session, task_id)
+        existing_item = await get_checklist_item_ref(session, task_id)
         if not existing_item:
             raise HTTPException(status_code=404, detail="Checklist item not found")
         if existing_item.trip_id != trip_id:
@@ -235,7 +329,7 @@ async def complete_task(
     """Mark a task as complete."""
     try:
         # Check if item exists and belongs to trip
-        existing_item = await get_checklist_item(session, task_id)
+        existing_item = await get_checklist_item_ref(session, task_id)
         if not existing_item:
             raise HTTPException(status_code=404, detail="Checklist item not found")
         if existing_item.trip_id != trip_id:
@@ -258,7 +352,7 @@ async def uncomplete_task(
     """Mark a task as incomplete."""
     try:
         # Check if item exists and belongs to trip
-        existing_item = await get_checklist_item(session, task_id)
+        existing_item = await get_checklist_item_ref(session, task_id)
         if not existing_item:
             raise HTTPException(status_code=404, detail="Checklist item not found")
         if existing_item.trip_id != trip_id:
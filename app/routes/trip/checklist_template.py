@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from app.core.database import get_db
+from app.dependencies.auth import get_current_user
+from app.models.user.user import User
+from app.services.trips.checklist_service import (
+    create_checklist_template, get_checklist_template,
+    list_checklist_templates, delete_checklist_template
+)
+from app.schemas.trip.checklist import ChecklistTemplateCreate, ChecklistTemplateResponse
+
+router = APIRouter(prefix="/checklist-templates", tags=["Checklist Templates"])
+
+@router.post("", response_model=ChecklistTemplateResponse, status_code=status.HTTP_201_CREATED)
+async def create_template(
+    template_data: ChecklistTemplateCreate,
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Create a reusable checklist template."""
+    try:
+        return await create_checklist_template(session, template_data, current_user.id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create checklist template: {str(e)}")
+
+@router.get("", response_model=List[ChecklistTemplateResponse])
+async def list_templates(
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """List the user's templates and all public templates."""
+    return await list_checklist_templates(session, current_user.id)
+
+@router.get("/{template_id}", response_model=ChecklistTemplateResponse)
+async def get_template(
+    template_id: int = Path(..., gt=0),
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a checklist template by ID."""
+    template = await get_checklist_template(session, template_id)
+    if not template or (not template.is_public and template.created_by != current_user.id):
+        raise HTTPException(status_code=404, detail="Checklist template not found")
+    return template
+
+@router.delete("/{template_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_template(
+    template_id: int = Path(..., gt=0),
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Delete a checklist template owned by the user."""
+    if not await delete_checklist_template(session, template_id, current_user.id):
+        raise HTTPException(status_code=404, detail="Checklist template not found")
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends,Query
+from fastapi import APIRouter, Depends,Query,BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.schemas.trip.invite import TripInviteCreate, TripInviteAccept, TripInviteResponse
-from app.services.trips.invite_service import create_trip_invite, accept_trip_invite,get_user_trip_invites,decline_trip_invite,get_user_sent_invites
+from app.schemas.trip.invite import TripInviteCreate, TripInviteAccept, TripInviteResponse, TripInviteBulkCreate, TripInviteBulkResponse
+from app.services.trips.invite_service import create_trip_invite, create_trip_invites_bulk, accept_trip_invite,get_user_trip_invites,decline_trip_invite,get_user_sent_invites
 from app.dependencies.auth import get_current_user
 from app.models.user.user import User
 from app.core.database import get_db
@@ -16,6 +16,15 @@ async def send_trip_invite(
 ):
     return await create_trip_invite(db, invite_data, current_user)
 
+@router.post("/bulk", response_model=TripInviteBulkResponse)
+async def send_trip_invites_bulk(
+    invite_data: TripInviteBulkCreate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return await create_trip_invites_bulk(db, invite_data, current_user, background_tasks)
+
 @router.post("/accept-invite")
 async def accept_invite(
     payload: TripInviteAccept,
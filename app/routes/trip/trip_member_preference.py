@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from app.schemas.trip.trip_member_preference import TripMemberPreferenceCreate, TripMemberPreferenceOut
@@ -10,8 +10,8 @@ from app.models.user.user import User
 router = APIRouter(prefix="/trip-member-preference", tags=["Trip Member Preference"])
 
 @router.post("/trips/{trip_id}/preferences", response_model=TripMemberPreferenceOut)
-async def set_preference(trip_id: int, preference: TripMemberPreferenceCreate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return await set_member_preference(trip_id, current_user.id, preference, db)
+async def set_preference(trip_id: int, preference: TripMemberPreferenceCreate, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
+    return await set_member_preference(trip_id, current_user.id, preference, db, background_tasks)
 
 @router.get("/trips/{trip_id}/preferences", response_model=List[TripMemberPreferenceOut])
 async def get_preferences(trip_id: int, db: AsyncSession = Depends(get_db)):
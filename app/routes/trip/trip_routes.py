@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.trip.trip_schema import TripCreate, TripUpdate, TripResponse
 from app.models.user.user import User
@@ -17,11 +17,12 @@ async def get_trip_service(
 @router.post("/create-trip", response_model=TripResponse)
 async def create_trip_route(
     trip: TripCreate,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
     trip_service: TripService = Depends(get_trip_service)
 ):
-    return await trip_service.create_trip(db, trip, current_user.id)
+    return await trip_service.create_trip(db, trip, current_user.id, background_tasks)
 
 @router.get("/view-trips", response_model=list[TripResponse])
 async def get_my_trips(
@@ -54,11 +55,12 @@ async def get_trip_by_code_route(
 async def update_trip_route(
     trip_id: int,
     trip_update: TripUpdate,
+    background_tasks: BackgroundTasks,
     session: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
     trip_service: TripService = Depends(get_trip_service)
 ):
-    return await trip_service.update_trip(session, trip_id, trip_update, current_user.id)
+    return await trip_service.update_trip(session, trip_id, trip_update, current_user.id, background_tasks)
 
 @router.delete("/delete-trip/{trip_id}")
 async def delete_trip_route(
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import date
-from typing import List
+from typing import Dict, List, Optional
 
 class AdminAnalyticsResponse(BaseModel):
     total_active_users: int
@@ -25,6 +25,48 @@ class DailyUserRegistration(BaseModel):
     count: int
     users: List[UserMiniResponse] 
 
+class LLMCacheStatsResponse(BaseModel):
+    hits: int
+    coalesced: int
+    misses: int
+    forced: int
+    hit_rate: float
+
+class LLMParseStatsResponse(BaseModel):
+    parsed: int
+    repaired: int
+    failed: int
+    repairs: Dict[str, int]  # answers needing each kind of repair
+    repair_rate: float
+    failure_rate: float
+
+class LLMUsageEntry(BaseModel):
+    calls: int
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    latency_ms: int
+    avg_latency_ms: float
+    estimated_calls: int  # responses without reported usage; their tokens are estimated
+
+class LLMUsageRanking(LLMUsageEntry):
+    id: int
+
+class LLMUsageResponse(BaseModel):
+    day: date
+    total: LLMUsageEntry
+    top_users: List[LLMUsageRanking]
+    top_trips: List[LLMUsageRanking]
+
+class LLMUsageDay(LLMUsageEntry):
+    day: date
+
+class LLMUserUsageResponse(BaseModel):
+    user_id: int
+    days: List[LLMUsageDay]
+    budget_tokens: Optional[float] = None  # tokens left now; negative while overdrawn
+    budget_capacity: Optional[int] = None
+
 class DailyUserRegistrationsResponse(BaseModel):
     days: int
     registrations: List[DailyUserRegistration]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional
 from datetime import time as dt_time
@@ -17,7 +17,12 @@ class ActivityPreview(BaseModel):
 
 class ActivityResponse(ActivityCreate):
     id: int
+    position: Optional[str] = None
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class ActivityPositionUpdate(BaseModel):
+    after_id: Optional[int] = Field(None, description="Activity to place this one after; omit to move it to the top")
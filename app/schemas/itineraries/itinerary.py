@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import date as dt, datetime
-from typing import Optional, List
+from typing import Optional, List, Literal
 from datetime import date
 from app.schemas.itineraries.activity import ActivityCreate, ActivityResponse,ActivityPreview
 
@@ -42,4 +42,17 @@ class ItineraryResponse(ItineraryCreate):
 class AIPreviewRequest(BaseModel):
     location: str
     days: int
-    start_date: date
\ No newline at end of file
+    start_date: date
+    force_refresh: bool = False  # skip the cached preview and generate a new one
+
+
+class AIJobResponse(BaseModel):
+    job_id: str
+    trip_id: int
+    status: Literal["queued", "running", "succeeded", "failed"]
+    days_done: int
+    days_total: int
+    result: Optional[List[ItineraryDayPreview]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
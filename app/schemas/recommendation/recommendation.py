@@ -17,7 +17,7 @@ class RecommendedService(BaseModel):
     type: str
     price: Optional[float]
     rating: Optional[float]
-    provider: ProviderOut
+    provider: Optional[ProviderOut]
     location: Optional[str]
     is_available: Optional[bool]
     features: Optional[Any]
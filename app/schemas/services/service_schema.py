@@ -28,6 +28,8 @@ class ServiceBase(BaseModel):
     title: str
     description: Optional[str]
     location: Optional[str]
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     price: Optional[float]
     rating: Optional[float] = None  # optional for services without ratings
     features: Optional[Union[dict, list[str]]]=None  # flexible structure: JSON
@@ -44,12 +46,28 @@ class ServiceResponse(ServiceBase):
     class Config:
         from_attributes = True
 
+class NearbyServiceResponse(ServiceResponse):
+    distance_km: float
+
+
+class ServiceSearchResult(ServiceResponse):
+    provider_name: Optional[str] = None
+    rank: float
+
+
+class ServiceSearchResponse(BaseModel):
+    results: List[ServiceSearchResult]
+    next_cursor: Optional[str] = None
+
+
 class ServiceUpdate(BaseModel):
     type: Optional[str] = None
     title: Optional[str] = None
     description: Optional[str] = None
     rating: Optional[float] = None
     location: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     price: Optional[float] = None
     features: Optional[Union[dict, list[str]]]=None # ✅ accept dict OR list
     is_available: Optional[bool] = None
@@ -67,6 +67,7 @@ class ChecklistResponse(BaseModel):
     created_by: int
     created_at: datetime
     updated_at: datetime
+    position: Optional[str] = None
     creator_name: Optional[str] = None
     assignments: List[AssignmentResponse] = []
     completions: List[CompletionResponse] = []
@@ -96,6 +97,10 @@ class ChecklistProgress(BaseModel):
     tasks_by_category: dict[str, dict[str, int]]
     tasks_by_priority: dict[str, dict[str, int]]
 
+# Ordering
+class ChecklistPositionUpdate(BaseModel):
+    after_id: Optional[int] = Field(None, description="Task to place this one after; omit to move it to the top")
+
 # Bulk operations
 class BulkAssignmentCreate(BaseModel):
     task_ids: List[int]
@@ -105,3 +110,45 @@ class BulkAssignmentCreate(BaseModel):
 class BulkCompletionCreate(BaseModel):
     task_ids: List[int]
     notes: Optional[str] = None
+
+class BulkChecklistCreate(BaseModel):
+    items: List[ChecklistCreate] = Field(..., min_length=1, max_length=200)
+
+class BulkTaskIds(BaseModel):
+    task_ids: List[int] = Field(..., min_length=1)
+
+class BulkOperationResult(BaseModel):
+    message: str
+    task_ids: List[int] = []
+
+# Templates
+class ChecklistTemplateItemCreate(BaseModel):
+    title: str = Field(..., min_length=1, max_length=200)
+    description: Optional[str] = None
+    category: TaskCategory = TaskCategory.other
+    priority: TaskPriority = TaskPriority.medium
+    due_days_before_start: Optional[int] = Field(None, ge=0)
+
+class ChecklistTemplateItemResponse(ChecklistTemplateItemCreate):
+    id: int
+
+    class Config:
+        from_attributes = True
+
+class ChecklistTemplateCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=200)
+    description: Optional[str] = None
+    is_public: bool = False
+    items: List[ChecklistTemplateItemCreate] = Field(..., min_length=1)
+
+class ChecklistTemplateResponse(BaseModel):
+    id: int
+    name: str
+    description: Optional[str]
+    is_public: bool
+    created_by: int
+    created_at: datetime
+    items: List[ChecklistTemplateItemResponse] = []
+
+    class Config:
+        from_attributes = True
@@ -1,5 +1,5 @@
-from pydantic import BaseModel,EmailStr
-from typing import Optional
+from pydantic import BaseModel,EmailStr,Field
+from typing import Optional,List
 from datetime import datetime
 
 # 📨 When a user sends an invite
@@ -8,6 +8,12 @@ class TripInviteCreate(BaseModel):
     invitee_email: EmailStr
 
 
+# 📨📨 When a user invites a whole group at once
+class TripInviteBulkCreate(BaseModel):
+    trip_id: int
+    invitee_emails: List[EmailStr] = Field(..., min_length=1, max_length=100)
+
+
 # 🧾 What we return to the inviter or admin
 class TripInviteResponse(BaseModel):
     id: int
@@ -28,4 +34,10 @@ class TripInviteResponse(BaseModel):
 
 # ✅ For accepting the invite (optional but future-proof)
 class TripInviteAccept(BaseModel):
-    invite_code: str
\ No newline at end of file
+    invite_code: str
+
+
+# 🧾 Result of a bulk invite: created invites plus emails that already had a pending one
+class TripInviteBulkResponse(BaseModel):
+    invites: List[TripInviteResponse]
+    skipped_emails: List[EmailStr] = []
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field, validator
+from typing import Optional, List
+from app.utils.feature_filter import parse_feature_filter
 
 class TripMemberPreferenceCreate(BaseModel):
     budget: Optional[float]
@@ -7,6 +8,15 @@ class TripMemberPreferenceCreate(BaseModel):
     food_preferences: Optional[str]
     activity_interests: Optional[str]
     pace: Optional[str]
+    feature_requirements: Optional[List[str]] = Field(
+        None, max_length=20,
+        description='Hard requirements on service features, e.g. "amenities contains wifi" or "vehicle.ac = true"'
+    )
+
+    @validator("feature_requirements", each_item=True)
+    def valid_requirement(cls, v: str):
+        # normalized so equivalent requirements are counted together
+        return str(parse_feature_filter(v))
 
 class TripMemberPreferenceOut(BaseModel):
     id: int
@@ -17,6 +27,7 @@ class TripMemberPreferenceOut(BaseModel):
     food_preferences: Optional[str]
     activity_interests: Optional[str]
     pace: Optional[str]
+    feature_requirements: Optional[List[str]] = None
 
     class Config:
         from_attributes = True
@@ -7,6 +7,8 @@ class TripBase(BaseModel):
     start_date : date
     end_date: date
     location: str
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     budget: int
     trip_type: Literal["leisure", "adventure", "workation", "pilgrimage", "cultural", "other"]
 
@@ -24,6 +26,8 @@ class TripResponse(TripBase):
 class TripUpdate(BaseModel):
     title: Optional[str] = None
     location: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     start_date: Optional[str] = None
     end_date: Optional[str] = None
     budget: Optional[float] = None
@@ -0,0 +1,181 @@
+# services/itineraries/ai_jobs.py
+#
+# AI itinerary generation as background jobs. Submitting returns at once
+# with a job id; the generation runs after the response is sent and writes
+# its progress and result to a Redis hash that clients poll. Submissions for
+# the same trip and parameters attach to the job already queued, running or
+# finished instead of starting another one.
+
+import hashlib
+import json
+from datetime import date, datetime, timezone
+from typing import List
+from uuid import uuid4
+
+from fastapi import BackgroundTasks, HTTPException
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.llm_usage import check_llm_budget, set_usage_owner
+from app.core.logger import logger
+from app.core.redis_lifecyle import init_redis_client
+from app.models.user.user import User
+from app.schemas.itineraries.itinerary import AIPreviewRequest, AIJobResponse, ItineraryDayPreview
+from app.services.itineraries.planner_service import (
+    generate_preview_days, load_member_trip, trip_context, validate_user_membership
+)
+
+JOB_KEY_PREFIX = "itinerary_job"
+DEDUPE_KEY_PREFIX = "itinerary_job:dedupe"
+
+_days_adapter = TypeAdapter(List[ItineraryDayPreview])
+
+
+def job_key(job_id: str) -> str:
+    return f"{JOB_KEY_PREFIX}:{job_id}"
+
+
+def dedupe_key(trip_id: int, data: AIPreviewRequest) -> str:
+    params = json.dumps([trip_id, data.location.strip().lower(), data.days, data.start_date.isoformat()])
+    return f"{DEDUPE_KEY_PREFIX}:{hashlib.sha1(params.encode()).hexdigest()}"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _is_reusable(job: dict) -> bool:
+    """Queued/running jobs that are still alive, and successful ones, can be shared."""
+    status = job.get("status")
+    if status == "succeeded":
+        return True
+    if status in ("queued", "running"):
+        # a worker that died mid-job leaves it "running" forever; stop sharing it
+        updated = datetime.fromisoformat(job["updated_at"])
+        return (datetime.now(timezone.utc) - updated).total_seconds() < settings.AI_JOB_STALE_SECONDS
+    return False
+
+
+def _to_response(job_id: str, job: dict) -> AIJobResponse:
+    return AIJobResponse(
+        job_id=job_id,
+        trip_id=int(job["trip_id"]),
+        status=job["status"],
+        days_done=int(job.get("days_done", 0)),
+        days_total=int(job["days_total"]),
+        result=_days_adapter.validate_json(job["result"]) if job.get("result") else None,
+        error=job.get("error") or None,
+        created_at=job["created_at"],
+        updated_at=job["updated_at"],
+    )
+
+
+async def submit_ai_job(
+    trip_id: int,
+    data: AIPreviewRequest,
+    db: AsyncSession,
+    user: User,
+    background_tasks: BackgroundTasks
+) -> AIJobResponse:
+    trip = await load_member_trip(trip_id, db, user)
+    redis_client = await init_redis_client()
+    dedupe = dedupe_key(trip_id, data)
+
+    if not data.force_refresh:
+        existing_id = await redis_client.get(dedupe)
+        if existing_id:
+            existing = await redis_client.hgetall(job_key(existing_id))
+            if existing and _is_reusable(existing):
+                logger.info(f"⚡ [AI Jobs] Trip {trip_id} attached to job {existing_id}")
+                return _to_response(existing_id, existing)
+
+    job_id = uuid4().hex
+    now = _now()
+    job = {
+        "trip_id": trip_id,
+        "user_id": user.id,
+        "status": "queued",
+        "location": data.location,
+        "days": data.days,
+        "start_date": data.start_date.isoformat(),
+        "context": trip_context(trip),
+        "force_refresh": int(data.force_refresh),
+        "days_done": 0,
+        "days_total": data.days,
+        "created_at": now,
+        "updated_at": now,
+    }
+    if not data.force_refresh:
+        # only one of two racing submissions wins the dedupe slot; the other attaches
+        if not await redis_client.set(dedupe, job_id, nx=True, ex=settings.AI_JOB_TTL_SECONDS):
+            existing_id = await redis_client.get(dedupe)
+            existing = await redis_client.hgetall(job_key(existing_id)) if existing_id else {}
+            if existing and _is_reusable(existing):
+                return _to_response(existing_id, existing)
+            await redis_client.set(dedupe, job_id, ex=settings.AI_JOB_TTL_SECONDS)
+    else:
+        await redis_client.set(dedupe, job_id, ex=settings.AI_JOB_TTL_SECONDS)
+
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.hset(job_key(job_id), mapping=job)
+        pipe.expire(job_key(job_id), settings.AI_JOB_TTL_SECONDS)
+        await pipe.execute()
+
+    background_tasks.add_task(run_ai_job, job_id)
+    logger.info(f"📦 [AI Jobs] Queued job {job_id} for trip {trip_id} ({data.days} days)")
+    return _to_response(job_id, {k: str(v) for k, v in job.items()})
+
+
+async def run_ai_job(job_id: str) -> None:
+    redis_client = await init_redis_client()
+    key = job_key(job_id)
+    job = await redis_client.hgetall(key)
+    if not job:
+        logger.error(f"🔥 [AI Jobs] Job {job_id} expired before it ran")
+        return
+    set_usage_owner(int(job["user_id"]), int(job["trip_id"]))
+    try:
+        # over-budget jobs stay queued until the user's budget refills, within the stale window
+        await check_llm_budget(int(job["user_id"]), max_wait=settings.AI_JOB_STALE_SECONDS / 2)
+    except HTTPException as e:
+        await redis_client.hset(key, mapping={"status": "failed", "error": str(e.detail), "updated_at": _now()})
+        return
+    await redis_client.hset(key, mapping={"status": "running", "updated_at": _now()})
+
+    async def on_progress(days_done: int) -> None:
+        await redis_client.hincrby(key, "days_done", days_done)
+        await redis_client.hset(key, "updated_at", _now())
+
+    try:
+        days = await generate_preview_days(
+            job["location"],
+            int(job["days"]),
+            date.fromisoformat(job["start_date"]),
+            job.get("context", ""),
+            force_refresh=job.get("force_refresh") == "1",
+            on_progress=on_progress
+        )
+    except Exception as e:
+        detail = e.detail if isinstance(e, HTTPException) else str(e)
+        logger.error(f"🔥 [AI Jobs] Job {job_id} failed: {detail}")
+        await redis_client.hset(key, mapping={"status": "failed", "error": str(detail), "updated_at": _now()})
+        return
+
+    await redis_client.hset(key, mapping={
+        "status": "succeeded",
+        "result": _days_adapter.dump_json(days).decode(),
+        "days_done": len(days),
+        "updated_at": _now(),
+    })
+    logger.info(f"✅ [AI Jobs] Job {job_id} finished with {len(days)} day(s)")
+
+
+async def get_ai_job(job_id: str, db: AsyncSession, user: User) -> AIJobResponse:
+    redis_client = await init_redis_client()
+    job = await redis_client.hgetall(job_key(job_id))
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    # jobs are shared by the trip's members, so access follows trip membership
+    await validate_user_membership(int(job["trip_id"]), user, db)
+    return _to_response(job_id, job)
@@ -1,3 +1,4 @@
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
@@ -9,6 +10,7 @@ from app.schemas.itineraries.activity import ActivityCreate,ActivityResponse
 from app.models.user.user import User
 from app.models.trips.trip_model import Trip
 from app.models.trips.trip_member import TripMember
+from app.utils.ordering import keys_between
 from datetime import datetime
 from typing import List
 
@@ -46,12 +48,15 @@ async def create_itinerary_with_activites(
     db.add(itinerary)
     await db.flush()
 
-    for act in itinerary_data.activities or []:
+    activities_data = itinerary_data.activities or []
+    positions = keys_between(None, None, len(activities_data))
+    for act, position in zip(activities_data, positions):
         activity = Activity(
             itinerary_id=itinerary.id,
             time=act.time,
             title=act.title,
             description=act.description,
+            position=position,
             created_at=datetime.utcnow()
         )
         db.add(activity)
@@ -62,6 +67,58 @@ async def create_itinerary_with_activites(
     return itinerary
 
 
+async def create_itineraries_bulk(
+        db: AsyncSession, trip_id: int, plans: List[ItineraryCreate]
+) -> List[int]:
+    """
+    Save a whole plan in one transaction: one multi-row INSERT for the days,
+    one for all their activities, one commit. Nothing is saved if any part
+    fails. The caller checks trip membership. Returns the new itinerary ids
+    in plan order.
+    """
+    now = datetime.utcnow()
+    try:
+        # executemany with RETURNING in parameter order: ids line up with plans
+        result = await db.execute(
+            insert(Itinerary).returning(Itinerary.id, sort_by_parameter_order=True),
+            [
+                {
+                    "trip_id": trip_id,
+                    "day_number": plan.day_number,
+                    "title": plan.title,
+                    "description": plan.description,
+                    "date": plan.date,
+                    "created_at": now,
+                }
+                for plan in plans
+            ]
+        )
+        itinerary_ids = list(result.scalars().all())
+
+        activity_rows = []
+        for itinerary_id, plan in zip(itinerary_ids, plans):
+            activities_data = plan.activities or []
+            positions = keys_between(None, None, len(activities_data))
+            activity_rows.extend(
+                {
+                    "itinerary_id": itinerary_id,
+                    "time": act.time,
+                    "title": act.title,
+                    "description": act.description,
+                    "position": position,
+                    "created_at": now,
+                }
+                for act, position in zip(activities_data, positions)
+            )
+        if activity_rows:
+            await db.execute(insert(Activity).values(activity_rows))
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return itinerary_ids
+
+
 async def get_itineraries_by_trip(
     db: AsyncSession, current_user: User, trip_id: int
 ) -> List[Itinerary]:
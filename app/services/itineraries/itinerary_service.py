@@ -1,8 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
-from fastapi import HTTPException, status
-from typing import List
+from fastapi import BackgroundTasks, HTTPException, status
+from typing import List, Optional
 from datetime import datetime
 from datetime import datetime, date
 from app.core.cache import RedisCache
@@ -14,7 +14,12 @@ from app.models.trips.trip_model import Trip
 from app.models.trips.trip_member import TripMember
 from app.schemas.itineraries.itinerary import ItineraryCreate, ItineraryResponse, ItineraryUpdate
 from app.schemas.itineraries.activity import ActivityResponse
+from app.services.ordering_service import position_after, rebalance_positions_task
+from app.utils.ordering import keys_between, needs_rebalance
+from sqlalchemy import update
 from datetime import datetime, date
+ACTIVITY_FALLBACK_ORDER = (Activity.time.asc().nulls_last(),)
+
 class ItineraryService:
     def __init__(self, cache: RedisCache):
         self.cache = cache
@@ -62,12 +67,15 @@ class ItineraryService:
         itinerary._sa_instance_state.dict["activities"] = []
         
         # Add activities
-        for act in itinerary_data.activities or []:
+        activities_data = itinerary_data.activities or []
+        positions = keys_between(None, None, len(activities_data))
+        for act, position in zip(activities_data, positions):
             activity = Activity(
                 itinerary_id=itinerary.id,
                 time=act.time,
                 title=act.title,
                 description=act.description,
+                position=position,
                 created_at=datetime.utcnow()
             )
             db.add(activity)
@@ -83,6 +91,13 @@ class ItineraryService:
         # Convert to response model
         return ItineraryResponse.model_validate(itinerary.to_dict())
     
+    async def invalidate_trip_itineraries(self, trip_id: int) -> int:
+        """Retire the cached itinerary list of a trip by moving to a new version; returns it."""
+        current_version = await self.cache.get(f"itineraries_version:{trip_id}") or 1
+        new_version = current_version + 1
+        await self.cache.set(f"itineraries_version:{trip_id}", new_version, expire=86400)
+        return new_version
+
     async def get_itineraries_by_trip(
         self,
         db: AsyncSession,
@@ -214,9 +229,7 @@ class ItineraryService:
         trip_id = itinerary.trip_id
 
         # --- Version bump for cache ---
-        current_version = await self.cache.get(f"itineraries_version:{trip_id}") or 1
-        new_version = current_version + 1
-        await self.cache.set(f"itineraries_version:{trip_id}", new_version, expire=86400)
+        new_version = await self.invalidate_trip_itineraries(trip_id)
 
         # --- Save updated itinerary in cache with new version ---
         cache_key = self.cache.build_key("itineraries", "trip", trip_id)
@@ -259,12 +272,60 @@ class ItineraryService:
         await db.commit()
 
         # --- Version bump for cache ---
-        current_version = await self.cache.get(f"itineraries_version:{trip_id}") or 1
-        new_version = current_version + 1
-        await self.cache.set(f"itineraries_version:{trip_id}", new_version, expire=86400)
+        new_version = await self.invalidate_trip_itineraries(trip_id)
 
         # --- Mark deleted in cache for instant effect ---
         cache_key = self.cache.build_key("itineraries", "trip", trip_id)
         await self.cache.set(cache_key, None, version=new_version, expire=900)
 
         return ItineraryResponse.model_validate(itinerary.to_dict())
+
+    async def move_activity(
+        self,
+        db: AsyncSession,
+        current_user: User,
+        activity_id: int,
+        after_id: Optional[int],
+        background_tasks: Optional[BackgroundTasks] = None
+    ) -> str:
+        """Move an activity directly after another one of the same day (or to the top)."""
+        result = await db.execute(
+            select(Activity.id, Itinerary.id.label("itinerary_id"), Itinerary.trip_id)
+            .join(Itinerary, Activity.itinerary_id == Itinerary.id)
+            .where(Activity.id == activity_id)
+        )
+        activity = result.one_or_none()
+        if not activity:
+            raise HTTPException(status_code=404, detail="Activity not found")
+
+        # Check access
+        result = await db.execute(
+            select(TripMember.id).where(
+                TripMember.trip_id == activity.trip_id,
+                TripMember.user_id == current_user.id
+            )
+        )
+        if not result.scalar_one_or_none():
+            raise HTTPException(status_code=403, detail="Not authorized to update this itinerary")
+
+        position = await position_after(
+            db, Activity, Activity.itinerary_id, activity.itinerary_id,
+            activity_id, after_id, ACTIVITY_FALLBACK_ORDER
+        )
+        await db.execute(
+            update(Activity)
+            .where(Activity.id == activity_id)
+            .values(position=position)
+        )
+        await db.commit()
+
+        if background_tasks is not None and needs_rebalance(position):
+            background_tasks.add_task(
+                rebalance_positions_task, Activity, Activity.itinerary_id,
+                activity.itinerary_id, ACTIVITY_FALLBACK_ORDER
+            )
+
+        # --- Version bump for cache ---
+        await self.invalidate_trip_itineraries(activity.trip_id)
+
+        return position
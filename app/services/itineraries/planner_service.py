@@ -1,21 +1,29 @@
-from typing import List,Dict,Any
+from typing import List,Dict,Any,AsyncIterator,Optional,Tuple,Callable,Awaitable
+import asyncio
 from fastapi import HTTPException,status,Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.itineraries.itinerary import ItineraryDayPreview,ItineraryPreviewResponse,ActivityCreate,ItineraryCreate
 from app.schemas.trip.trip_member import TripRole
 from app.models.trips.trip_member import TripMember
 from app.models.trips.trip_model import Trip
-from app.services.itineraries.itinerary import create_itinerary_with_activites
+from app.services.itineraries.itinerary import create_itineraries_bulk
+from app.services.itineraries.itinerary_service import ItineraryService
 from app.core.logger import logger
 from sqlalchemy import select
 from app.models.user.user import User
 from datetime import timedelta
 from app.utils.normalize import normalize_to_dict
-from app.utils.ai_itinerary import build_prompt, parse_ai_response
-from app.core.llm_client import get_ai_completion
+from app.utils.ai_itinerary import (
+    build_prompt, parse_itinerary, DayStreamParser, day_preview_from_dict,
+    day_ranges, merge_day_chunks, renumber_day, ITINERARY_RESPONSE_FORMAT
+)
+from app.core.llm_client import get_ai_completion, stream_ai_completion
+from app.core.llm_metrics import count_parse_failure, record_parse
+from app.core.llm_usage import check_llm_budget, set_usage_owner
 from datetime import date
 from app.core.redis_lifecyle import get_cache
 from app.services.trips.trip_service import TripService
+from app.core.config import settings
 
 
 async def validate_user_membership(
@@ -35,6 +43,25 @@ async def validate_user_membership(
             detail="You are not a member of this trip"
         )
 
+async def save_plan(db: AsyncSession, trip_id: int, raw_plans: List[Any]) -> List[int]:
+    """Persist a confirmed plan in one transaction, then retire the trip's cached itineraries once."""
+    plans = []
+    for raw_plan in raw_plans:
+        day_plan = normalize_to_dict(raw_plan)
+        plans.append(ItineraryCreate(
+            trip_id=trip_id,
+            day_number=day_plan.get("day_number"),
+            title=day_plan.get("title"),
+            description=day_plan.get("description"),
+            date=day_plan.get("date"),
+            activities=day_plan.get("activities", [])
+        ))
+    itinerary_ids = await create_itineraries_bulk(db, trip_id, plans)
+
+    cache = await get_single_cache()
+    await ItineraryService(cache).invalidate_trip_itineraries(trip_id)
+    return itinerary_ids
+
 # --- PLAN USING AI ---
 
 async def plan_itinerary_ai(
@@ -47,19 +74,8 @@ async def plan_itinerary_ai(
 
     if not ai_generated_data:
         raise HTTPException(status_code=400, detail="No itinerary data received from AI")
-    
-    for raw_plan in ai_generated_data:
-        day_plan = normalize_to_dict(raw_plan)
-        itinerary_data = ItineraryCreate(
-            trip_id=trip_id,
-            day_number=day_plan.get("day_number"),
-            title=day_plan.get("title"),
-            description=day_plan.get("description"),
-            date=day_plan.get("date"),
-            activities=day_plan.get("activities", [])
-        )
-        await create_itinerary_with_activites(db=db, itinerary_data=itinerary_data, current_user=user_id)
 
+    await save_plan(db, trip_id, ai_generated_data)
     logger.info(f"AI itinerary planned for trip_id={trip_id} by user_id={user_id}")
 
 # --- PLAN USING SERVICE PROVIDER PACKAGE ---
@@ -74,18 +90,7 @@ async def plan_itinerary_from_provider(
     if not provider_package_data:
         raise HTTPException(status_code=400, detail="Provider package is empty")
 
-    for raw_plan in provider_package_data:
-        day_plan = normalize_to_dict(raw_plan)
-        itinerary_data = ItineraryCreate(
-            trip_id=trip_id,
-            day_number=day_plan.get("day_number"),
-            title=day_plan.get("title"),
-            description=day_plan.get("description"),
-            date=day_plan.get("date"),
-            activities=day_plan.get("activities", [])
-        )
-        await create_itinerary_with_activites(db=db, itinerary_data=itinerary_data, current_user=user_id)
-
+    await save_plan(db, trip_id, provider_package_data)
     logger.info(f"Provider itinerary planned for trip_id={trip_id} by user_id={user_id}")
 
 async def get_single_cache():
@@ -94,13 +99,113 @@ async def get_single_cache():
         return cache_item
     return None
 
+def _parses(start_date: date, first_day: int = 1, expected_days: Optional[int] = None):
+    def parses(response: str) -> bool:
+        # keep unparseable and cut-off answers out of the cache; a retry may do better
+        try:
+            _, repairs = parse_itinerary(response, start_date, first_day, expected_days)
+            return "truncated" not in repairs
+        except ValueError:
+            return False
+    return parses
+
+
+def _response_format() -> Optional[Dict[str, Any]]:
+    return ITINERARY_RESPONSE_FORMAT if settings.LLM_STRUCTURED_OUTPUT else None
+
+
+def trip_context(trip: Trip) -> str:
+    # only fields shared by many trips, so chunk prompts stay cacheable across them
+    trip_type = getattr(trip.trip_type, "value", trip.trip_type)
+    return f"a {trip_type} trip" if trip_type else ""
+
+
+async def _generate_chunk(
+    location: str,
+    days: int,
+    start_date: date,
+    day_range: Tuple[int, int],
+    context: str,
+    force_refresh: bool,
+    slots: asyncio.Semaphore,
+    on_progress: Optional[Callable[[int], Awaitable[None]]] = None
+) -> List[ItineraryDayPreview]:
+    first_day, last_day = day_range
+    expected_days = last_day - first_day + 1
+    prompt = build_prompt(location, days, start_date, first_day, last_day, context)
+    async with slots:
+        ai_response = await get_ai_completion(
+            prompt,
+            force_refresh=force_refresh,
+            accept=_parses(start_date, first_day, expected_days),
+            response_format=_response_format()
+        )
+    try:
+        chunk, repairs = parse_itinerary(ai_response, start_date, first_day, expected_days)
+    except ValueError:
+        await count_parse_failure()
+        raise
+    await record_parse(repairs)
+    if repairs:
+        logger.warning(f"⚠️ AI itinerary days {first_day}-{last_day} needed repairs: {', '.join(repairs)}")
+    if on_progress is not None:
+        await on_progress(len(chunk))
+    return chunk
+
+
+def _cancel_pending(tasks: List[asyncio.Future]) -> None:
+    for task in tasks:
+        if not task.done():
+            task.cancel()
+
+
+async def load_member_trip(trip_id: int, db: AsyncSession, user: User) -> Trip:
+    """The trip, after checking the user is a member of it."""
+    await validate_user_membership(trip_id, user, db)
+    cache = await get_single_cache()
+    trip = await TripService(cache).get_trip_by_id(db=db, user_id=user.id, trip_id=trip_id)
+    if not trip:
+        raise ValueError("Trip not found")
+    return trip
+
+
+async def generate_preview_days(
+    location: str,
+    days: int,
+    start_date: date,
+    context: str = "",
+    force_refresh: bool = False,
+    chunk_days: Optional[int] = None,
+    on_progress: Optional[Callable[[int], Awaitable[None]]] = None
+) -> List[ItineraryDayPreview]:
+    """
+    Long trips are generated as day ranges in parallel: each completion is
+    shorter (faster, less likely to time out) and the ranges overlap in time.
+    `on_progress` is awaited with the number of days in each finished range.
+    """
+    slots = asyncio.Semaphore(settings.AI_ITINERARY_PARALLEL_CHUNKS)
+    tasks = [
+        asyncio.ensure_future(_generate_chunk(
+            location, days, start_date, day_range, context, force_refresh, slots, on_progress
+        ))
+        for day_range in day_ranges(days, chunk_days or settings.AI_ITINERARY_CHUNK_DAYS)
+    ]
+    try:
+        chunks = await asyncio.gather(*tasks)
+    finally:
+        # one failed chunk fails the preview; don't leave the others running
+        _cancel_pending(tasks)
+    return merge_day_chunks(chunks, days)
+
+
 async def generate_ai_itinerary_preview(
     trip_id: int,
     location: str,
     days: int,
     start_date: date,
     db: AsyncSession,
-    user: User
+    user: User,
+    force_refresh: bool = False
 ) -> List[ItineraryDayPreview]:
     # Ensure user is a member of the trip
     await validate_user_membership(trip_id, user, db)
@@ -115,13 +220,79 @@ async def generate_ai_itinerary_preview(
     trip = await trip_service.get_trip_by_id(db=db, user_id=user.id, trip_id=trip_id)
     if not trip:
         raise ValueError("Trip not found")
-    print(trip)
 
+    await check_llm_budget(user.id)
+    set_usage_owner(user.id, trip_id)
+    return await generate_preview_days(location, days, start_date, trip_context(trip), force_refresh)
+
+
+async def stream_ai_itinerary_preview(
+    trip_id: int,
+    location: str,
+    days: int,
+    start_date: date,
+    db: AsyncSession,
+    user: User,
+    force_refresh: bool = False
+) -> AsyncIterator[ItineraryDayPreview]:
+    """
+    Checks access up front (so failures are still plain HTTP errors), then
+    returns an iterator yielding each day as soon as the model finishes it.
+    The first day range is streamed live while later ranges are generated
+    in parallel and released in order.
+    """
+    trip = await load_member_trip(trip_id, db, user)
+    await check_llm_budget(user.id)
+    context = trip_context(trip)
+    ranges = day_ranges(days, settings.AI_ITINERARY_CHUNK_DAYS)
 
+    async def days_as_completed() -> AsyncIterator[ItineraryDayPreview]:
+        # set here: the body runs in the response's context, not this function's
+        set_usage_owner(user.id, trip_id)
+        slots = asyncio.Semaphore(settings.AI_ITINERARY_PARALLEL_CHUNKS)
+        later = [
+            asyncio.ensure_future(_generate_chunk(location, days, start_date, day_range, context, force_refresh, slots))
+            for day_range in ranges[1:]
+        ]
+        try:
+            first_day, last_day = ranges[0]
+            expected_days = last_day - first_day + 1
+            prompt = build_prompt(location, days, start_date, first_day, last_day, context)
+            parser = DayStreamParser()
+            emitted = 0
 
-    prompt = build_prompt(location, days, start_date)
-    ai_response = get_ai_completion(prompt)
+            def usable(raw_days: List[dict]) -> List[ItineraryDayPreview]:
+                previews = []
+                for day in raw_days:
+                    try:
+                        previews.append(day_preview_from_dict(day, parser.repairs))
+                    except (KeyError, TypeError, ValueError):
+                        parser.repairs.append("dropped_day")
+                return previews
 
-    preview = parse_ai_response(ai_response, start_date)
+            async with slots:
+                async for delta in stream_ai_completion(
+                    prompt,
+                    force_refresh=force_refresh,
+                    accept=_parses(start_date, first_day, expected_days),
+                    response_format=_response_format()
+                ):
+                    for preview in usable(parser.feed(delta)):
+                        if emitted < expected_days:
+                            yield renumber_day(preview, first_day + emitted, start_date)
+                            emitted += 1
+            for preview in usable(parser.finish()):
+                if emitted < expected_days:
+                    yield renumber_day(preview, first_day + emitted, start_date)
+                    emitted += 1
+            if not emitted:
+                await count_parse_failure()
+                raise ValueError("❌ LLM returned no usable itinerary days.")
+            await record_parse(parser.repairs)
+            for task in later:
+                for preview in await task:
+                    yield preview
+        finally:
+            _cancel_pending(later)
 
-    return preview
\ No newline at end of file
+    return days_as_completed()
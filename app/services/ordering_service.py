@@ -0,0 +1,129 @@
+import zlib
+from typing import Optional, Sequence
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+
+from app.core.database import SessionLocal
+from app.core.logger import logger
+from app.utils.ordering import key_between, keys_between, evenly_spaced_keys
+
+
+async def lock_list(session: AsyncSession, model, scope_value) -> None:
+    """
+    Serialize position writes to one list until the transaction ends, so
+    two concurrent appends or moves never compute the same key.
+    """
+    table_key = zlib.crc32(model.__tablename__.encode()) - 2 ** 31  # fits a signed int4
+    await session.execute(select(func.pg_advisory_xact_lock(table_key, scope_value)))
+
+
+async def last_position(session: AsyncSession, model, scope_column, scope_value) -> Optional[str]:
+    """Highest position key in a list (served by the (scope, position) index)."""
+    result = await session.execute(
+        select(model.position)
+        .where(scope_column == scope_value, model.position.is_not(None))
+        .order_by(model.position.desc())
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def append_positions(session: AsyncSession, model, scope_column, scope_value, count: int) -> list[str]:
+    """
+    Keys for `count` new rows appended to the end of a list.
+    Locks the list for the rest of the transaction; commit promptly.
+    """
+    await lock_list(session, model, scope_value)
+    last = await last_position(session, model, scope_column, scope_value)
+    if last is None:
+        return evenly_spaced_keys(count)
+    return keys_between(last, None, count)
+
+
+async def rebalance_positions(
+    session: AsyncSession,
+    model,
+    scope_column,
+    scope_value,
+    fallback_order: Sequence = ()
+) -> None:
+    """
+    Rewrite every position in a list with short, evenly spaced keys.
+    Rows without a position keep their relative fallback order and go last.
+    Does not commit.
+    """
+    await lock_list(session, model, scope_value)
+    result = await session.execute(
+        select(model.id)
+        .where(scope_column == scope_value)
+        .order_by(model.position.asc().nulls_last(), *fallback_order, model.id)
+    )
+    ids = result.scalars().all()
+    if not ids:
+        return
+    keys = evenly_spaced_keys(len(ids))
+    await session.execute(
+        update(model),
+        [{"id": row_id, "position": key} for row_id, key in zip(ids, keys)]
+    )
+
+
+async def rebalance_positions_task(model, scope_column, scope_value, fallback_order: Sequence = ()) -> None:
+    """Background-task entry point: rebalance one list in its own session."""
+    async with SessionLocal() as session:
+        try:
+            await rebalance_positions(session, model, scope_column, scope_value, fallback_order)
+            await session.commit()
+            logger.info(f"Rebalanced {model.__tablename__} positions for {scope_column.key}={scope_value}")
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"🔥 Failed to rebalance {model.__tablename__} positions: {e}")
+
+
+async def position_after(
+    session: AsyncSession,
+    model,
+    scope_column,
+    scope_value,
+    moved_id: int,
+    after_id: Optional[int],
+    fallback_order: Sequence = ()
+) -> str:
+    """
+    Compute the key that places `moved_id` directly after `after_id`
+    (or first in the list when `after_id` is None).
+    Lists that still contain rows without a position are rebalanced first.
+    """
+    if after_id == moved_id:
+        raise HTTPException(status_code=400, detail="An item cannot be positioned after itself")
+
+    await lock_list(session, model, scope_value)
+    missing = await session.execute(
+        select(model.id)
+        .where(scope_column == scope_value, model.position.is_(None))
+        .limit(1)
+    )
+    if missing.scalar_one_or_none() is not None:
+        await rebalance_positions(session, model, scope_column, scope_value, fallback_order)
+
+    prev_key = None
+    if after_id is not None:
+        result = await session.execute(
+            select(model.position).where(model.id == after_id, scope_column == scope_value)
+        )
+        row = result.one_or_none()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Reference item not found in this list")
+        prev_key = row.position
+
+    next_query = select(model.position).where(
+        scope_column == scope_value,
+        model.id != moved_id
+    )
+    if prev_key is not None:
+        next_query = next_query.where(model.position > prev_key)
+    result = await session.execute(next_query.order_by(model.position.asc()).limit(1))
+    next_key = result.scalar_one_or_none()
+
+    return key_between(prev_key, next_key)
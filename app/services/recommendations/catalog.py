@@ -0,0 +1,467 @@
+# services/recommendations/catalog.py
+#
+# In-process, columnar snapshot of the service catalog used by the
+# recommendation pipeline. Numeric fields live in NumPy arrays so candidate
+# filtering is a handful of vectorized masks; text and provider data live in
+# side tables indexed by row.
+#
+# Writers (ServiceProviderService) publish change events to a Redis stream;
+# every worker replays new events on its next sync and patches only the
+# affected rows. Gaps in the event sequence, and snapshots older than
+# SERVICE_CATALOG_MAX_AGE_SECONDS, fall back to a full reload, which is built
+# in the background (off the event loop) and swapped in when ready.
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.logger import logger
+from app.core.redis_lifecyle import init_redis_client
+from app.utils.normalize import feature_terms
+from app.utils.geo import EARTH_RADIUS_KM, KM_PER_DEGREE
+from app.utils.feature_filter import FeatureFilter
+from app.models.service.service_provider import Service, ServiceProvider
+
+CATALOG_STREAM_KEY = "catalog:changes"
+CATALOG_GENERATION_KEY = "catalog:generation"
+CATALOG_STREAM_MAXLEN = 10000
+# More pending events than this and a full reload is cheaper than patching
+MAX_INCREMENTAL_EVENTS = 500
+
+# KEYS = generation counter, change stream; ARGV = service id, action, stream maxlen.
+# Bumps the generation and appends the matching event atomically.
+_PUBLISH_SCRIPT = """
+local generation = redis.call('INCR', KEYS[1])
+redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[3], '*',
+    'service_id', ARGV[1], 'action', ARGV[2], 'generation', generation)
+return generation
+"""
+
+
+@dataclass
+class CatalogProvider:
+    id: int
+    name: str
+    contact_phone: Optional[str]
+
+
+@dataclass
+class CatalogService:
+    """Lightweight stand-in for a Service row, attribute-compatible with it."""
+    id: int
+    title: str
+    type: str
+    price: Optional[float]
+    rating: Optional[float]
+    location: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    is_available: bool
+    features: Any
+    provider: Optional[CatalogProvider]
+    feature_terms: frozenset = frozenset()
+
+    @property
+    def provider_name(self):
+        return self.provider.name if self.provider else None
+
+
+def _service_columns():
+    return (
+        Service.id, Service.provider_id, Service.type, Service.title,
+        Service.location, Service.location_key, Service.latitude, Service.longitude,
+        Service.rating, Service.price,
+        Service.features, Service.is_available,
+        ServiceProvider.name.label("provider_name"),
+        ServiceProvider.contact_phone.label("provider_phone"),
+    )
+
+
+class ServiceCatalog:
+    def __init__(self):
+        self.loaded = False
+        self.generation = 0
+        self.last_event_id = "0-0"
+        self.loaded_at = 0.0
+        self.synced_at = 0.0
+        self._reset()
+
+    def _reset(self):
+        # numeric columns
+        self.ids = np.empty(0, dtype=np.int64)
+        self.price = np.empty(0, dtype=np.float64)
+        self.rating = np.empty(0, dtype=np.float64)
+        self.latitude = np.empty(0, dtype=np.float64)
+        self.longitude = np.empty(0, dtype=np.float64)
+        self.type_code = np.empty(0, dtype=np.int32)
+        self.location_id = np.empty(0, dtype=np.int32)
+        self.provider_id = np.empty(0, dtype=np.int64)
+        self.available = np.empty(0, dtype=bool)
+        # side tables
+        self.titles: List[str] = []
+        self.types: List[str] = []
+        self.locations: List[Optional[str]] = []
+        self.features: List[Any] = []
+        self.feature_terms: List[frozenset] = []
+        self.providers: Dict[int, CatalogProvider] = {}
+        # dictionaries for the coded columns
+        self.type_names: List[str] = []
+        self._type_codes: Dict[str, int] = {}
+        self.location_keys: List[str] = []
+        self._location_ids: Dict[str, int] = {}
+        self._row_by_id: Dict[int, int] = {}
+        self._location_match_cache: Dict[str, np.ndarray] = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    # ---- coding helpers ----
+    def _code_type(self, service_type: str) -> int:
+        name = (service_type or "").lower()
+        code = self._type_codes.get(name)
+        if code is None:
+            code = len(self.type_names)
+            self.type_names.append(name)
+            self._type_codes[name] = code
+        return code
+
+    def _code_location(self, location_key: Optional[str]) -> int:
+        key = location_key or ""
+        loc_id = self._location_ids.get(key)
+        if loc_id is None:
+            loc_id = len(self.location_keys)
+            self.location_keys.append(key)
+            self._location_ids[key] = loc_id
+            self._location_match_cache.clear()
+        return loc_id
+
+    def _set_provider(self, row) -> None:
+        if row.provider_id is not None:
+            self.providers[row.provider_id] = CatalogProvider(
+                id=row.provider_id, name=row.provider_name, contact_phone=row.provider_phone
+            )
+
+    # ---- loading ----
+    @classmethod
+    def build(cls, rows: Sequence, generation: int, last_event_id: str) -> "ServiceCatalog":
+        """A new snapshot from fetched rows. CPU only, so it can run in a worker thread."""
+        catalog = cls()
+        n = len(rows)
+        catalog.ids = np.fromiter((r.id for r in rows), dtype=np.int64, count=n)
+        catalog.price = np.fromiter((np.nan if r.price is None else r.price for r in rows), dtype=np.float64, count=n)
+        catalog.rating = np.fromiter((np.nan if r.rating is None else r.rating for r in rows), dtype=np.float64, count=n)
+        catalog.latitude = np.fromiter((np.nan if r.latitude is None else r.latitude for r in rows), dtype=np.float64, count=n)
+        catalog.longitude = np.fromiter((np.nan if r.longitude is None else r.longitude for r in rows), dtype=np.float64, count=n)
+        catalog.type_code = np.fromiter((catalog._code_type(r.type) for r in rows), dtype=np.int32, count=n)
+        catalog.location_id = np.fromiter((catalog._code_location(r.location_key) for r in rows), dtype=np.int32, count=n)
+        catalog.provider_id = np.fromiter((r.provider_id or 0 for r in rows), dtype=np.int64, count=n)
+        catalog.available = np.fromiter((bool(r.is_available) for r in rows), dtype=bool, count=n)
+        catalog.titles = [r.title for r in rows]
+        catalog.types = [r.type for r in rows]
+        catalog.locations = [r.location for r in rows]
+        catalog.features = [r.features for r in rows]
+        catalog.feature_terms = [feature_terms(r.features) for r in rows]
+        for r in rows:
+            catalog._set_provider(r)
+        catalog._row_by_id = {int(service_id): i for i, service_id in enumerate(catalog.ids)}
+
+        catalog.generation = generation
+        catalog.last_event_id = last_event_id
+        catalog.loaded = True
+        catalog.loaded_at = catalog.synced_at = time.monotonic()
+        return catalog
+
+    @classmethod
+    async def fetch(cls, session: AsyncSession, redis_client=None) -> "ServiceCatalog":
+        """Full reload from Postgres (one query, no ORM entities), built off the event loop."""
+        started = time.perf_counter()
+        # read the event cursor first so nothing published during the load is lost
+        generation, last_event_id = await _read_cursor(redis_client)
+
+        result = await session.execute(
+            select(*_service_columns()).outerjoin(ServiceProvider, Service.provider_id == ServiceProvider.id)
+        )
+        rows = result.all()
+        catalog = await asyncio.to_thread(cls.build, rows, generation, last_event_id)
+        logger.info(f"📦 [Catalog] Loaded {len(rows)} services in {(time.perf_counter() - started) * 1000:.1f} ms (generation {generation})")
+        return catalog
+
+    # ---- incremental refresh ----
+    async def sync(self, session: AsyncSession, redis_client) -> bool:
+        """
+        Bring the snapshot up to date with published change events. Returns
+        False when it is too old or too far behind and needs a full reload.
+        """
+        now = time.monotonic()
+        if now - self.loaded_at > settings.SERVICE_CATALOG_MAX_AGE_SECONDS:
+            return False
+        if now - self.synced_at < settings.SERVICE_CATALOG_SYNC_SECONDS:
+            return True
+
+        generation = int(await redis_client.get(CATALOG_GENERATION_KEY) or 0)
+        if generation == self.generation:
+            self.synced_at = now
+            return True
+
+        events = await redis_client.xrange(
+            CATALOG_STREAM_KEY, min=f"({self.last_event_id}", count=MAX_INCREMENTAL_EVENTS + 1
+        )
+        if len(events) > MAX_INCREMENTAL_EVENTS or self.generation + len(events) != generation:
+            # too far behind, stream trimmed, or concurrent publishers: start over
+            return False
+
+        changed: Dict[int, str] = {}
+        for _, fields in events:
+            changed[int(fields["service_id"])] = fields["action"]
+        await self._apply(session, changed)
+
+        self.generation = generation
+        self.last_event_id = events[-1][0] if events else self.last_event_id
+        self.synced_at = now
+        return True
+
+    async def _apply(self, session: AsyncSession, changed: Dict[int, str]) -> None:
+        deleted = [sid for sid, action in changed.items() if action == "delete"]
+        upserted = [sid for sid, action in changed.items() if action != "delete"]
+
+        for sid in deleted:
+            row = self._row_by_id.get(sid)
+            if row is not None:
+                self.available[row] = False
+
+        if not upserted:
+            return
+        result = await session.execute(
+            select(*_service_columns())
+            .outerjoin(ServiceProvider, Service.provider_id == ServiceProvider.id)
+            .where(Service.id.in_(upserted))
+        )
+        rows = result.all()
+
+        new_rows = [r for r in rows if r.id not in self._row_by_id]
+        if new_rows:
+            start = len(self.ids)
+            grow = len(new_rows)
+            self.ids = np.concatenate([self.ids, np.fromiter((r.id for r in new_rows), dtype=np.int64, count=grow)])
+            self.price = np.concatenate([self.price, np.full(grow, np.nan)])
+            self.rating = np.concatenate([self.rating, np.full(grow, np.nan)])
+            self.latitude = np.concatenate([self.latitude, np.full(grow, np.nan)])
+            self.longitude = np.concatenate([self.longitude, np.full(grow, np.nan)])
+            self.type_code = np.concatenate([self.type_code, np.zeros(grow, dtype=np.int32)])
+            self.location_id = np.concatenate([self.location_id, np.zeros(grow, dtype=np.int32)])
+            self.provider_id = np.concatenate([self.provider_id, np.zeros(grow, dtype=np.int64)])
+            self.available = np.concatenate([self.available, np.zeros(grow, dtype=bool)])
+            self.titles.extend([None] * grow)
+            self.types.extend([None] * grow)
+            self.locations.extend([None] * grow)
+            self.features.extend([None] * grow)
+            self.feature_terms.extend([frozenset()] * grow)
+            for offset, r in enumerate(new_rows):
+                self._row_by_id[r.id] = start + offset
+
+        for r in rows:
+            i = self._row_by_id[r.id]
+            self.price[i] = np.nan if r.price is None else r.price
+            self.rating[i] = np.nan if r.rating is None else r.rating
+            self.latitude[i] = np.nan if r.latitude is None else r.latitude
+            self.longitude[i] = np.nan if r.longitude is None else r.longitude
+            self.type_code[i] = self._code_type(r.type)
+            self.location_id[i] = self._code_location(r.location_key)
+            self.provider_id[i] = r.provider_id or 0
+            self.available[i] = bool(r.is_available)
+            self.titles[i] = r.title
+            self.types[i] = r.type
+            self.locations[i] = r.location
+            self.features[i] = r.features
+            self.feature_terms[i] = feature_terms(r.features)
+            self._set_provider(r)
+
+        # ids that were published but no longer exist were deleted in between
+        for sid in set(upserted) - {r.id for r in rows}:
+            row = self._row_by_id.get(sid)
+            if row is not None:
+                self.available[row] = False
+
+        logger.info(f"📦 [Catalog] Applied {len(changed)} change(s), {len(self)} rows")
+
+    # ---- queries ----
+    def _location_mask(self, location_key: str) -> np.ndarray:
+        """Per-location-id boolean table: does the location contain the key?"""
+        match = self._location_match_cache.get(location_key)
+        if match is None:
+            match = np.fromiter(
+                (location_key in loc for loc in self.location_keys),
+                dtype=bool, count=len(self.location_keys)
+            )
+            self._location_match_cache[location_key] = match
+        return match
+
+    def _type_mask(self, type_filter: str) -> np.ndarray:
+        needle = type_filter.lower()
+        return np.fromiter((needle in name for name in self.type_names), dtype=bool, count=len(self.type_names))
+
+    def distance_km(self, latitude: float, longitude: float, rows=None) -> np.ndarray:
+        """Haversine distance from a point to `rows` (all rows by default); NaN without coordinates."""
+        lats = self.latitude if rows is None else self.latitude[rows]
+        lons = self.longitude if rows is None else self.longitude[rows]
+        lat1 = np.radians(latitude)
+        lat2 = np.radians(lats)
+        a = (
+            np.sin((lat2 - lat1) / 2) ** 2
+            + np.cos(lat1) * np.cos(lat2) * np.sin(np.radians(lons - longitude) / 2) ** 2
+        )
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    def _radius_mask(self, latitude: float, longitude: float, radius_km: float) -> np.ndarray:
+        # a latitude band is two comparisons per row; exact distances only for rows inside it
+        band = np.flatnonzero(np.abs(self.latitude - latitude) <= radius_km / KM_PER_DEGREE)
+        mask = np.zeros(len(self), dtype=bool)
+        mask[band] = self.distance_km(latitude, longitude, band) <= radius_km
+        return mask
+
+    def candidate_rows(
+        self,
+        location_key: str,
+        budget_min: Optional[float] = None,
+        budget_max: Optional[float] = None,
+        max_price: Optional[float] = None,
+        service_type: Optional[str] = None,
+        feature_filters: Sequence[FeatureFilter] = (),
+        near: Optional[Tuple[float, float, float]] = None
+    ) -> np.ndarray:
+        """
+        Row indexes matching the filters, ordered by price ascending.
+        `near` is (latitude, longitude, radius_km): services with coordinates
+        must be inside the radius, services without them fall back to the
+        location text match.
+        """
+        if not len(self):
+            return np.empty(0, dtype=np.int64)
+        location_match = self._location_mask(location_key)[self.location_id]
+        if near is not None:
+            latitude, longitude, radius_km = near
+            location_match = (location_match & np.isnan(self.latitude)) | self._radius_mask(latitude, longitude, radius_km)
+        mask = self.available & location_match
+        # NaN prices compare False, matching SQL NULL semantics
+        if budget_min is not None and budget_max is not None:
+            mask &= (self.price >= budget_min) & (self.price <= budget_max)
+        elif max_price is not None:
+            mask &= self.price <= max_price
+        if service_type:
+            mask &= self._type_mask(service_type)[self.type_code]
+        rows = np.flatnonzero(mask)
+        if feature_filters:
+            # run after the vectorized masks so only surviving rows are inspected
+            rows = np.fromiter(
+                (i for i in rows if all(f.matches(self.features[i]) for f in feature_filters)),
+                dtype=np.int64
+            )
+        return rows[np.argsort(self.price[rows], kind="stable")]
+
+    def materialize(self, rows) -> List[CatalogService]:
+        return [
+            CatalogService(
+                id=int(self.ids[i]),
+                title=self.titles[i],
+                type=self.types[i],
+                price=None if np.isnan(self.price[i]) else float(self.price[i]),
+                rating=None if np.isnan(self.rating[i]) else float(self.rating[i]),
+                location=self.locations[i],
+                latitude=None if np.isnan(self.latitude[i]) else float(self.latitude[i]),
+                longitude=None if np.isnan(self.longitude[i]) else float(self.longitude[i]),
+                is_available=bool(self.available[i]),
+                features=self.features[i],
+                provider=self.providers.get(int(self.provider_id[i])),
+                feature_terms=self.feature_terms[i],
+            )
+            for i in rows
+        ]
+
+
+@dataclass
+class CatalogCandidates:
+    """Candidate rows of a catalog snapshot; ranking materializes only the ones it keeps."""
+    catalog: ServiceCatalog
+    rows: np.ndarray
+
+    def __len__(self):
+        return len(self.rows)
+
+
+async def _read_cursor(redis_client) -> Tuple[int, str]:
+    if redis_client is None:
+        return 0, "0-0"
+    generation = int(await redis_client.get(CATALOG_GENERATION_KEY) or 0)
+    last = await redis_client.xrevrange(CATALOG_STREAM_KEY, count=1)
+    return generation, (last[0][0] if last else "0-0")
+
+
+_catalog: Optional[ServiceCatalog] = None
+_catalog_lock = asyncio.Lock()
+_reload_task: Optional["asyncio.Task[None]"] = None
+_reload_not_before = 0.0  # monotonic time; backs off after a failed reload
+
+
+async def _reload_catalog() -> None:
+    """Build a fresh snapshot in its own session and swap it in."""
+    global _catalog, _reload_not_before
+    try:
+        redis_client = await init_redis_client()
+        async with SessionLocal() as session:
+            _catalog = await ServiceCatalog.fetch(session, redis_client)
+    except Exception as e:
+        _reload_not_before = time.monotonic() + settings.SERVICE_CATALOG_SYNC_SECONDS * 30
+        logger.error(f"🔥 [Catalog] Background reload failed, serving the previous snapshot: {e}")
+
+
+def _start_reload() -> None:
+    global _reload_task
+    if (_reload_task is None or _reload_task.done()) and time.monotonic() >= _reload_not_before:
+        _reload_task = asyncio.create_task(_reload_catalog())
+
+
+async def get_service_catalog(session: AsyncSession) -> ServiceCatalog:
+    """
+    Return this worker's catalog snapshot, synced with published changes.
+    Only the very first call waits for a full load. Later full reloads are
+    built in the background while the current snapshot keeps serving, and
+    requests that arrive during a sync get the snapshot as it is.
+    """
+    global _catalog
+    redis_client = await init_redis_client()
+    if _catalog is None:
+        async with _catalog_lock:
+            if _catalog is None:
+                _catalog = await ServiceCatalog.fetch(session, redis_client)
+        return _catalog
+    if _catalog_lock.locked():
+        return _catalog
+    async with _catalog_lock:
+        if not await _catalog.sync(session, redis_client):
+            _start_reload()
+    return _catalog
+
+
+async def publish_service_change(service_id: int, action: str) -> int:
+    """
+    Record a catalog change ("upsert" or "delete") for every worker to replay.
+    Returns the new catalog generation.
+    """
+    try:
+        redis_client = await init_redis_client()
+        # one script, so no reader sees the new generation without its event
+        return int(await redis_client.eval(
+            _PUBLISH_SCRIPT, 2, CATALOG_GENERATION_KEY, CATALOG_STREAM_KEY,
+            service_id, action, CATALOG_STREAM_MAXLEN
+        ))
+    except Exception as e:
+        # the catalog's max age still bounds staleness if Redis is unavailable
+        logger.error(f"🔥 [Catalog] Failed to publish change for service {service_id}: {e}")
+        return 0
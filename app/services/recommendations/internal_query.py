@@ -1,11 +1,16 @@
-from sqlalchemy import select
+from sqlalchemy import select, and_, or_
 from sqlalchemy.orm import joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 from app.models import Service, ServiceProvider, Trip
-from typing import List
+from typing import List, Optional, Sequence, Union
 from app.core.logger import logger
 import json
+from app.utils.normalize import location_city_key
+from app.utils.feature_filter import parse_feature_filters
+from app.core.config import settings
+from app.services.recommendations.catalog import get_service_catalog, CatalogCandidates
+from app.services.service.geo_search import within_radius_clause
 
 async def get_services_for_trip(
     session: AsyncSession,
@@ -16,8 +21,19 @@ async def get_services_for_trip(
     activity_interests: str = None,
     pace: str = None,
     budget_min: float = None,
-    budget_max: float = None
-) -> List[Service]:
+    budget_max: float = None,
+    feature_filters: Optional[Sequence[str]] = None
+) -> Union[List[Service], CatalogCandidates]:
+    """
+    Candidate services for a trip: catalog rows when the in-process catalog
+    is enabled, Service rows from SQL otherwise. `feature_filters` are
+    expressions in the feature filter language (app.utils.feature_filter)
+    that every candidate must satisfy; in SQL they run against the
+    GIN-indexed features column.
+    When the trip has coordinates, services with coordinates must lie within
+    RECOMMENDATION_RADIUS_KM of it; services without them still match on
+    location text.
+    """
     if not trip:
         raise HTTPException(status_code=404, detail="Trip not found.")
 
@@ -26,11 +42,47 @@ async def get_services_for_trip(
     if effective_budget <= 0:
         raise HTTPException(status_code=400, detail="Trip budget must be greater than zero.")
 
+    location_key = location_city_key(trip.location)
+    if not location_key:
+        raise HTTPException(status_code=400, detail="Trip location is required.")
+
+    try:
+        parsed_filters = parse_feature_filters(feature_filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    near = None
+    if trip.latitude is not None and trip.longitude is not None:
+        near = (trip.latitude, trip.longitude, settings.RECOMMENDATION_RADIUS_KM)
+
+    if settings.SERVICE_CATALOG_ENABLED:
+        try:
+            catalog = await get_service_catalog(session)
+            rows = catalog.candidate_rows(
+                location_key,
+                budget_min=budget_min,
+                budget_max=budget_max,
+                max_price=effective_budget * 1.1,
+                service_type=accommodation_type,
+                feature_filters=parsed_filters,
+                near=near
+            )
+            logger.info(f"🔍 [Catalog] {len(rows)} of {len(catalog)} services match trip filters")
+            return CatalogCandidates(catalog, rows)
+        except Exception as e:
+            logger.error(f"🔥 [Catalog] Falling back to SQL candidate query: {e}")
+
     try:
-        filters = [
-            Service.location.ilike(f"%{trip.location}%"),
-            Service.is_available == True
-        ]
+        # location_key is normalized and trigram-indexed, so this substring
+        # match is a GIN index lookup instead of a sequential scan.
+        # The key only holds letters, digits and spaces, so it needs no LIKE escaping.
+        location_match = Service.location_key.like(f"%{location_key}%")
+        if near is not None:
+            location_match = or_(
+                and_(location_match, Service.latitude.is_(None)),
+                within_radius_clause(*near)
+            )
+        filters = [location_match, Service.is_available == True]
         # Use budget range if provided
         if budget_min is not None and budget_max is not None:
             filters.append(Service.price >= budget_min)
@@ -39,7 +91,8 @@ async def get_services_for_trip(
             filters.append(Service.price <= effective_budget * 1.1)
         if accommodation_type:
             filters.append(Service.type.ilike(f"%{accommodation_type}%"))
-        # You can add more filters for food_preferences, activity_interests, pace if your Service model supports them
+        # Feature requirements compile to @> / @? on the GIN-indexed features column
+        filters.extend(f.to_sql(Service.features) for f in parsed_filters)
 
         stmt = (
             select(Service)
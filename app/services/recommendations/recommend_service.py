@@ -1,102 +1,170 @@
 # services/recommendation_service.py
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, insert
+from sqlalchemy import select, insert, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from fastapi import HTTPException
 from app.models import Trip
 from app.schemas.recommendation.recommendation import RecommendationResponse,ProviderOut
 from app.services.recommendations.internal_query import get_services_for_trip
-from app.services.recommendations.rule_engine import group_and_select_top_services
+from app.services.recommendations.rule_engine import group_and_select_top_services, PreferenceProfile, RESPONSE_KEYS
+from app.services.recommendations.vote_tally import record_vote_change, read_vote_tally
+from app.services.recommendations.result_cache import (
+    catalog_generation, trip_version, trip_key, shared_key, destination_key, profile_hash, get_cached, set_cached
+)
+from app.core.config import settings
 from app.core.logger import logger
-from app.models.trips.trip_member_preference import TripMemberPreference
-from collections import Counter
+from app.services.trips.preference_profile_service import AggregatedPreferences, get_aggregated_preferences
+from typing import List, Optional
 from app.models.service.recommendation_models import TripRecommendedService, TripServiceVote
 from app.models.service.service_provider import Service,TripSelectedService
 from sqlalchemy.orm import joinedload,selectinload
 from app.schemas.recommendation.recommendation import TripRecommendedListResponse, TripRecommendedOption, RecommendedService
 
+async def refresh_trip_recommendations(
+    session: AsyncSession,
+    trip: Trip,
+    aggregate: Optional[AggregatedPreferences] = None
+) -> RecommendationResponse:
+    """
+    Run the full pipeline for one trip: read the aggregated preferences, rank
+    candidates, persist the ranked lists and refresh the trip's cache entry.
+    Commits. `aggregate` can be passed in by batch callers that loaded it already.
+    """
+    trip_id = trip.id
+    generation = await catalog_generation()
+    version = await trip_version(trip_id)
+
+    # Step 1: Aggregated member preferences (one row, maintained by set_member_preference)
+    if aggregate is None:
+        aggregate = await get_aggregated_preferences(session, trip_id)
+    agg_budget = aggregate.budget if aggregate.budget is not None else trip.budget
+    budget_min = agg_budget * 0.8
+    budget_max = agg_budget * 1.2
+    accommodation_type = aggregate.accommodation_type
+    food_preferences = aggregate.food_preferences
+    activity_interests = aggregate.activity_interests
+    pace = aggregate.pace
+
+    # Step 2: Reuse a ranking computed for the same destination and group profile
+    profile = PreferenceProfile.from_term_counts(aggregate.term_counts, aggregate.member_count, budget_min, budget_max)
+    shared = shared_key(
+        destination_key(trip.location, trip.latitude, trip.longitude, settings.RECOMMENDATION_RADIUS_KM),
+        profile_hash(agg_budget, accommodation_type, profile, aggregate.feature_filters),
+        generation
+    )
+    response = await get_cached(shared)
+    if response:
+        logger.info(f"⚡ [Recommendations] Shared cache hit for trip {trip_id}")
+    else:
+        # Step 3: Fetch internal services based on aggregated prefs and budget range
+        services = await get_services_for_trip(session, trip, agg_budget, accommodation_type, food_preferences, activity_interests, pace, budget_min, budget_max, aggregate.feature_filters)
+
+        # Step 4: Score against member preferences and keep the top N per type
+        response = group_and_select_top_services(services, profile=profile)
+        await set_cached(shared, response)
+        logger.info(f"Generated {len(services)} internal services for trip {trip.id}")
+
+    # Step 5: Persist top lists per category for voting
+    await persist_recommendations(session, trip_id, response)
+    await session.commit()
+
+    await set_cached(trip_key(trip_id, generation), response, version=version)
+    return response
+
+async def get_persisted_recommendations(session: AsyncSession, trip_id: int) -> Optional[RecommendationResponse]:
+    """The trip's stored ranked lists, or None if nothing was ever computed for it."""
+    result = await session.execute(
+        select(TripRecommendedService)
+        .options(joinedload(TripRecommendedService.service).joinedload(Service.provider))
+        .where(TripRecommendedService.trip_id == trip_id)
+        .order_by(TripRecommendedService.rank.asc().nulls_last())
+    )
+    recs = result.scalars().all()
+    if not recs:
+        return None
+
+    response_data = {key: [] for key in RESPONSE_KEYS.values()}
+    for rec in recs:
+        key = RESPONSE_KEYS.get((rec.service_type or "").lower())
+        if key is None:
+            continue
+        svc: Service = rec.service
+        response_data[key].append(
+            RecommendedService(
+                id=svc.id,
+                title=svc.title,
+                type=svc.type,
+                price=svc.price,
+                rating=svc.rating,
+                provider=ProviderOut.model_validate(svc.provider) if svc.provider else None,
+                location=svc.location,
+                is_available=svc.is_available,
+                features=svc.features,
+            )
+        )
+    return RecommendationResponse(**response_data)
+
 async def generate_recommendations_for_trip(
     session: AsyncSession,
     trip_id: int
 ) -> RecommendationResponse:
-    # Step 1: Get trip
+    """
+    Read path for a trip's recommendations. Lists are recomputed in the
+    background when preferences, the trip or the catalog change; this only
+    computes inline for a trip that has never been ranked.
+    """
     trip = await session.get(Trip, trip_id)
 
     if not trip:
         raise HTTPException(status_code=404, detail="Trip not found.")
 
-    logger.info(f"[Trip] ID: {trip.id}, Location: {trip.location}, Budget: {trip.budget}")
+    generation = await catalog_generation()
+    version = await trip_version(trip_id)
+    cached = await get_cached(trip_key(trip_id, generation), version=version)
+    if cached:
+        logger.info(f"⚡ [Recommendations] Cache hit for trip {trip_id}")
+        return cached
 
-    # Step 1.5: Aggregate member preferences
-    result = await session.execute(
-        select(TripMemberPreference).where(TripMemberPreference.trip_id == trip_id)
-    )
-    prefs = result.scalars().all()
-    if prefs:
-        budgets = [p.budget for p in prefs if p.budget is not None]
-        agg_budget = sum(budgets) / len(budgets) if budgets else trip.budget
-        budget_min = agg_budget * 0.8
-        budget_max = agg_budget * 1.2
-        def most_common(lst):
-            return Counter([x for x in lst if x]).most_common(1)[0][0] if lst else None
-        accommodation_type = most_common([p.accommodation_type for p in prefs])
-        food_preferences = most_common([p.food_preferences for p in prefs])
-        activity_interests = most_common([p.activity_interests for p in prefs])
-        pace = most_common([p.pace for p in prefs])
-    else:
-        agg_budget = trip.budget
-        budget_min = agg_budget * 0.8
-        budget_max = agg_budget * 1.2
-        accommodation_type = None
-        food_preferences = None
-        activity_interests = None
-        pace = None
-
-    # Step 2: Fetch internal services based on aggregated prefs and budget range
-    services = await get_services_for_trip(session, trip, agg_budget, accommodation_type, food_preferences, activity_interests, pace, budget_min, budget_max)
-
-    # Step 3: Pass to rule engine for top N per type
-    response = group_and_select_top_services(services)
-
-    # Step 4: Persist top lists per category for voting
-    # Map response back to services so we can store ids with rank
-    type_to_services: dict[str, list[Service]] = {
-        "hotels": [s for s in services if s.type.lower() == "hotel"],
-        "buses": [s for s in services if s.type.lower() == "bus"],
-        "rentals": [s for s in services if s.type.lower() == "rental"],
-        "packages": [s for s in services if s.type.lower() == "package"],
-    }
-
-    # For each category, store up to 4 items with rank
-    for category, rec_list in (
-        ("hotels", response.hotels),
-        ("buses", response.buses),
-        ("rentals", response.rentals),
-        ("packages", response.packages),
-    ):
-        for rank, item in enumerate(rec_list[:4], start=1):
-            # upsert-like: check exists then insert if missing
-            existing = await session.execute(
-                select(TripRecommendedService).where(
-                    TripRecommendedService.trip_id == trip_id,
-                    TripRecommendedService.service_id == item.id,
-                )
+    # Not written back to the cache: a background refresh may be about to
+    # replace these rows, and only the refresh writes the trip's cache entry.
+    persisted = await get_persisted_recommendations(session, trip_id)
+    if persisted is not None:
+        return persisted
+
+    logger.info(f"[Trip] ID: {trip.id}, Location: {trip.location}, Budget: {trip.budget} - first ranking")
+    return await refresh_trip_recommendations(session, trip)
+
+async def persist_recommendations(
+    session: AsyncSession,
+    trip_id: int,
+    response: RecommendationResponse,
+    per_category: int = 4
+) -> None:
+    """
+    Store the ranked lists with one upsert, and drop recommendations that
+    fell out of them. Both statements run in the caller's transaction.
+    """
+    rows = [
+        {"trip_id": trip_id, "service_id": item.id, "service_type": item.type, "rank": rank}
+        for rec_list in (response.hotels, response.buses, response.rentals, response.packages)
+        for rank, item in enumerate(rec_list[:per_category], start=1)
+    ]
+
+    prune = delete(TripRecommendedService).where(TripRecommendedService.trip_id == trip_id)
+    if rows:
+        prune = prune.where(TripRecommendedService.service_id.not_in([row["service_id"] for row in rows]))
+    await session.execute(prune)
+
+    if rows:
+        stmt = pg_insert(TripRecommendedService).values(rows)
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[TripRecommendedService.trip_id, TripRecommendedService.service_id],
+                set_={"service_type": stmt.excluded.service_type, "rank": stmt.excluded.rank}
             )
-            trs = existing.scalar_one_or_none()
-            if trs:
-                trs.service_type = item.type
-                trs.rank = rank
-            else:
-                session.add(TripRecommendedService(
-                    trip_id=trip_id,
-                    service_id=item.id,
-                    service_type=item.type,
-                    rank=rank,
-                ))
-    await session.commit()
+        )
 
-    logger.info(f"Generated {len(services)} internal services for trip {trip.id}")
-    return response
 
 async def cast_vote(session: AsyncSession, trip_id: int, user_id: int, service_type: str, service_id: int) -> None:
     # Ensure the option exists in recommended list for this trip
@@ -110,15 +178,17 @@ async def cast_vote(session: AsyncSession, trip_id: int, user_id: int, service_t
     if not exists.scalar_one_or_none():
         raise HTTPException(status_code=400, detail="Service is not in recommended list for this trip")
 
-    # Upsert vote per (trip,user,service_type)
+    # Upsert vote per (trip,user,service_type); lock the row so the previous
+    # choice read here is the one this update replaces
     existing = await session.execute(
         select(TripServiceVote).where(
             TripServiceVote.trip_id == trip_id,
             TripServiceVote.user_id == user_id,
             TripServiceVote.service_type == service_type,
-        )
+        ).with_for_update()
     )
     vote = existing.scalar_one_or_none()
+    previous_service_id = vote.service_id if vote else None
     if vote:
         vote.service_id = service_id
     else:
@@ -130,19 +200,11 @@ async def cast_vote(session: AsyncSession, trip_id: int, user_id: int, service_t
         ))
     await session.commit()
 
+    await record_vote_change(trip_id, service_type, service_id, previous_service_id)
+
 async def get_vote_counts(session: AsyncSession, trip_id: int, service_type: str) -> dict[int, int]:
-    # Return vote counts per service_id for given category
-    result = await session.execute(
-        select(TripServiceVote.service_id).where(
-            TripServiceVote.trip_id == trip_id,
-            TripServiceVote.service_type == service_type,
-        )
-    )
-    service_ids = [row[0] for row in result.all()]
-    counts: dict[int, int] = {}
-    for sid in service_ids:
-        counts[sid] = counts.get(sid, 0) + 1
-    return counts
+    # Return vote counts per service_id for given category (Redis tally, rebuilt on a miss)
+    return await read_vote_tally(session, trip_id, service_type)
 
 async def confirm_selection(session: AsyncSession, trip_id: int, service_type: str, service_id: int, notes: str | None = None):
     # Store final selection using existing TripSelectedService model
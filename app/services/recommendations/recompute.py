@@ -0,0 +1,132 @@
+# services/recommendations/recompute.py
+#
+# Event-driven refresh of persisted recommendations. Preference, trip and
+# catalog changes schedule a debounced background job; bursts of events for
+# the same trip (or destination) collapse into one recompute. The batch mode
+# refreshes every upcoming trip in one pass over the catalog snapshot.
+
+import asyncio
+from datetime import date
+from typing import Iterable, Optional
+from uuid import uuid4
+
+from fastapi import BackgroundTasks
+from sqlalchemy import select, func, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.logger import logger
+from app.core.redis_lifecyle import init_redis_client
+from app.models import Trip
+from app.services.recommendations.catalog import get_service_catalog
+from app.services.recommendations.recommend_service import refresh_trip_recommendations
+from app.services.trips.preference_profile_service import get_aggregated_preferences_bulk
+
+DEBOUNCE_KEY_PREFIX = "recommendations:recompute"
+
+
+def _trip_city_key():
+    """SQL mirror of location_city_key(Trip.location)."""
+    city = func.split_part(Trip.location, ",", 1)
+    return func.btrim(func.lower(func.regexp_replace(city, "[^[:alnum:]]+", " ", "g")))
+
+
+async def _claim(scope: str) -> Optional[str]:
+    """Record this event as the latest for `scope`; returns its token."""
+    token = uuid4().hex
+    try:
+        redis_client = await init_redis_client()
+        await redis_client.set(
+            f"{DEBOUNCE_KEY_PREFIX}:{scope}", token,
+            ex=int(settings.RECOMMENDATION_RECOMPUTE_DEBOUNCE_SECONDS * 10) + 60
+        )
+    except Exception as e:
+        logger.error(f"🔥 [Recompute] Debounce unavailable, running {scope} immediately: {e}")
+        return None
+    return token
+
+
+async def _is_latest(scope: str, token: Optional[str]) -> bool:
+    if token is None:
+        return True
+    try:
+        redis_client = await init_redis_client()
+        return await redis_client.get(f"{DEBOUNCE_KEY_PREFIX}:{scope}") == token
+    except Exception:
+        return True
+
+
+async def _debounced(scope: str, token: Optional[str], job, *args) -> None:
+    if token is not None:
+        await asyncio.sleep(settings.RECOMMENDATION_RECOMPUTE_DEBOUNCE_SECONDS)
+    if not await _is_latest(scope, token):
+        logger.info(f"⏭️ [Recompute] {scope} superseded by a newer change")
+        return
+    await job(*args)
+
+
+async def schedule_trip_recompute(background_tasks: Optional[BackgroundTasks], trip_id: int) -> None:
+    """Recompute a trip's recommendations shortly after its last change."""
+    if background_tasks is None:
+        return
+    scope = f"trip:{trip_id}"
+    token = await _claim(scope)
+    background_tasks.add_task(_debounced, scope, token, refresh_trips, [trip_id])
+
+
+async def schedule_location_recompute(background_tasks: Optional[BackgroundTasks], *location_keys: Optional[str]) -> None:
+    """Recompute upcoming trips whose destination matches a changed service's location."""
+    if background_tasks is None:
+        return
+    for location_key in {key for key in location_keys if key}:
+        scope = f"location:{location_key.replace(' ', '_')}"
+        token = await _claim(scope)
+        background_tasks.add_task(_debounced, scope, token, refresh_upcoming_trips, location_key)
+
+
+async def _refresh(session: AsyncSession, trips: list) -> int:
+    if not trips:
+        return 0
+    # one query for every trip's preference aggregate, one catalog sync for the batch
+    aggregates = await get_aggregated_preferences_bulk(session, [t.id for t in trips])
+    if settings.SERVICE_CATALOG_ENABLED:
+        await get_service_catalog(session)
+
+    # each trip writes in its own session: a failed trip rolls back alone and
+    # leaves the batch's loaded trips intact
+    refreshed = 0
+    for trip in trips:
+        async with SessionLocal() as write_session:
+            try:
+                await refresh_trip_recommendations(write_session, trip, aggregates[trip.id])
+                refreshed += 1
+            except Exception as e:
+                await write_session.rollback()
+                logger.error(f"🔥 [Recompute] Trip {trip.id} failed: {e}")
+    return refreshed
+
+
+async def refresh_trips(trip_ids: Iterable[int]) -> int:
+    """Background-task entry point: recompute the given trips."""
+    async with SessionLocal() as session:
+        result = await session.execute(select(Trip).where(Trip.id.in_(list(trip_ids))))
+        refreshed = await _refresh(session, result.scalars().all())
+    logger.info(f"🔄 [Recompute] Refreshed {refreshed} trip(s)")
+    return refreshed
+
+
+async def refresh_upcoming_trips(location_key: Optional[str] = None) -> int:
+    """
+    Batch mode: recompute every trip that has not ended yet, optionally only
+    those whose destination is contained in `location_key`.
+    """
+    async with SessionLocal() as session:
+        query = select(Trip).where(Trip.end_date >= date.today()).order_by(Trip.location, Trip.id)
+        if location_key:
+            city = _trip_city_key()
+            query = query.where(city != "", literal(location_key).contains(city))
+        result = await session.execute(query)
+        refreshed = await _refresh(session, result.scalars().all())
+    logger.info(f"🔄 [Recompute] Refreshed {refreshed} upcoming trip(s){f' for {location_key}' if location_key else ''}")
+    return refreshed
@@ -0,0 +1,131 @@
+# services/recommendations/result_cache.py
+#
+# Two cache levels for computed recommendations:
+#   - shared: keyed by destination, a hash of the aggregated preference
+#     profile (budget band, accommodation type, preference terms, feature
+#     requirements) and the catalog generation, so trips to the same place
+#     with similar groups reuse one ranking. Trips with coordinates get
+#     candidates by radius, so their destination also carries a small
+#     geohash cell and the radius;
+#   - per trip: the last response for a trip, tagged with the trip's
+#     recommendations version (bumped by preference and trip updates) and the
+#     catalog generation.
+# Catalog changes bump the generation, so every entry ages out on its TTL
+# instead of being deleted.
+
+import hashlib
+import json
+import math
+from typing import Optional, Sequence
+
+from app.core.cache import RedisCache
+from app.core.logger import logger
+from app.core.redis_lifecyle import init_redis_client
+from app.schemas.recommendation.recommendation import RecommendationResponse
+from app.services.recommendations.catalog import CATALOG_GENERATION_KEY
+from app.services.recommendations.rule_engine import PreferenceProfile
+from app.utils.geo import encode_geohash
+from app.utils.normalize import location_city_key
+
+RESULT_TTL_SECONDS = 3600
+VERSION_TTL_SECONDS = 86400
+# Budgets within the same ~10% step share a cache entry
+BUDGET_BAND_RATIO = 1.1
+# Trips whose coordinates fall in the same ~1.2 x 0.6 km cell share a cache entry
+SHARED_CELL_PRECISION = 6
+
+
+def budget_band(budget: Optional[float]) -> Optional[int]:
+    if not budget or budget <= 0:
+        return None
+    return round(math.log(budget, BUDGET_BAND_RATIO))
+
+
+def destination_key(
+    location: str,
+    latitude: Optional[float],
+    longitude: Optional[float],
+    radius_km: float
+) -> str:
+    """Shared-cache destination: the city, plus cell and radius for trips with coordinates."""
+    city = location_city_key(location)
+    if latitude is None or longitude is None:
+        return city
+    return f"{city}@{encode_geohash(latitude, longitude, SHARED_CELL_PRECISION)}r{radius_km:g}"
+
+
+def profile_hash(
+    budget: Optional[float],
+    accommodation_type: Optional[str],
+    profile: PreferenceProfile,
+    feature_filters: Sequence[str] = ()
+) -> str:
+    payload = {
+        "band": budget_band(budget),
+        "accommodation": (accommodation_type or "").lower(),
+        "features": sorted(feature_filters),
+        "terms": sorted((term, round(weight, 2)) for term, weight in profile.term_weights.items()),
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def shared_key(location_key: str, pref_hash: str, generation: int) -> str:
+    return RedisCache.build_key("recommendations", "shared", location_key.replace(" ", "_"), pref_hash, f"g{generation}")
+
+
+def trip_key(trip_id: int, generation: int) -> str:
+    return RedisCache.build_key("recommendations", "trip", trip_id, f"g{generation}")
+
+
+def version_key(trip_id: int) -> str:
+    return f"recommendations_version:{trip_id}"
+
+
+async def _cache() -> RedisCache:
+    return RedisCache(await init_redis_client())
+
+
+async def catalog_generation() -> int:
+    try:
+        redis_client = await init_redis_client()
+        return int(await redis_client.get(CATALOG_GENERATION_KEY) or 0)
+    except Exception as e:
+        logger.error(f"🔥 [Recommendations] Failed to read catalog generation: {e}")
+        return 0
+
+
+async def trip_version(trip_id: int) -> int:
+    try:
+        return (await (await _cache()).get(version_key(trip_id))) or 1
+    except Exception as e:
+        logger.error(f"🔥 [Recommendations] Failed to read version for trip {trip_id}: {e}")
+        return 1
+
+
+async def bump_trip_version(trip_id: int) -> None:
+    """Invalidate a trip's cached recommendations (preferences or trip details changed)."""
+    try:
+        redis_client = await init_redis_client()
+        key = version_key(trip_id)
+        # INCR from a missing key gives 1, which is the default version: start at 2
+        if await redis_client.incr(key) == 1:
+            await redis_client.incr(key)
+        await redis_client.expire(key, VERSION_TTL_SECONDS)
+    except Exception as e:
+        logger.error(f"🔥 [Recommendations] Failed to bump version for trip {trip_id}: {e}")
+
+
+async def get_cached(key: str, version: Optional[int] = None) -> Optional[RecommendationResponse]:
+    try:
+        data = await (await _cache()).get(key, version=version)
+    except Exception as e:
+        logger.error(f"🔥 [Recommendations] Cache read failed for {key}: {e}")
+        return None
+    return RecommendationResponse.model_validate(data) if data else None
+
+
+async def set_cached(key: str, response: RecommendationResponse, version: Optional[int] = None) -> None:
+    try:
+        await (await _cache()).set(key, response.model_dump(), expire=RESULT_TTL_SECONDS, version=version)
+    except Exception as e:
+        logger.error(f"🔥 [Recommendations] Cache write failed for {key}: {e}")
@@ -1,56 +1,258 @@
 # services/rule_engine.py
+#
+# Scores candidate services against the trip's aggregated preferences and
+# keeps the best N per service type. Scoring rules are pluggable: each rule
+# returns one score in [0, 1] per candidate and the engine takes a weighted sum.
+
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
-from collections import defaultdict
-from typing import List
 from app.models import Service
-from app.schemas.recommendation.recommendation import RecommendedService, RecommendationResponse
+from app.services.recommendations.catalog import CatalogCandidates, ServiceCatalog
+from app.utils.normalize import text_terms, feature_terms as service_feature_terms
+from app.schemas.recommendation.recommendation import RecommendedService, RecommendationResponse, ProviderOut
 
+# service type -> RecommendationResponse field
+RESPONSE_KEYS = {
+    "hotel": "hotels",
+    "bus": "buses",
+    "rental": "rentals",
+    "package": "packages",
+}
 
-def group_and_select_top_services(services: List[Service], top_n: int = 3) -> RecommendationResponse:
-    grouped_services = defaultdict(list)
 
-    # 1. Group by service type
-    for service in services:
-        grouped_services[service.type].append(service)
+@dataclass
+class PreferenceProfile:
+    """What the trip's members want, aggregated for scoring."""
+    budget_min: Optional[float] = None
+    budget_max: Optional[float] = None
+    # term -> share of members who asked for it
+    term_weights: Dict[str, float] = field(default_factory=dict)
 
-    # 2. Sort each group and pick top N
-    response_data = {
-        "hotels": [],
-        "buses": [],
-        "rentals": [],
-        "packages": []
-    }
+    @classmethod
+    def from_term_counts(
+        cls,
+        term_counts: Dict[str, int],
+        member_count: int,
+        budget_min: Optional[float],
+        budget_max: Optional[float]
+    ) -> "PreferenceProfile":
+        members = max(member_count, 1)
+        return cls(
+            budget_min=budget_min,
+            budget_max=budget_max,
+            term_weights={term: n / members for term, n in term_counts.items()}
+        )
 
-    for service_type, items in grouped_services.items():
-        # 3. Sort: rating (desc) > price (asc)
-        sorted_items = sorted(
-            items,
-            key=lambda s: (  # ensure rating None = 0
-                s.price or float('inf')
-            )
+    @classmethod
+    def from_preferences(cls, prefs: Sequence, budget_min: Optional[float], budget_max: Optional[float]) -> "PreferenceProfile":
+        counts = Counter()
+        for p in prefs:
+            member_terms = text_terms(p.food_preferences) | text_terms(p.activity_interests) | text_terms(p.pace)
+            counts.update(member_terms)
+        return cls.from_term_counts(counts, len(prefs), budget_min, budget_max)
+
+
+@dataclass
+class CandidateBatch:
+    """Column view of one group of candidates, built once and shared by all rules."""
+    ids: np.ndarray
+    price: np.ndarray
+    rating: np.ndarray
+    _load_feature_terms: Callable[[], List[frozenset]]
+    _feature_terms: Optional[List[frozenset]] = None
+
+    @classmethod
+    def from_services(cls, services: List[Service]) -> "CandidateBatch":
+        n = len(services)
+        return cls(
+            ids=np.fromiter((s.id for s in services), dtype=np.int64, count=n),
+            price=np.fromiter((np.nan if s.price is None else s.price for s in services), dtype=np.float64, count=n),
+            rating=np.fromiter((np.nan if s.rating is None else s.rating for s in services), dtype=np.float64, count=n),
+            # catalog rows carry precomputed terms; ORM rows are tokenized here
+            _load_feature_terms=lambda: [
+                getattr(s, "feature_terms", None) or service_feature_terms(s.features) for s in services
+            ],
+        )
+
+    @classmethod
+    def from_catalog(cls, catalog: ServiceCatalog, rows: np.ndarray) -> "CandidateBatch":
+        """Slices of the catalog's own columns; no per-candidate objects are built."""
+        return cls(
+            ids=catalog.ids[rows],
+            price=catalog.price[rows],
+            rating=catalog.rating[rows],
+            _load_feature_terms=lambda: [catalog.feature_terms[i] for i in rows],
         )
 
-        # 4. Map to schema and slice top N
-        recommended = [
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def feature_terms(self) -> List[frozenset]:
+        if self._feature_terms is None:
+            self._feature_terms = self._load_feature_terms()
+        return self._feature_terms
+
+
+@dataclass
+class ScoringRule:
+    name: str
+    weight: float
+    score: Callable[[CandidateBatch, PreferenceProfile], np.ndarray]
+
+
+def price_fit_score(batch: CandidateBatch, profile: PreferenceProfile) -> np.ndarray:
+    """1 inside the budget band, falling off linearly to 0 one band-width outside it."""
+    price = batch.price
+    if profile.budget_min is None or profile.budget_max is None:
+        # no band: cheaper is better
+        if not len(price) or np.all(np.isnan(price)):
+            return np.zeros(len(price))
+        high = np.nanmax(price)
+        return np.nan_to_num(1 - price / high if high > 0 else np.ones(len(price)), nan=0.0)
+    low, high = profile.budget_min, profile.budget_max
+    width = max(high - low, 1.0)
+    distance = np.maximum(low - price, 0) + np.maximum(price - high, 0)
+    return np.nan_to_num(np.clip(1 - distance / width, 0, 1), nan=0.0)
+
+
+def rating_score(batch: CandidateBatch, profile: PreferenceProfile) -> np.ndarray:
+    return np.nan_to_num(np.clip(batch.rating / 5.0, 0, 1), nan=0.0)
+
+
+def feature_match_score(batch: CandidateBatch, profile: PreferenceProfile) -> np.ndarray:
+    """Share of the members' food/activity/pace terms found in the service features."""
+    weights = profile.term_weights
+    total = sum(weights.values())
+    if not total:
+        return np.zeros(len(batch))
+    wanted = weights.keys()
+    # services often share feature sets, so score each distinct set once
+    memo: Dict[frozenset, float] = {}
+
+    def match(terms: frozenset) -> float:
+        score = memo.get(terms)
+        if score is None:
+            score = memo[terms] = sum(weights[t] for t in wanted & terms) / total
+        return score
+
+    terms = batch.feature_terms
+    return np.fromiter((match(t) for t in terms), dtype=np.float64, count=len(terms))
+
+
+DEFAULT_RULES: List[ScoringRule] = [
+    ScoringRule("price_fit", 0.5, price_fit_score),
+    ScoringRule("rating", 0.3, rating_score),
+    ScoringRule("feature_match", 0.2, feature_match_score),
+]
+
+
+def score_batch(
+    batch: CandidateBatch,
+    profile: PreferenceProfile,
+    rules: Iterable[ScoringRule] = DEFAULT_RULES
+) -> np.ndarray:
+    scores = np.zeros(len(batch))
+    for rule in rules:
+        if rule.weight:
+            scores += rule.weight * rule.score(batch, profile)
+    return scores
+
+
+def score_services(
+    services: List[Service],
+    profile: PreferenceProfile,
+    rules: Iterable[ScoringRule] = DEFAULT_RULES
+) -> np.ndarray:
+    return score_batch(CandidateBatch.from_services(services), profile, rules)
+
+
+def top_indexes(
+    batch: CandidateBatch,
+    profile: PreferenceProfile,
+    top_n: int,
+    rules: Iterable[ScoringRule] = DEFAULT_RULES
+) -> np.ndarray:
+    """Batch indexes of the best `top_n` by score; ties go to the cheaper, then lower-id candidate."""
+    scores = score_batch(batch, profile, rules)
+    if len(scores) > top_n:
+        # only candidates scoring at least the N-th best can make the cut
+        kth = np.partition(scores, len(scores) - top_n)[len(scores) - top_n]
+        pool = np.flatnonzero(scores >= kth)
+    else:
+        pool = np.arange(len(scores))
+    price = np.nan_to_num(batch.price[pool], nan=np.inf)
+    order = np.lexsort((batch.ids[pool], price, -scores[pool]))
+    return pool[order[:top_n]]
+
+
+def top_scored(
+    services: List[Service],
+    profile: PreferenceProfile,
+    top_n: int,
+    rules: Iterable[ScoringRule] = DEFAULT_RULES
+) -> List[Service]:
+    """Best `top_n` services by score; ties go to the cheaper, then lower-id service."""
+    if not services:
+        return []
+    return [services[i] for i in top_indexes(CandidateBatch.from_services(services), profile, top_n, rules)]
+
+
+def _ranked_groups(
+    candidates: Union[List[Service], CatalogCandidates],
+    top_n: int,
+    profile: PreferenceProfile,
+    rules: Iterable[ScoringRule]
+) -> Iterator[Tuple[str, List[Service]]]:
+    """(service type, best services) for each type group."""
+    if isinstance(candidates, CatalogCandidates):
+        catalog, rows = candidates.catalog, candidates.rows
+        codes = catalog.type_code[rows]
+        for code in np.unique(codes):
+            group = rows[codes == code]
+            best = top_indexes(CandidateBatch.from_catalog(catalog, group), profile, top_n, rules)
+            # only the winners become service objects
+            yield catalog.type_names[code], catalog.materialize(group[best])
+        return
+
+    grouped_services = defaultdict(list)
+    for service in candidates:
+        grouped_services[(service.type or "").lower()].append(service)
+    for service_type, items in grouped_services.items():
+        yield service_type, top_scored(items, profile, top_n, rules)
+
+
+def group_and_select_top_services(
+    services: Union[List[Service], CatalogCandidates],
+    top_n: int = 3,
+    profile: Optional[PreferenceProfile] = None,
+    rules: Iterable[ScoringRule] = DEFAULT_RULES
+) -> RecommendationResponse:
+    profile = profile or PreferenceProfile()
+    response_data = {key: [] for key in RESPONSE_KEYS.values()}
+
+    # Group by service type, score each group and keep its top N
+    for service_type, best in _ranked_groups(services, top_n, profile, rules):
+        key = RESPONSE_KEYS.get(service_type)
+        if key is None:
+            continue
+        response_data[key] = [
             RecommendedService(
                 id=svc.id,
                 title=svc.title,
                 type=svc.type,
                 price=svc.price,
                 rating=svc.rating,
-                provider_id=svc.provider.id,
-                provider_name=svc.provider.name,
+                provider=ProviderOut.model_validate(svc.provider),
                 location=svc.location,
                 is_available=svc.is_available,
-                source="internal",
                 features=svc.features
             )
-            for svc in sorted_items[:top_n]
+            for svc in best
         ]
 
-        # 5. Insert into correct response key
-        key = service_type.lower() + "s"  # hotel -> hotels, rental -> rentals
-        if key in response_data:
-            response_data[key] = recommended
-
     return RecommendationResponse(**response_data)
@@ -0,0 +1,128 @@
+# services/recommendations/vote_tally.py
+#
+# Live vote counts per (trip, service_type), kept as Redis hashes of
+# service_id -> votes. cast_vote moves a user's vote with one atomic script;
+# polls read a tally with a single HGETALL. A missing tally is rebuilt from
+# trip_service_votes with one GROUP BY.
+
+from typing import Dict, Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logger import logger
+from app.core.redis_lifecyle import init_redis_client
+from app.models.service.recommendation_models import TripServiceVote
+
+# Marks a tally as built, so "no votes yet" is not mistaken for "not cached"
+READY_FIELD = "_ready"
+# Bounds drift from votes that raced a rebuild
+TALLY_TTL_SECONDS = 3600
+
+# KEYS[1] = tally hash, ARGV[1] = new service_id, ARGV[2] = old service_id or ""
+# Only touches tallies that exist: a partial hash would under-count until expiry.
+_MOVE_VOTE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('HINCRBY', KEYS[1], ARGV[1], 1)
+if ARGV[2] ~= '' then
+    if redis.call('HINCRBY', KEYS[1], ARGV[2], -1) <= 0 then
+        redis.call('HDEL', KEYS[1], ARGV[2])
+    end
+end
+return 1
+"""
+
+
+def tally_key(trip_id: int, service_type: str) -> str:
+    return f"trip_votes:{trip_id}:{service_type}"
+
+
+async def record_vote_change(trip_id: int, service_type: str, service_id: int, previous_service_id: Optional[int]) -> None:
+    """Move one vote from `previous_service_id` (if any) to `service_id`."""
+    if previous_service_id == service_id:
+        return
+    try:
+        redis_client = await init_redis_client()
+        await redis_client.eval(
+            _MOVE_VOTE_SCRIPT, 1, tally_key(trip_id, service_type),
+            service_id, "" if previous_service_id is None else previous_service_id
+        )
+    except Exception as e:
+        # drop the tally so the next read rebuilds it from the database
+        logger.error(f"🔥 [Votes] Failed to update tally for trip {trip_id}/{service_type}: {e}")
+        await invalidate_vote_tally(trip_id, service_type)
+
+
+async def invalidate_vote_tally(trip_id: int, service_type: str) -> None:
+    try:
+        redis_client = await init_redis_client()
+        await redis_client.delete(tally_key(trip_id, service_type))
+    except Exception as e:
+        logger.error(f"🔥 [Votes] Failed to drop tally for trip {trip_id}/{service_type}: {e}")
+
+
+async def reconcile_vote_tallies(
+    session: AsyncSession,
+    trip_id: int,
+    service_type: Optional[str] = None
+) -> Dict[str, Dict[int, int]]:
+    """
+    Rebuild a trip's tallies (all types, or just `service_type`) from
+    trip_service_votes with one GROUP BY and replace the Redis hashes.
+    Returns {service_type: {service_id: votes}}.
+    """
+    query = (
+        select(
+            TripServiceVote.service_type,
+            TripServiceVote.service_id,
+            func.count(TripServiceVote.id).label("votes")
+        )
+        .where(TripServiceVote.trip_id == trip_id)
+        .group_by(TripServiceVote.service_type, TripServiceVote.service_id)
+    )
+    if service_type is not None:
+        query = query.where(TripServiceVote.service_type == service_type)
+    result = await session.execute(query)
+
+    tallies: Dict[str, Dict[int, int]] = {}
+    if service_type is not None:
+        tallies[service_type] = {}
+    for row in result:
+        tallies.setdefault(row.service_type, {})[row.service_id] = row.votes
+
+    try:
+        redis_client = await init_redis_client()
+        if service_type is not None:
+            stale = [tally_key(trip_id, service_type)]
+        else:
+            stale = [key async for key in redis_client.scan_iter(match=f"{tally_key(trip_id, '')}*")]
+        async with redis_client.pipeline(transaction=True) as pipe:
+            if stale:
+                pipe.delete(*stale)
+            for tally_type, counts in tallies.items():
+                key = tally_key(trip_id, tally_type)
+                pipe.hset(key, mapping={READY_FIELD: 1, **counts})
+                pipe.expire(key, TALLY_TTL_SECONDS)
+            await pipe.execute()
+    except Exception as e:
+        logger.error(f"🔥 [Votes] Failed to store tallies for trip {trip_id}: {e}")
+
+    logger.info(f"🗳️ [Votes] Reconciled {len(tallies)} tallies for trip {trip_id}")
+    return tallies
+
+
+async def read_vote_tally(session: AsyncSession, trip_id: int, service_type: str) -> Dict[int, int]:
+    """Vote counts per service_id: one HGETALL, or a GROUP BY rebuild on a miss."""
+    try:
+        redis_client = await init_redis_client()
+        tally = await redis_client.hgetall(tally_key(trip_id, service_type))
+    except Exception as e:
+        logger.error(f"🔥 [Votes] Failed to read tally for trip {trip_id}/{service_type}: {e}")
+        tally = {}
+
+    if READY_FIELD not in tally:
+        tallies = await reconcile_vote_tallies(session, trip_id, service_type)
+        return tallies[service_type]
+    return {int(service_id): int(votes) for service_id, votes in tally.items() if service_id != READY_FIELD and int(votes) > 0}
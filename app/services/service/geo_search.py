@@ -0,0 +1,63 @@
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, func, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.models.service.service_provider import Service
+from app.utils.geo import EARTH_RADIUS_KM, KM_PER_DEGREE, covering_prefixes
+
+
+def distance_km_expr(latitude: float, longitude: float):
+    """Great-circle distance (haversine) from a point to Service coordinates, in SQL."""
+    dlat = func.radians(Service.latitude - latitude)
+    dlon = func.radians(Service.longitude - longitude)
+    a = (
+        func.power(func.sin(dlat / 2), 2)
+        + func.cos(func.radians(literal(latitude))) * func.cos(func.radians(Service.latitude))
+        * func.power(func.sin(dlon / 2), 2)
+    )
+    return 2 * EARTH_RADIUS_KM * func.asin(func.least(1.0, func.sqrt(a)))
+
+
+def within_radius_clause(latitude: float, longitude: float, radius_km: float):
+    """
+    Services within `radius_km`. The geohash prefix ranges (or, for very
+    large radii, a latitude band) are what the index serves; the exact
+    distance check then trims the corners.
+    """
+    prefixes = covering_prefixes(latitude, longitude, radius_km)
+    if prefixes:
+        # '~' sorts after every geohash character under the C collation
+        coarse = or_(*(
+            and_(Service.geohash >= prefix, Service.geohash < prefix + "~")
+            for prefix in prefixes
+        ))
+    else:
+        delta = radius_km / KM_PER_DEGREE
+        coarse = Service.latitude.between(latitude - delta, latitude + delta)
+    return and_(coarse, distance_km_expr(latitude, longitude) <= radius_km)
+
+
+async def find_nearby_services(
+    db: AsyncSession,
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    limit: int = 20,
+    service_type: Optional[str] = None
+) -> List[Tuple[Service, float]]:
+    """Available services within `radius_km`, nearest first, with their distance."""
+    distance = distance_km_expr(latitude, longitude).label("distance_km")
+    filters = [within_radius_clause(latitude, longitude, radius_km), Service.is_available == True]
+    if service_type:
+        filters.append(Service.type.ilike(f"%{service_type}%"))
+
+    result = await db.execute(
+        select(Service, distance)
+        .options(joinedload(Service.provider))
+        .where(*filters)
+        .order_by(distance, Service.id)
+        .limit(limit)
+    )
+    return [(service, distance_km) for service, distance_km in result.all()]
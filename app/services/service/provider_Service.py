@@ -1,12 +1,15 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from fastapi import HTTPException, status
+from fastapi import HTTPException, status, BackgroundTasks
+from typing import Optional
 
 from app.models.service.service_provider import Service
 from app.schemas.services.service_schema import ServiceCreate, ServiceUpdate
 from app.models.user.user import User
 
 from app.services.auth.provider_profile import ProviderProfileService
+from app.services.recommendations.catalog import publish_service_change
+from app.services.recommendations.recompute import schedule_location_recompute
 
 class ServiceProviderService:
 
@@ -25,7 +28,8 @@ class ServiceProviderService:
     async def create_service(
         provider: User,
         data: ServiceCreate,
-        db: AsyncSession
+        db: AsyncSession,
+        background_tasks: Optional[BackgroundTasks] = None
     )-> Service:
         
         provider = await ProviderProfileService.get_by_user(provider, db)
@@ -37,6 +41,8 @@ class ServiceProviderService:
             description=data.description,
             type=data.type,
             location=data.location,
+            latitude=data.latitude,
+            longitude=data.longitude,
             price=data.price,
             features=data.features,
             is_available=data.is_available
@@ -45,6 +51,8 @@ class ServiceProviderService:
         db.add(new_service)
         await db.commit()
         await db.refresh(new_service)
+        await publish_service_change(new_service.id, "upsert")
+        await schedule_location_recompute(background_tasks, new_service.location_key)
         return new_service
     
     @staticmethod
@@ -58,7 +66,13 @@ class ServiceProviderService:
         return services
 
     @staticmethod
-    async def update_service(user: User, service_id: int, data: ServiceUpdate, db: AsyncSession) -> Service:
+    async def update_service(
+        user: User,
+        service_id: int,
+        data: ServiceUpdate,
+        db: AsyncSession,
+        background_tasks: Optional[BackgroundTasks] = None
+    ) -> Service:
         provider = await ProviderProfileService.get_by_user(user, db)
         result = await db.execute(
             select(Service).where(Service.id == service_id, Service.provider_id == provider.id)
@@ -71,16 +85,24 @@ class ServiceProviderService:
         if not update_fields:
             raise HTTPException(status_code=400, detail="No fields provided to update.")
 
+        previous_location_key = service.location_key
         for key, value in update_fields.items():
             setattr(service, key, value)
 
         await db.commit()
         await db.refresh(service)
+        await publish_service_change(service.id, "upsert")
+        await schedule_location_recompute(background_tasks, previous_location_key, service.location_key)
         return service
 
 
     @staticmethod
-    async def delete_service(user: User, service_id: int, db: AsyncSession):
+    async def delete_service(
+        user: User,
+        service_id: int,
+        db: AsyncSession,
+        background_tasks: Optional[BackgroundTasks] = None
+    ):
         provider = await ProviderProfileService.get_by_user(user, db)
         result = await db.execute(
             select(Service).where(Service.id == service_id, Service.provider_id == provider.id)
@@ -89,8 +111,11 @@ class ServiceProviderService:
         if not service:
             raise HTTPException(status_code=404, detail="Service not found")
 
+        location_key = service.location_key
         await db.delete(service)
         await db.commit()
+        await publish_service_change(service_id, "delete")
+        await schedule_location_recompute(background_tasks, location_key)
         return {"message": "Service deleted successfully"}
     
 
@@ -0,0 +1,71 @@
+import base64
+import json
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.models.service.service_provider import Service
+
+SEARCH_CONFIG = "english"
+
+
+def encode_cursor(rank: float, service_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([rank, service_id]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        rank, service_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(rank), int(service_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def search_services(
+    db: AsyncSession,
+    q: str,
+    service_type: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> Tuple[List[Tuple[Service, float]], Optional[str]]:
+    """
+    Available services matching `q` (web search syntax: words, "phrases",
+    -exclusions, OR), best match first. Pages continue from the (rank, id)
+    of the previous page's last row, so deep pages cost no more than the
+    first. The GIN index finds the matches but every match is ranked, so
+    cost grows with how many rows match q; see tests/benchmark_text_search.py.
+    Returns (rows with their rank, next cursor).
+    """
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    rank = func.ts_rank_cd(Service.search_vector, query)
+
+    filters = [Service.search_vector.op("@@")(query), Service.is_available == True]
+    if service_type:
+        filters.append(Service.type.ilike(f"%{service_type}%"))
+    if min_price is not None:
+        filters.append(Service.price >= min_price)
+    if max_price is not None:
+        filters.append(Service.price <= max_price)
+    if cursor:
+        filters.append(tuple_(rank, Service.id) < tuple_(*decode_cursor(cursor)))
+
+    result = await db.execute(
+        select(Service, rank.label("rank"))
+        .options(joinedload(Service.provider))
+        .where(*filters)
+        .order_by(rank.desc(), Service.id.desc())
+        .limit(limit + 1)
+    )
+    rows = [(service, float(service_rank)) for service, service_rank in result.all()]
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_service, last_rank = rows[-1]
+        next_cursor = encode_cursor(last_rank, last_service.id)
+    return rows, next_cursor
@@ -1,15 +1,25 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
-from sqlalchemy.orm import joinedload
-from fastapi import HTTPException, status
+from sqlalchemy import select, func, and_, or_, tuple_, update, delete, insert, literal, cast, DateTime, String
+from sqlalchemy.dialects.postgresql import array, insert as pg_insert
+from sqlalchemy.orm import selectinload, load_only
+from sqlalchemy.orm.attributes import set_committed_value
+from fastapi import BackgroundTasks, HTTPException, status
 from typing import List, Optional
 from datetime import datetime
 
-from app.models.trips.checklist_models import TripChecklist, ChecklistAssignment, ChecklistCompletion
+from app.models.trips.checklist_models import (
+    TripChecklist, ChecklistAssignment, ChecklistCompletion,
+    ChecklistTemplate, ChecklistTemplateItem
+)
+from app.models.trips.trip_model import Trip
+from app.services.ordering_service import append_positions, position_after, rebalance_positions_task
+from app.utils.ordering import needs_rebalance
 from app.models.user.user import User
 from app.schemas.trip.checklist import (
     ChecklistCreate, ChecklistUpdate, AssignmentCreate, CompletionCreate,
-    ChecklistResponse, ChecklistSummary, ChecklistProgress
+    ChecklistResponse, ChecklistSummary, ChecklistProgress,
+    BulkChecklistCreate, BulkAssignmentCreate, BulkCompletionCreate,
+    ChecklistTemplateCreate
 )
 
 # CRUD Operations
@@ -17,19 +27,66 @@ async def create_checklist_item(
     session: AsyncSession,
     trip_id: int,
     checklist_data: ChecklistCreate,
-    created_by: int
+    created_by: int,
+    background_tasks: Optional[BackgroundTasks] = None
 ) -> TripChecklist:
-    """Create a new checklist item for a trip."""
+    """Create a new checklist item for a trip, appended to the end of the list."""
+    position, = await append_positions(session, TripChecklist, TripChecklist.trip_id, trip_id, 1)
     new_item = TripChecklist(
         trip_id=trip_id,
         created_by=created_by,
+        position=position,
         **checklist_data.dict()
     )
     session.add(new_item)
     await session.commit()
     await session.refresh(new_item)
+    _schedule_rebalance(background_tasks, trip_id, position)
     return new_item
 
+async def _attach_checklist_users(
+    session: AsyncSession,
+    items: List[TripChecklist]
+) -> None:
+    """Per-request user loader.
+
+    Collects every user referenced by the tasks (creators, assignees,
+    assigners, completers), fetches them with a single IN query and wires
+    them onto the relationships, so each user row is loaded once however
+    many tasks point at it.
+    """
+    user_ids = set()
+    for item in items:
+        user_ids.add(item.created_by)
+        for assignment in item.assignments:
+            user_ids.update((assignment.assigned_to, assignment.assigned_by))
+        for completion in item.completions:
+            user_ids.add(completion.completed_by)
+    user_ids.discard(None)
+
+    users = {}
+    if user_ids:
+        result = await session.execute(
+            select(User)
+            .options(load_only(User.id, User.username))
+            .where(User.id.in_(user_ids))
+        )
+        users = {user.id: user for user in result.scalars().all()}
+
+    for item in items:
+        set_committed_value(item, "creator", users.get(item.created_by))
+        for assignment in item.assignments:
+            set_committed_value(assignment, "assigned_user", users.get(assignment.assigned_to))
+            set_committed_value(assignment, "assigner", users.get(assignment.assigned_by))
+        for completion in item.completions:
+            set_committed_value(completion, "user", users.get(completion.completed_by))
+
+def _checklist_load_options():
+    return (
+        selectinload(TripChecklist.assignments),
+        selectinload(TripChecklist.completions),
+    )
+
 async def get_checklist_item(
     session: AsyncSession,
     task_id: int
@@ -37,29 +94,48 @@ async def get_checklist_item(
     """Get a single checklist item by ID."""
     result = await session.execute(
         select(TripChecklist)
-        .options(
-            joinedload(TripChecklist.assignments).joinedload(ChecklistAssignment.assigned_user),
-            joinedload(TripChecklist.assignments).joinedload(ChecklistAssignment.assigner),
-            joinedload(TripChecklist.completions).joinedload(ChecklistCompletion.user),
-            joinedload(TripChecklist.creator)
-        )
+        .options(*_checklist_load_options())
         .where(TripChecklist.id == task_id)
     )
-    return result.unique().scalar_one_or_none()
+    item = result.scalar_one_or_none()
+    if item:
+        await _attach_checklist_users(session, [item])
+    return item
+
+async def get_checklist_item_ref(
+    session: AsyncSession,
+    task_id: int
+):
+    """Lightweight lookup returning only (id, trip_id, created_by) for a task.
+
+    Used for existence / ownership checks where the full task graph is not needed.
+    """
+    result = await session.execute(
+        select(TripChecklist.id, TripChecklist.trip_id, TripChecklist.created_by)
+        .where(TripChecklist.id == task_id)
+    )
+    return result.one_or_none()
+
+async def _task_exists(session: AsyncSession, task_id: int) -> bool:
+    result = await session.execute(
+        select(TripChecklist.id).where(TripChecklist.id == task_id)
+    )
+    return result.scalar_one_or_none() is not None
 
 async def get_trip_checklist(
     session: AsyncSession,
     trip_id: int,
     category: Optional[str] = None,
     priority: Optional[str] = None,
-    completed: Optional[bool] = None
+    completed: Optional[bool] = None,
+    sort: Optional[str] = None
 ) -> List[TripChecklist]:
-    """Get all checklist items for a trip with optional filters."""
+    """Get all checklist items for a trip with optional filters.
+
+    `sort="position"` returns the user-defined (drag-and-drop) order.
+    """
     query = select(TripChecklist).options(
-        joinedload(TripChecklist.assignments).joinedload(ChecklistAssignment.assigned_user),
-        joinedload(TripChecklist.assignments).joinedload(ChecklistAssignment.assigner),
-        joinedload(TripChecklist.completions).joinedload(ChecklistCompletion.user),
-        joinedload(TripChecklist.creator)
+        *_checklist_load_options()
     ).where(TripChecklist.trip_id == trip_id)
     
     if category:
@@ -69,10 +145,15 @@ async def get_trip_checklist(
     if completed is not None:
         query = query.where(TripChecklist.is_completed == completed)
     
-    query = query.order_by(TripChecklist.priority.desc(), TripChecklist.due_date.asc().nulls_last())
+    if sort == "position":
+        query = query.order_by(TripChecklist.position.asc().nulls_last(), TripChecklist.id)
+    else:
+        query = query.order_by(TripChecklist.priority.desc(), TripChecklist.due_date.asc().nulls_last())
     
     result = await session.execute(query)
-    return result.unique().scalars().all()
+    items = result.scalars().all()
+    await _attach_checklist_users(session, items)
+    return items
 
 async def update_checklist_item(
     session: AsyncSession,
@@ -80,7 +161,7 @@ async def update_checklist_item(
     update_data: ChecklistUpdate
 ) -> Optional[TripChecklist]:
     """Update a checklist item."""
-    item = await get_checklist_item(session, task_id)
+    item = await session.get(TripChecklist, task_id)
     if not item:
         return None
     
@@ -96,14 +177,51 @@ async def delete_checklist_item(
     session: AsyncSession,
     task_id: int
 ) -> bool:
-    """Delete a checklist item."""
-    item = await get_checklist_item(session, task_id)
-    if not item:
-        return False
-    
-    await session.delete(item)
+    """Delete a checklist item.
+
+    Assignments and completions are removed by the ON DELETE CASCADE foreign keys.
+    """
+    result = await session.execute(
+        delete(TripChecklist).where(TripChecklist.id == task_id)
+    )
     await session.commit()
-    return True
+    return result.rowcount > 0
+
+# Ordering
+CHECKLIST_FALLBACK_ORDER = (TripChecklist.priority.desc(), TripChecklist.due_date.asc().nulls_last())
+
+def _schedule_rebalance(background_tasks: Optional[BackgroundTasks], trip_id: int, position: str) -> None:
+    """Rewrite the trip's keys in the background once a new key grows too long."""
+    if background_tasks is not None and needs_rebalance(position):
+        background_tasks.add_task(
+            rebalance_positions_task, TripChecklist, TripChecklist.trip_id,
+            trip_id, CHECKLIST_FALLBACK_ORDER
+        )
+
+async def move_checklist_item(
+    session: AsyncSession,
+    trip_id: int,
+    task_id: int,
+    after_id: Optional[int],
+    background_tasks: Optional[BackgroundTasks] = None
+) -> str:
+    """Move a task directly after another one (or to the top).
+
+    Only the moved row is updated; returns its new position key. When keys
+    in the list grow too long a rebalance is scheduled in the background.
+    """
+    position = await position_after(
+        session, TripChecklist, TripChecklist.trip_id, trip_id,
+        task_id, after_id, CHECKLIST_FALLBACK_ORDER
+    )
+    await session.execute(
+        update(TripChecklist)
+        .where(TripChecklist.id == task_id)
+        .values(position=position)
+    )
+    await session.commit()
+    _schedule_rebalance(background_tasks, trip_id, position)
+    return position
 
 # Assignment Operations
 async def assign_task_to_member(
@@ -114,13 +232,12 @@ async def assign_task_to_member(
 ) -> ChecklistAssignment:
     """Assign a task to a member."""
     # Check if task exists
-    task = await get_checklist_item(session, task_id)
-    if not task:
+    if not await _task_exists(session, task_id):
         raise HTTPException(status_code=404, detail="Task not found")
     
     # Check if already assigned to this user
     existing = await session.execute(
-        select(ChecklistAssignment).where(
+        select(ChecklistAssignment.id).where(
             and_(
                 ChecklistAssignment.task_id == task_id,
                 ChecklistAssignment.assigned_to == assignment_data.assigned_to
@@ -149,20 +266,15 @@ async def remove_task_assignment(
 ) -> bool:
     """Remove a task assignment."""
     result = await session.execute(
-        select(ChecklistAssignment).where(
+        delete(ChecklistAssignment).where(
             and_(
                 ChecklistAssignment.task_id == task_id,
                 ChecklistAssignment.assigned_to == assigned_to
             )
         )
     )
-    assignment = result.scalar_one_or_none()
-    if not assignment:
-        return False
-    
-    await session.delete(assignment)
     await session.commit()
-    return True
+    return result.rowcount > 0
 
 # Completion Operations
 async def mark_task_complete(
@@ -173,13 +285,12 @@ async def mark_task_complete(
 ) -> ChecklistCompletion:
     """Mark a task as complete."""
     # Check if task exists
-    task = await get_checklist_item(session, task_id)
-    if not task:
+    if not await _task_exists(session, task_id):
         raise HTTPException(status_code=404, detail="Task not found")
     
     # Check if already completed by this user
     existing = await session.execute(
-        select(ChecklistCompletion).where(
+        select(ChecklistCompletion.id).where(
             and_(
                 ChecklistCompletion.task_id == task_id,
                 ChecklistCompletion.completed_by == completed_by
@@ -196,27 +307,28 @@ async def mark_task_complete(
         notes=completion_data.notes
     )
     session.add(completion)
+    await session.flush()
     
-    # Update task completion status if all assigned members have completed
-    assignments = await session.execute(
-        select(ChecklistAssignment).where(ChecklistAssignment.task_id == task_id)
+    # Task is complete once every assigned member has completed it
+    # (or immediately if nobody is assigned)
+    counts = await session.execute(
+        select(
+            select(func.count(ChecklistAssignment.id))
+            .where(ChecklistAssignment.task_id == task_id)
+            .scalar_subquery(),
+            select(func.count(ChecklistCompletion.id))
+            .where(ChecklistCompletion.task_id == task_id)
+            .scalar_subquery()
+        )
     )
-    assignments = assignments.scalars().all()
+    assigned_count, completed_count = counts.one()
     
-    if assignments:
-        # Check if all assigned members have completed
-        completed_count = await session.execute(
-            select(func.count(ChecklistCompletion.id)).where(
-                ChecklistCompletion.task_id == task_id
-            )
+    if completed_count >= assigned_count:
+        await session.execute(
+            update(TripChecklist)
+            .where(TripChecklist.id == task_id)
+            .values(is_completed=True)
         )
-        completed_count = completed_count.scalar()
-        
-        if completed_count + 1 >= len(assignments):
-            task.is_completed = True
-    else:
-        task.is_completed = True
-
     
     await session.commit()
     await session.refresh(completion)
@@ -229,93 +341,356 @@ async def mark_task_incomplete(
 ) -> bool:
     """Mark a task as incomplete (remove completion record)."""
     result = await session.execute(
-        select(ChecklistCompletion).where(
+        delete(ChecklistCompletion).where(
             and_(
                 ChecklistCompletion.task_id == task_id,
                 ChecklistCompletion.completed_by == completed_by
             )
         )
     )
-    completion = result.scalar_one_or_none()
-    if not completion:
+    if result.rowcount == 0:
         return False
     
-    await session.delete(completion)
-    
     # Update task completion status
-    task = await get_checklist_item(session, task_id)
-    if task:
-        task.is_completed = False
+    await session.execute(
+        update(TripChecklist)
+        .where(TripChecklist.id == task_id)
+        .values(is_completed=False)
+    )
     
     await session.commit()
     return True
 
-# Progress Tracking
-async def get_checklist_progress(
+# Bulk Operations
+async def bulk_create_checklist_items(
     session: AsyncSession,
-    trip_id: int
-) -> ChecklistProgress:
-    """Get overall progress statistics for a trip's checklist."""
-    # Total tasks
-    total_result = await session.execute(
-        select(func.count(TripChecklist.id)).where(TripChecklist.trip_id == trip_id)
+    trip_id: int,
+    bulk_data: BulkChecklistCreate,
+    created_by: int,
+    background_tasks: Optional[BackgroundTasks] = None
+) -> List[int]:
+    """Create many checklist items with one multi-row INSERT."""
+    now = datetime.utcnow()
+    positions = await append_positions(session, TripChecklist, TripChecklist.trip_id, trip_id, len(bulk_data.items))
+    rows = [
+        {
+            "trip_id": trip_id,
+            "created_by": created_by,
+            "is_completed": False,
+            "position": position,
+            "created_at": now,
+            "updated_at": now,
+            **item.dict()
+        }
+        for item, position in zip(bulk_data.items, positions)
+    ]
+    result = await session.execute(
+        insert(TripChecklist).values(rows).returning(TripChecklist.id)
     )
-    total_tasks = total_result.scalar()
-    
-    # Completed tasks
-    completed_result = await session.execute(
-        select(func.count(TripChecklist.id)).where(
-            and_(
+    task_ids = list(result.scalars().all())
+    await session.commit()
+    if positions:
+        _schedule_rebalance(background_tasks, trip_id, positions[-1])
+    return task_ids
+
+async def bulk_assign_tasks(
+    session: AsyncSession,
+    trip_id: int,
+    bulk_data: BulkAssignmentCreate,
+    assigned_by: int
+) -> List[int]:
+    """Assign many tasks of a trip to one member in a single INSERT ... SELECT.
+
+    Task ids that do not belong to the trip are ignored and existing
+    assignments are left untouched. Returns the ids of newly assigned tasks.
+    """
+    stmt = (
+        pg_insert(ChecklistAssignment)
+        .from_select(
+            ["task_id", "assigned_to", "assigned_by", "assigned_at", "notes"],
+            select(
+                TripChecklist.id,
+                literal(bulk_data.assigned_to),
+                literal(assigned_by),
+                literal(datetime.utcnow(), DateTime),
+                literal(bulk_data.notes)
+            ).where(
                 TripChecklist.trip_id == trip_id,
-                TripChecklist.is_completed == True
+                TripChecklist.id.in_(bulk_data.task_ids)
             )
         )
+        .on_conflict_do_nothing(constraint="uq_task_assigned_user")
+        .returning(ChecklistAssignment.task_id)
     )
-    completed_tasks = completed_result.scalar()
-    
-    pending_tasks = total_tasks - completed_tasks
-    completion_percentage = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-    
-    # Tasks by category
-    category_result = await session.execute(
-        select(
-            TripChecklist.category,
-            TripChecklist.is_completed,
-            func.count(TripChecklist.id)
-        ).where(TripChecklist.trip_id == trip_id)
-        .group_by(TripChecklist.category, TripChecklist.is_completed)
+    result = await session.execute(stmt)
+    task_ids = list(result.scalars().all())
+    await session.commit()
+    return task_ids
+
+async def bulk_complete_tasks(
+    session: AsyncSession,
+    trip_id: int,
+    bulk_data: BulkCompletionCreate,
+    completed_by: int
+) -> List[int]:
+    """Mark many tasks complete for a user in one transaction.
+
+    Completion rows are inserted with a single INSERT ... SELECT, then the
+    is_completed flag is refreshed for the touched tasks with one UPDATE.
+    Returns the ids of tasks that gained a completion.
+    """
+    stmt = (
+        pg_insert(ChecklistCompletion)
+        .from_select(
+            ["task_id", "completed_by", "completed_at", "notes"],
+            select(
+                TripChecklist.id,
+                literal(completed_by),
+                literal(datetime.utcnow(), DateTime),
+                literal(bulk_data.notes)
+            ).where(
+                TripChecklist.trip_id == trip_id,
+                TripChecklist.id.in_(bulk_data.task_ids)
+            )
+        )
+        .on_conflict_do_nothing(constraint="uq_task_completion_user")
+        .returning(ChecklistCompletion.task_id)
     )
-    
-    tasks_by_category = {}
-    for row in category_result:
-        cat, completed, count = row
-        if cat not in tasks_by_category:
-            tasks_by_category[cat] = {"completed": 0, "pending": 0}
-        if completed:
-            tasks_by_category[cat]["completed"] = count
-        else:
-            tasks_by_category[cat]["pending"] = count
-    
-    # Tasks by priority
-    priority_result = await session.execute(
+    result = await session.execute(stmt)
+    task_ids = list(result.scalars().all())
+
+    if task_ids:
+        assigned_count = (
+            select(func.count(ChecklistAssignment.id))
+            .where(ChecklistAssignment.task_id == TripChecklist.id)
+            .scalar_subquery()
+        )
+        completed_count = (
+            select(func.count(ChecklistCompletion.id))
+            .where(ChecklistCompletion.task_id == TripChecklist.id)
+            .scalar_subquery()
+        )
+        await session.execute(
+            update(TripChecklist)
+            .where(
+                TripChecklist.id.in_(task_ids),
+                completed_count >= assigned_count
+            )
+            .values(is_completed=True)
+            .execution_options(synchronize_session=False)
+        )
+
+    await session.commit()
+    return task_ids
+
+async def bulk_uncomplete_tasks(
+    session: AsyncSession,
+    trip_id: int,
+    task_ids: List[int],
+    completed_by: int
+) -> List[int]:
+    """Remove a user's completion from many tasks in one transaction."""
+    result = await session.execute(
+        delete(ChecklistCompletion)
+        .where(
+            ChecklistCompletion.completed_by == completed_by,
+            ChecklistCompletion.task_id.in_(
+                select(TripChecklist.id).where(
+                    TripChecklist.trip_id == trip_id,
+                    TripChecklist.id.in_(task_ids)
+                )
+            )
+        )
+        .returning(ChecklistCompletion.task_id)
+        .execution_options(synchronize_session=False)
+    )
+    removed = list(result.scalars().all())
+
+    if removed:
+        await session.execute(
+            update(TripChecklist)
+            .where(TripChecklist.id.in_(removed))
+            .values(is_completed=False)
+            .execution_options(synchronize_session=False)
+        )
+
+    await session.commit()
+    return removed
+
+# Templates
+async def create_checklist_template(
+    session: AsyncSession,
+    template_data: ChecklistTemplateCreate,
+    created_by: int
+) -> ChecklistTemplate:
+    """Create a reusable checklist template with its items."""
+    template = ChecklistTemplate(
+        name=template_data.name,
+        description=template_data.description,
+        is_public=template_data.is_public,
+        created_by=created_by,
+        items=[ChecklistTemplateItem(**item.dict()) for item in template_data.items]
+    )
+    session.add(template)
+    await session.commit()
+    return await get_checklist_template(session, template.id)
+
+async def get_checklist_template(
+    session: AsyncSession,
+    template_id: int
+) -> Optional[ChecklistTemplate]:
+    """Get a checklist template with its items."""
+    result = await session.execute(
+        select(ChecklistTemplate)
+        .options(selectinload(ChecklistTemplate.items))
+        .where(ChecklistTemplate.id == template_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+async def list_checklist_templates(
+    session: AsyncSession,
+    user_id: int
+) -> List[ChecklistTemplate]:
+    """List the user's own templates plus all public templates."""
+    result = await session.execute(
+        select(ChecklistTemplate)
+        .options(selectinload(ChecklistTemplate.items))
+        .where(or_(ChecklistTemplate.created_by == user_id, ChecklistTemplate.is_public == True))
+        .order_by(ChecklistTemplate.name)
+    )
+    return result.scalars().all()
+
+async def delete_checklist_template(
+    session: AsyncSession,
+    template_id: int,
+    user_id: int
+) -> bool:
+    """Delete a template owned by the user."""
+    result = await session.execute(
+        delete(ChecklistTemplate).where(
+            ChecklistTemplate.id == template_id,
+            ChecklistTemplate.created_by == user_id
+        )
+    )
+    await session.commit()
+    return result.rowcount > 0
+
+async def clone_template_into_trip(
+    session: AsyncSession,
+    trip_id: int,
+    template_id: int,
+    created_by: int,
+    background_tasks: Optional[BackgroundTasks] = None
+) -> List[int]:
+    """Copy every item of a template into a trip's checklist.
+
+    Runs as one server-side INSERT ... SELECT; due dates are resolved from
+    the trip's start date in the same statement, and the cloned tasks are
+    appended to the end of the list in template order.
+    """
+    template = await session.execute(
+        select(ChecklistTemplate.id).where(
+            ChecklistTemplate.id == template_id,
+            or_(ChecklistTemplate.created_by == created_by, ChecklistTemplate.is_public == True)
+        )
+    )
+    if template.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Checklist template not found")
+
+    item_count = await session.scalar(
+        select(func.count()).select_from(ChecklistTemplateItem).where(ChecklistTemplateItem.template_id == template_id)
+    )
+    positions = await append_positions(session, TripChecklist, TripChecklist.trip_id, trip_id, item_count)
+
+    now = datetime.utcnow()
+    due_date = cast(Trip.start_date - ChecklistTemplateItem.due_days_before_start, DateTime)
+    # n-th template item (by id) gets the n-th key; Postgres arrays are 1-based
+    position = array(positions, type_=String)[func.row_number().over(order_by=ChecklistTemplateItem.id)]
+    stmt = (
+        insert(TripChecklist)
+        .from_select(
+            [
+                "trip_id", "title", "description", "category", "priority", "due_date",
+                "is_completed", "position", "created_by", "created_at", "updated_at"
+            ],
+            select(
+                Trip.id,
+                ChecklistTemplateItem.title,
+                ChecklistTemplateItem.description,
+                ChecklistTemplateItem.category,
+                ChecklistTemplateItem.priority,
+                due_date,
+                literal(False),
+                position,
+                literal(created_by),
+                literal(now, DateTime),
+                literal(now, DateTime)
+            )
+            .select_from(ChecklistTemplateItem)
+            .join(Trip, Trip.id == trip_id)
+            .where(ChecklistTemplateItem.template_id == template_id)
+            .order_by(ChecklistTemplateItem.id)
+        )
+        .returning(TripChecklist.id)
+    )
+    task_ids = list((await session.execute(stmt)).scalars().all()) if positions else []
+    if not task_ids:
+        # templates always have items, so no rows means the trip does not exist
+        await session.rollback()
+        raise HTTPException(status_code=404, detail="Trip not found")
+    await session.commit()
+    _schedule_rebalance(background_tasks, trip_id, positions[-1])
+    return task_ids
+
+# Progress Tracking
+async def get_checklist_progress(
+    session: AsyncSession,
+    trip_id: int
+) -> ChecklistProgress:
+    """Get overall progress statistics for a trip's checklist.
+
+    Totals, per-category and per-priority counts all come from a single
+    GROUPING SETS query; no checklist rows are loaded.
+    """
+    result = await session.execute(
         select(
+            TripChecklist.category,
             TripChecklist.priority,
             TripChecklist.is_completed,
-            func.count(TripChecklist.id)
-        ).where(TripChecklist.trip_id == trip_id)
-        .group_by(TripChecklist.priority, TripChecklist.is_completed)
+            func.grouping(TripChecklist.category).label("by_category"),
+            func.grouping(TripChecklist.priority).label("by_priority"),
+            func.count(TripChecklist.id).label("count")
+        )
+        .where(TripChecklist.trip_id == trip_id)
+        .group_by(
+            func.grouping_sets(
+                tuple_(TripChecklist.category, TripChecklist.is_completed),
+                tuple_(TripChecklist.priority, TripChecklist.is_completed),
+                tuple_(TripChecklist.is_completed)
+            )
+        )
     )
-    
+
+    total_tasks = 0
+    completed_tasks = 0
+    tasks_by_category = {}
     tasks_by_priority = {}
-    for row in priority_result:
-        prio, completed, count = row
-        if prio not in tasks_by_priority:
-            tasks_by_priority[prio] = {"completed": 0, "pending": 0}
-        if completed:
-            tasks_by_priority[prio]["completed"] = count
+    for row in result:
+        # a NULL is_completed counts as pending
+        state = "completed" if row.is_completed else "pending"
+        if row.by_category == 0:
+            tasks_by_category.setdefault(row.category, {"completed": 0, "pending": 0})[state] += row.count
+        elif row.by_priority == 0:
+            tasks_by_priority.setdefault(row.priority, {"completed": 0, "pending": 0})[state] += row.count
         else:
-            tasks_by_priority[prio]["pending"] = count
-    
+            total_tasks += row.count
+            if row.is_completed:
+                completed_tasks += row.count
+
+    pending_tasks = total_tasks - completed_tasks
+    completion_percentage = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+
     return ChecklistProgress(
         total_tasks=total_tasks,
         completed_tasks=completed_tasks,
@@ -324,3 +699,41 @@ async def get_checklist_progress(
         tasks_by_category=tasks_by_category,
         tasks_by_priority=tasks_by_priority
     )
+
+async def get_checklist_summary(
+    session: AsyncSession,
+    trip_id: int
+) -> List[ChecklistSummary]:
+    """Get a summary of all checklist items for a trip.
+
+    Assignment and completion counts are computed in SQL with correlated
+    subqueries (served by the task_id indexes) instead of loading the
+    collections.
+    """
+    assigned_count = (
+        select(func.count(ChecklistAssignment.id))
+        .where(ChecklistAssignment.task_id == TripChecklist.id)
+        .correlate(TripChecklist)
+        .scalar_subquery()
+    )
+    completed_count = (
+        select(func.count(ChecklistCompletion.id))
+        .where(ChecklistCompletion.task_id == TripChecklist.id)
+        .correlate(TripChecklist)
+        .scalar_subquery()
+    )
+    result = await session.execute(
+        select(
+            TripChecklist.id,
+            TripChecklist.title,
+            TripChecklist.category,
+            TripChecklist.priority,
+            TripChecklist.due_date,
+            func.coalesce(TripChecklist.is_completed, False).label("is_completed"),
+            assigned_count.label("assigned_count"),
+            completed_count.label("completed_count")
+        )
+        .where(TripChecklist.trip_id == trip_id)
+        .order_by(TripChecklist.priority.desc(), TripChecklist.due_date.asc().nulls_last())
+    )
+    return [ChecklistSummary(**row._mapping) for row in result]
@@ -2,7 +2,7 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from urllib.parse import urlencode
-from typing import Optional
+from typing import Optional, List, Tuple
 from app.core.config import settings
 
 def generate_invite_link(invite_code: str) -> str:
@@ -12,11 +12,10 @@ def generate_invite_link(invite_code: str) -> str:
     query = urlencode({"code": invite_code})
     return f"{settings.FRONTEND_BASE_URL}/accept-invite?{query}"
 
-def send_invite_email(invitee_email: str, invite_link: str, trip_name: Optional[str] = None):
+def build_invite_message(sender_email: str, invitee_email: str, invite_link: str, trip_name: Optional[str] = None) -> MIMEMultipart:
     """
-    Sends invitation email to the provided user.
+    Builds the invitation email body for a single invitee.
     """
-    sender_email = settings.SMTP_USER
     subject = f"You're Invited to a Trip on TripMate 🎒"
 
     message = MIMEMultipart("alternative")
@@ -43,6 +42,15 @@ def send_invite_email(invitee_email: str, invite_link: str, trip_name: Optional[
 
     part = MIMEText(html, "html")
     message.attach(part)
+    return message
+
+
+def send_invite_email(invitee_email: str, invite_link: str, trip_name: Optional[str] = None):
+    """
+    Sends invitation email to the provided user.
+    """
+    sender_email = settings.SMTP_USER
+    message = build_invite_message(sender_email, invitee_email, invite_link, trip_name)
     print(settings.SMTP_USER)
 
     try:
@@ -56,3 +64,27 @@ def send_invite_email(invitee_email: str, invite_link: str, trip_name: Optional[
             print(f"[Email Invite] Sent to {invitee_email}")
     except Exception as e:
         print(f"[Email Invite] Failed to send to {invitee_email}: {e}")
+
+
+def send_invite_emails_batch(invites: List[Tuple[str, str]], trip_name: Optional[str] = None):
+    """
+    Sends invitation emails for a batch of (invitee_email, invite_code) pairs
+    over a single SMTP connection.
+    """
+    if not invites:
+        return
+
+    sender_email = settings.SMTP_USER
+
+    try:
+        with smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT) as server:
+            server.login(sender_email, settings.SMTP_PASSWORD)
+            for invitee_email, invite_code in invites:
+                message = build_invite_message(sender_email, invitee_email, generate_invite_link(invite_code), trip_name)
+                try:
+                    server.sendmail(sender_email, invitee_email, message.as_string())
+                    print(f"[Email Invite] Sent to {invitee_email}")
+                except smtplib.SMTPException as e:
+                    print(f"[Email Invite] Failed to send to {invitee_email}: {e}")
+    except Exception as e:
+        print(f"[Email Invite] Batch of {len(invites)} invites failed: {e}")
@@ -2,14 +2,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import joinedload
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import and_
+from sqlalchemy import and_, insert
 from app.models.trips.trip_model import Trip
 from app.models.user.user import User
 from app.models.trips.trip_invite import TripInvite,InviteStatus
-from app.schemas.trip.invite import TripInviteAccept,TripInviteCreate,TripInviteResponse
+from app.schemas.trip.invite import TripInviteAccept,TripInviteCreate,TripInviteResponse,TripInviteBulkCreate,TripInviteBulkResponse
 from fastapi import HTTPException,status
 from app.models.trips.trip_member import TripMember
-from app.services.trips.email_invite import generate_invite_link,send_invite_email
+from app.services.trips.email_invite import send_invite_emails_batch
+from fastapi import BackgroundTasks
 from datetime import datetime
 import secrets
 import string
@@ -75,9 +76,6 @@ async def create_trip_invite(
         await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to create invite")
 
-    # invite_link = generate_invite_link(Invite_code)
-    # send_invite_email(invitee_email=invite_data.invitee_email, invite_link=invite_link, trip_name=trip.title)
-
     return TripInviteResponse(
         id=new_invite.id,
         trip_id=new_invite.trip_id,
@@ -91,6 +89,97 @@ async def create_trip_invite(
     
 
 
+async def create_trip_invites_bulk(
+        db: AsyncSession,
+        invite_data: TripInviteBulkCreate,
+        current_user: User,
+        background_tasks: BackgroundTasks
+) -> TripInviteBulkResponse:
+    """Invite a list of emails to a trip with one ownership check, one
+    duplicate lookup and one multi-row INSERT."""
+
+    result = await db.execute(
+        select(Trip).where(
+            and_(
+                Trip.id == invite_data.trip_id,
+                Trip.creator_id == current_user.id
+            )
+        )
+    )
+    trip = result.scalar_one_or_none()
+
+    if not trip:
+        raise HTTPException(status_code=404, detail="Trip not found or not authorized")
+
+    # dedupe while keeping the order the organiser sent them in
+    emails = list(dict.fromkeys(invite_data.invitee_emails))
+
+    existing = await db.execute(
+        select(TripInvite.invitee_email).where(
+            and_(
+                TripInvite.trip_id == invite_data.trip_id,
+                TripInvite.invitee_email.in_(emails),
+                TripInvite.status == InviteStatus.pending
+            )
+        )
+    )
+    already_pending = set(existing.scalars().all())
+
+    new_emails = [email for email in emails if email not in already_pending]
+    skipped = [email for email in emails if email in already_pending]
+
+    if not new_emails:
+        return TripInviteBulkResponse(invites=[], skipped_emails=skipped)
+
+    now = datetime.utcnow()
+    rows = [
+        {
+            "trip_id": invite_data.trip_id,
+            "inviter_id": current_user.id,
+            "invitee_email": email,
+            "invite_code": generate_invite_code(),
+            "status": InviteStatus.pending,
+            "created_at": now,
+        }
+        for email in new_emails
+    ]
+
+    try:
+        inserted = await db.execute(
+            insert(TripInvite)
+            .values(rows)
+            .returning(TripInvite.id, TripInvite.invitee_email, TripInvite.invite_code)
+        )
+        created = inserted.all()
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Failed to create invites")
+
+    background_tasks.add_task(
+        send_invite_emails_batch,
+        [(row.invitee_email, row.invite_code) for row in created],
+        trip.title
+    )
+
+    return TripInviteBulkResponse(
+        invites=[
+            TripInviteResponse(
+                id=row.id,
+                trip_id=invite_data.trip_id,
+                inviter_id=current_user.id,
+                invitee_email=row.invitee_email,
+                status=InviteStatus.pending.value,
+                invite_code=row.invite_code,
+                trip_code=trip.trip_code or "",
+                trip_title=trip.title
+            )
+            for row in created
+        ],
+        skipped_emails=skipped
+    )
+
+
 async def accept_trip_invite(
         db: AsyncSession,
         invite_code: str,
@@ -0,0 +1,160 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logger import logger
+from app.models.trips.trip_member_preference import TripMemberPreference, TripPreferenceProfile
+from app.utils.normalize import text_terms
+
+# member preference field -> frequency map column on TripPreferenceProfile
+COUNTED_FIELDS = {
+    "accommodation_type": "accommodation_type_counts",
+    "food_preferences": "food_preferences_counts",
+    "activity_interests": "activity_interests_counts",
+    "pace": "pace_counts",
+}
+
+
+@dataclass
+class AggregatedPreferences:
+    """What the recommendation pipeline needs from a trip's members."""
+    member_count: int = 0
+    budget: Optional[float] = None
+    accommodation_type: Optional[str] = None
+    food_preferences: Optional[str] = None
+    activity_interests: Optional[str] = None
+    pace: Optional[str] = None
+    term_counts: Dict[str, int] = field(default_factory=dict)
+    # feature requirements backed by at least half of the members
+    feature_filters: List[str] = field(default_factory=list)
+
+
+def preference_values(pref: Optional[TripMemberPreference]) -> Optional[dict]:
+    """Snapshot of the fields a member contributes to the aggregate."""
+    if pref is None:
+        return None
+    return {
+        "budget": pref.budget,
+        **{name: getattr(pref, name) for name in COUNTED_FIELDS},
+        "feature_requirements": list(pref.feature_requirements or []),
+    }
+
+
+def _member_terms(values: dict) -> set:
+    return text_terms(values["food_preferences"]) | text_terms(values["activity_interests"]) | text_terms(values["pace"])
+
+
+def _shift(counts: dict, keys: Iterable[str], delta: int) -> dict:
+    counts = dict(counts or {})
+    for key in keys:
+        n = counts.get(key, 0) + delta
+        if n > 0:
+            counts[key] = n
+        else:
+            counts.pop(key, None)
+    return counts
+
+
+def _apply(profile: TripPreferenceProfile, values: dict, delta: int) -> None:
+    """Add (delta=1) or remove (delta=-1) one member's preferences."""
+    profile.member_count = (profile.member_count or 0) + delta
+    if values["budget"] is not None:
+        profile.budget_sum = (profile.budget_sum or 0.0) + delta * values["budget"]
+        profile.budget_count = (profile.budget_count or 0) + delta
+    # new dict objects so the JSONB columns are flagged as changed
+    for name, column in COUNTED_FIELDS.items():
+        if values[name]:
+            setattr(profile, column, _shift(getattr(profile, column), [values[name]], delta))
+    profile.term_counts = _shift(profile.term_counts, _member_terms(values), delta)
+    profile.requirement_counts = _shift(profile.requirement_counts, set(values["feature_requirements"]), delta)
+
+
+def apply_preference_change(profile: TripPreferenceProfile, old: Optional[dict], new: Optional[dict]) -> None:
+    """Move the aggregate from a member's old preferences to their new ones."""
+    if old is not None:
+        _apply(profile, old, -1)
+    if new is not None:
+        _apply(profile, new, 1)
+
+
+async def lock_preference_profile(db: AsyncSession, trip_id: int) -> TripPreferenceProfile:
+    """
+    Return the trip's profile row locked for update, creating it (and
+    backfilling it from existing member rows) on first use. Does not commit.
+    """
+    inserted = await db.execute(
+        pg_insert(TripPreferenceProfile)
+        .values(
+            trip_id=trip_id, member_count=0, budget_sum=0.0, budget_count=0,
+            **{column: {} for column in COUNTED_FIELDS.values()}, term_counts={}, requirement_counts={}
+        )
+        .on_conflict_do_nothing(index_elements=[TripPreferenceProfile.trip_id])
+        .returning(TripPreferenceProfile.trip_id)
+    )
+    created = inserted.scalar_one_or_none() is not None
+
+    result = await db.execute(
+        select(TripPreferenceProfile)
+        .where(TripPreferenceProfile.trip_id == trip_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    profile = result.scalar_one()
+
+    if created:
+        prefs = await db.execute(
+            select(TripMemberPreference).where(TripMemberPreference.trip_id == trip_id)
+        )
+        for pref in prefs.scalars():
+            _apply(profile, preference_values(pref), 1)
+        logger.info(f"Built preference profile for trip {trip_id} from {profile.member_count} member(s)")
+    return profile
+
+
+def _mode(counts: Optional[dict]) -> Optional[str]:
+    # most members first, ties broken alphabetically so the result is stable
+    if not counts:
+        return None
+    return min(counts.items(), key=lambda item: (-item[1], item[0]))[0]
+
+
+def summarize_profile(profile: Optional[TripPreferenceProfile]) -> AggregatedPreferences:
+    if profile is None or not profile.member_count:
+        return AggregatedPreferences()
+    return AggregatedPreferences(
+        member_count=profile.member_count,
+        budget=profile.budget_sum / profile.budget_count if profile.budget_count else None,
+        accommodation_type=_mode(profile.accommodation_type_counts),
+        food_preferences=_mode(profile.food_preferences_counts),
+        activity_interests=_mode(profile.activity_interests_counts),
+        pace=_mode(profile.pace_counts),
+        term_counts=dict(profile.term_counts or {}),
+        feature_filters=sorted(
+            requirement for requirement, n in (profile.requirement_counts or {}).items()
+            if 2 * n >= profile.member_count
+        ),
+    )
+
+
+async def get_aggregated_preferences(db: AsyncSession, trip_id: int) -> AggregatedPreferences:
+    """One-row read of the trip's aggregate (built on first use for older trips)."""
+    profile = await db.get(TripPreferenceProfile, trip_id)
+    if profile is None:
+        profile = await lock_preference_profile(db, trip_id)
+        await db.commit()
+    return summarize_profile(profile)
+
+
+async def get_aggregated_preferences_bulk(db: AsyncSession, trip_ids: List[int]) -> Dict[int, AggregatedPreferences]:
+    """Aggregates for many trips in one query; trips without a row are built individually."""
+    result = await db.execute(
+        select(TripPreferenceProfile).where(TripPreferenceProfile.trip_id.in_(trip_ids))
+    )
+    aggregates = {profile.trip_id: summarize_profile(profile) for profile in result.scalars()}
+    for trip_id in trip_ids:
+        if trip_id not in aggregates:
+            aggregates[trip_id] = await get_aggregated_preferences(db, trip_id)
+    return aggregates
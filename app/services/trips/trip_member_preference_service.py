@@ -2,9 +2,22 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.models.trips.trip_member_preference import TripMemberPreference
 from app.schemas.trip.trip_member_preference import TripMemberPreferenceCreate
-from typing import List
+from typing import List, Optional
+from fastapi import BackgroundTasks
+from app.services.recommendations.result_cache import bump_trip_version
+from app.services.recommendations.recompute import schedule_trip_recompute
+from app.services.trips.preference_profile_service import lock_preference_profile, preference_values, apply_preference_change
+
+async def set_member_preference(
+    trip_id: int,
+    user_id: int,
+    preference_data: TripMemberPreferenceCreate,
+    db: AsyncSession,
+    background_tasks: Optional[BackgroundTasks] = None
+) -> TripMemberPreference:
+    # Lock the trip's aggregate first so concurrent members update it in turn
+    profile = await lock_preference_profile(db, trip_id)
 
-async def set_member_preference(trip_id: int, user_id: int, preference_data: TripMemberPreferenceCreate, db: AsyncSession) -> TripMemberPreference:
     # Check if preference exists
     result = await db.execute(
         select(TripMemberPreference).where(
@@ -13,6 +26,7 @@ async def set_member_preference(trip_id: int, user_id: int, preference_data: Tri
         )
     )
     pref = result.scalar_one_or_none()
+    previous = preference_values(pref)
 
     if pref:
         # Update existing
@@ -23,8 +37,11 @@ async def set_member_preference(trip_id: int, user_id: int, preference_data: Tri
         pref = TripMemberPreference(trip_id=trip_id, user_id=user_id, **preference_data.dict())
         db.add(pref)
 
+    apply_preference_change(profile, previous, preference_values(pref))
     await db.commit()
     await db.refresh(pref)
+    await bump_trip_version(trip_id)
+    await schedule_trip_recompute(background_tasks, trip_id)
     return pref
 
 async def get_trip_preferences(trip_id: int, db: AsyncSession) -> List[TripMemberPreference]:
@@ -2,10 +2,12 @@ from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import NoResultFound
-from fastapi import HTTPException, status
+from fastapi import HTTPException, status, BackgroundTasks
 from uuid import uuid4
 from app.core.logger import logger
 from app.core.cache import RedisCache
+from app.services.recommendations.result_cache import bump_trip_version
+from app.services.recommendations.recompute import schedule_trip_recompute
 from app.models.trips.trip_model import Trip
 from app.models.trips.trip_member import TripMember
 from app.schemas.trip.trip_member import TripRole
@@ -28,7 +30,13 @@ class TripService:
         for pattern in patterns:
             await self.cache.delete_pattern(pattern)
         
-    async def create_trip(self, db: AsyncSession, trip_data: TripCreate, user_id: int) -> Trip:
+    async def create_trip(
+        self,
+        db: AsyncSession,
+        trip_data: TripCreate,
+        user_id: int,
+        background_tasks: Optional[BackgroundTasks] = None
+    ) -> Trip:
         trip_code = str(uuid4()).split("-")[0]
         new_trip = Trip(**trip_data.dict(), creator_id=user_id, trip_code=trip_code)
         db.add(new_trip)
@@ -46,6 +54,7 @@ class TripService:
         
         # Invalidate user's trips cache
         await self._invalidate_trip_caches(new_trip.id, user_id, trip_code)
+        await schedule_trip_recompute(background_tasks, new_trip.id)
         
         logger.info(f"Trip created by user {user_id} with trip_code {trip_code}")
         return new_trip
@@ -145,7 +154,14 @@ class TripService:
         logger.info(f"Trip retrieved by code {trip_code} from database")
         return trip
 
-    async def update_trip(self, db: AsyncSession, trip_id: int, trip_data: TripUpdate, user_id: int) -> Trip:
+    async def update_trip(
+        self,
+        db: AsyncSession,
+        trip_id: int,
+        trip_data: TripUpdate,
+        user_id: int,
+        background_tasks: Optional[BackgroundTasks] = None
+    ) -> Trip:
         result = await db.execute(
             select(Trip)
             .options(selectinload(Trip.members))
@@ -174,6 +190,8 @@ class TripService:
         
         # Invalidate all related caches
         await self._invalidate_trip_caches(trip_id, user_id, trip.trip_code)
+        await bump_trip_version(trip_id)
+        await schedule_trip_recompute(background_tasks, trip_id)
         
         logger.info(f"Trip ID {trip_id} updated by user {user_id}")
         return trip
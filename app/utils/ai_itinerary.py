@@ -1,14 +1,120 @@
 from app.core.llm_client import get_ai_completion
 from app.schemas.itineraries.itinerary import ItineraryDayPreview, ActivityPreview,ItineraryPreviewResponse
-from datetime import date, timedelta, datetime
-from typing import List
+from datetime import date, time, timedelta, datetime
+from typing import Any, Dict, List, Optional, Tuple, Type, Union, get_args, get_origin
 import json
+from pydantic import BaseModel
 from app.core.logger import logger
+from app.utils.json_repair import repair_json
 import re
 
-def build_prompt(location: str, days: int, start_date: date) -> str:
+# JSON Schema for scalar field types; times are the HH:MM the prompt asks for
+_SCALAR_SCHEMAS = {
+    str: {"type": "string"},
+    int: {"type": "integer"},
+    float: {"type": "number"},
+    bool: {"type": "boolean"},
+    date: {"type": "string", "format": "date"},
+    time: {"type": "string", "pattern": "^[0-2][0-9]:[0-5][0-9]$"},
+}
+
+
+def _field_schema(annotation: Any) -> Dict[str, Any]:
+    args = get_args(annotation)
+    if get_origin(annotation) is Union:
+        schema = _field_schema(next(arg for arg in args if arg is not type(None)))
+        if type(None) in args:
+            schema["type"] = [schema["type"], "null"]
+        return schema
+    if get_origin(annotation) in (list, List):
+        return {"type": "array", "items": _field_schema(args[0])}
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return strict_schema(annotation)
+    return dict(_SCALAR_SCHEMAS[annotation])
+
+
+def strict_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    JSON Schema for `model` in the strict form structured-output backends
+    require: every field listed as required (optional ones are nullable
+    instead) and no extra properties.
+    """
+    return {
+        "type": "object",
+        "properties": {name: _field_schema(field.annotation) for name, field in model.model_fields.items()},
+        "required": list(model.model_fields),
+        "additionalProperties": False,
+    }
+
+
+# Strict schemas need an object at the top level, so the days are wrapped
+ITINERARY_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "itinerary",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {"days": {"type": "array", "items": strict_schema(ItineraryDayPreview)}},
+            "required": ["days"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# Key spellings models use instead of ours, by lowercased name without "_", "-" or spaces
+DAY_KEY_ALIASES = {
+    "daynumber": "day_number", "day": "day_number", "daynum": "day_number",
+    "title": "title", "name": "title", "heading": "title", "theme": "title",
+    "description": "description", "summary": "description", "overview": "description",
+    "date": "date",
+    "activities": "activities", "activity": "activities", "events": "activities", "schedule": "activities",
+}
+ACTIVITY_KEY_ALIASES = {
+    "time": "time", "starttime": "time",
+    "title": "title", "name": "title", "activity": "title",
+    "description": "description", "details": "description", "desc": "description",
+}
+_TIME_FORMATS = ("%H:%M", "%H:%M:%S", "%I:%M %p")
+
+def day_ranges(days: int, chunk_days: int) -> List[Tuple[int, int]]:
+    """Split days 1..days into inclusive (first, last) ranges of at most chunk_days."""
+    chunk_days = max(1, chunk_days)
+    return [(first, min(first + chunk_days - 1, days)) for first in range(1, days + 1, chunk_days)]
+
+
+def build_prompt(
+    location: str,
+    days: int,
+    start_date: date,
+    first_day: int = 1,
+    last_day: Optional[int] = None,
+    context: Optional[str] = None
+) -> str:
+    """
+    Prompt for days first_day..last_day of the trip (the whole trip by
+    default). Partial prompts carry the whole trip's outline so chunks
+    generated in parallel fit together.
+    """
+    last_day = last_day or days
+    chunk_start = start_date + timedelta(days=first_day - 1)
+    if first_day == 1 and last_day == days:
+        header = f"Plan a {days}-day travel itinerary for a {location} trip, starting from {start_date}.\n"
+    else:
+        trip_end = start_date + timedelta(days=days - 1)
+        chunk_end = start_date + timedelta(days=last_day - 1)
+        header = (
+            f"You are planning part of a {days}-day {location} trip from {start_date} to {trip_end}; "
+            f"other days are planned separately.\n"
+            f"Plan only days {first_day} to {last_day} ({chunk_start} to {chunk_end}). "
+            f"{'Day 1 is the arrival day. ' if first_day == 1 else 'The traveller is already there; do not plan an arrival. '}"
+            f"{'Day ' + str(days) + ' is the departure day. ' if last_day == days else 'Do not plan a departure. '}"
+            f"Prefer sights and activities that suit this stage of the trip.\n"
+        )
+    if context:
+        header += f"Trip context: {context}\n"
     return (
-        f"Plan a {days}-day travel itinerary for a {location} trip, starting from {start_date}.\n"
+        header +
         f"For each day, provide 3-4 activities. Each activity should include:\n"
         f"- A specific time in HH:MM format (optional, but include if logical).\n"
         f"- A concise title.\n"
@@ -20,7 +126,7 @@ def build_prompt(location: str, days: int, start_date: date) -> str:
         f"- 'title': Title for the day\n"
         f"- 'description': Summary of the day\n"
         f"- 'date': Date in YYYY-MM-DD format\n"
-        f"- 'Activity': A list of activity objects, each containing:\n"
+        f"- 'activities': A list of activity objects, each containing:\n"
         f"   - 'time': in 'HH:MM' format (optional)\n"
         f"   - 'title': string\n"
         f"   - 'description': string\n\n"
@@ -34,11 +140,11 @@ def build_prompt(location: str, days: int, start_date: date) -> str:
 
         f"Sample day object:\n"
         f"{{\n"
-        f'  "day_number": 1,\n'
+        f'  "day_number": {first_day},\n'
         f'  "title": "Arrival & Exploring Landmarks",\n'
         f'  "description": "Kickstart your trip with sightseeing and local cuisine.",\n'
-        f'  "date": "{start_date}",\n'
-        f'  "Activity": [\n'
+        f'  "date": "{chunk_start}",\n'
+        f'  "activities": [\n'
         f"    {{\n"
         f'      "time": "09:30",\n'
         f'      "title": "Breakfast at Café de Flore",\n'
@@ -53,48 +159,291 @@ def build_prompt(location: str, days: int, start_date: date) -> str:
         f"}}\n\n"
     )
 
-def extract_json_string(raw_text: str):
-    # Remove markdown-style code block
-    if raw_text.strip().startswith("```json"):
-        cleaned = re.sub(r"^```json", "", raw_text.strip())
-        cleaned = re.sub(r"```$", "", cleaned.strip())
-        return cleaned.strip()
-    return raw_text.strip()
+def _canonical_key(key: Any, aliases: Dict[str, str]) -> Optional[str]:
+    return aliases.get(re.sub(r"[\s_-]", "", str(key)).lower())
 
-def parse_ai_response(response: str, start_date: date) -> List[ItineraryDayPreview]:
+
+def _canonical_keys(obj: dict, aliases: Dict[str, str], repairs: Optional[List[str]]) -> dict:
+    """`obj` with known keys renamed to ours; our own spelling wins over an alias."""
+    out = {}
+    for key, value in obj.items():
+        name = _canonical_key(key, aliases)
+        if name == key:
+            out[name] = value
+        elif name is not None:
+            out.setdefault(name, value)
+            if repairs is not None:
+                repairs.append("key_alias")
+    return out
+
+
+def _day_list(value: Any, repairs: List[str]) -> list:
+    """The list of days in a parsed answer: bare, under "days", under another key, or a lone day."""
+    if isinstance(value, list):
+        return value
+    if not isinstance(value, dict):
+        raise ValueError("❌ LLM returned an invalid itinerary.")
+    if isinstance(value.get("days"), list):
+        return value["days"]
+    lists = [item for item in value.values() if isinstance(item, list)]
+    if len(lists) == 1 and not any(_canonical_key(key, DAY_KEY_ALIASES) == "title" for key in value):
+        repairs.append("wrapper")
+        return lists[0]
+    repairs.append("single_day")
+    return [value]
+
+
+def parse_itinerary(
+    response: str,
+    start_date: date,
+    first_day: int = 1,
+    expected_days: Optional[int] = None
+) -> Tuple[List[ItineraryDayPreview], List[str]]:
+    """
+    Parse the model's days, repairing what can be repaired locally (see
+    app.utils.json_repair, plus key aliases, wrapper objects and unusable
+    days, which are dropped). Days are renumbered by position from
+    `first_day` and dated from `start_date`, so chunks generated separately
+    merge into one consistent trip; extra days beyond `expected_days` are
+    dropped. Returns (days, names of the repairs applied).
+    """
     try:
-        json_str = extract_json_string(response)
-        parsed = json.loads(json_str)
-    except json.JSONDecodeError:
+        value, repairs = repair_json(response)
+    except ValueError:
         raise ValueError("❌ LLM returned an invalid JSON.")
-    
-    # logger.info(f"✅ Parsed JSON successfully: {parsed}")
-
-
-    result = []
-
-    for day in parsed:
-        activities = []
-        for act in day.get("Activity", []):
-            act_time = None
-            if act.get("time"):
-                try:
-                    act_time = datetime.strptime(act["time"], "%H:%M").time()
-                except ValueError:
-                    pass  # If time is invalid, keep it None
-
-            activities.append(ActivityPreview(
-                time=act_time,
-                title=act.get("title", "").strip(),
-                description=act.get("description", "").strip()
-            ))
-
-        result.append(ItineraryDayPreview(
-            day_number=day["day_number"],
-            title=day["title"],
-            description=day.get("description", ""),
-            date=datetime.strptime(day["date"], "%Y-%m-%d").date(),
-            activities=activities
+
+    previews = []
+    for day in _day_list(value, repairs):
+        if expected_days is not None and len(previews) == expected_days:
+            break
+        try:
+            previews.append(day_preview_from_dict(day, repairs))
+        except (KeyError, TypeError, ValueError):
+            repairs.append("dropped_day")
+    if not previews:
+        raise ValueError("❌ LLM returned no usable itinerary days.")
+
+    days = [renumber_day(preview, first_day + offset, start_date) for offset, preview in enumerate(previews)]
+    return days, list(dict.fromkeys(repairs))
+
+
+def parse_ai_response(
+    response: str,
+    start_date: date,
+    first_day: int = 1,
+    expected_days: Optional[int] = None
+) -> List[ItineraryDayPreview]:
+    return parse_itinerary(response, start_date, first_day, expected_days)[0]
+
+
+def renumber_day(day: ItineraryDayPreview, day_number: int, start_date: date) -> ItineraryDayPreview:
+    day.day_number = day_number
+    day.date = start_date + timedelta(days=day_number - 1)
+    return day
+
+
+def merge_day_chunks(chunks: List[List[ItineraryDayPreview]], days: int) -> List[ItineraryDayPreview]:
+    """
+    Join chunk results (already numbered by parse_ai_response) in day order.
+    A chunk that came back short leaves a gap rather than shifting later dates.
+    """
+    merged = sorted((day for chunk in chunks for day in chunk), key=lambda day: day.day_number)
+    if len(merged) < days:
+        logger.warning(f"⚠️ AI itinerary has {len(merged)} of {days} days")
+    return merged
+
+
+def _parse_time(value: Any) -> Optional[time]:
+    for fmt in _TIME_FORMATS:
+        try:
+            return datetime.strptime(str(value).strip(), fmt).time()
+        except ValueError:
+            continue
+    return None  # If time is invalid, keep it None
+
+
+def _parse_date(value: Any) -> Optional[date]:
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def day_preview_from_dict(day: dict, repairs: Optional[List[str]] = None) -> ItineraryDayPreview:
+    """
+    One day from the model's JSON. Only the title is required: day numbers
+    and dates are reassigned by position (see renumber_day), and activities
+    without a title are skipped. Key aliases used are noted in `repairs`.
+    """
+    if not isinstance(day, dict):
+        raise ValueError("❌ LLM returned an invalid itinerary day.")
+    day = _canonical_keys(day, DAY_KEY_ALIASES, repairs)
+    title = str(day.get("title") or "").strip()
+    if not title:
+        raise ValueError("❌ LLM returned a day without a title.")
+
+    activities = []
+    for act in day.get("activities") or []:
+        if not isinstance(act, dict):
+            continue
+        act = _canonical_keys(act, ACTIVITY_KEY_ALIASES, repairs)
+        act_title = str(act.get("title") or "").strip()
+        if not act_title:
+            continue
+        activities.append(ActivityPreview(
+            time=_parse_time(act["time"]) if act.get("time") else None,
+            title=act_title,
+            description=str(act.get("description") or "").strip()
         ))
 
-    return result
\ No newline at end of file
+    day_number = day.get("day_number")
+    return ItineraryDayPreview(
+        day_number=day_number if isinstance(day_number, int) else 0,
+        title=title,
+        description=str(day.get("description") or "").strip(),
+        date=_parse_date(day["date"]) if day.get("date") else None,
+        activities=activities
+    )
+
+
+class DayStreamParser:
+    """
+    Incremental reader for the itinerary JSON, finding days the way
+    _day_list does: the elements of a bare array, or of the "days" array
+    (or another list) in a wrapper object. Text can be fed in arbitrary
+    chunks (code fences and all); every day object is returned as soon as
+    its closing brace arrives, without re-scanning earlier text. A top-level
+    object with day keys is a lone day: nothing is streamed and `finish`
+    parses the whole answer. Malformed day objects are repaired where
+    possible; `finish` recovers a day cut off by a truncated answer.
+    The repairs applied are collected in `repairs`.
+    """
+
+    def __init__(self):
+        self.repairs: List[str] = []
+        self._buffer = ""
+        self._pos = 0  # next unscanned index in _buffer
+        self._depth = 0  # open containers, the top-level value included
+        self._in_string = False
+        self._escape = False
+        self._top = None  # "[" or "{" once the top-level value has opened
+        self._list_depth = None  # depth inside the array whose elements are days
+        self._list_key = None  # the wrapper key holding that array
+        self._start = None  # buffer index where the current day object began
+        self._key_start = None  # buffer index where a wrapper key began
+        self._last_key = None
+        self._emitted = 0
+        self._single_day = False  # the top-level object is a day
+        self._done = False
+
+    def feed(self, text: str) -> List[dict]:
+        if self._done:
+            return []
+        self._buffer += text
+        buf = self._buffer
+        days = []
+        i = self._pos
+        while i < len(buf) and not (self._done or self._single_day):
+            ch = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._last_key = buf[self._key_start + 1:i]
+                        self._key_start = None
+            elif ch == '"':
+                # quotes before the top-level value (stray prose) are not JSON strings
+                self._in_string = self._depth > 0
+                if self._top == "{" and self._depth == 1:
+                    self._key_start = i
+            elif ch == ":" and self._top == "{" and self._depth == 1:
+                if not self._emitted and _canonical_key(self._last_key, DAY_KEY_ALIASES) is not None:
+                    self._single_day = True
+            elif ch in "[{" and (self._depth > 0 or self._top is None):
+                if self._depth == 0:
+                    self._top = ch
+                    if ch == "[":
+                        self._list_depth = 1
+                elif ch == "[" and self._top == "{" and self._depth == 1:
+                    # a list under "days" or another non-day key of a wrapper
+                    self._list_depth = 2
+                    self._list_key = self._last_key
+                self._depth += 1
+                if ch == "{" and self._list_depth is not None and self._depth == self._list_depth + 1:
+                    self._start = i
+            elif ch in "]}" and self._depth > 0:
+                self._depth -= 1
+                if ch == "}" and self._start is not None and self._depth == self._list_depth:
+                    day = self._load_day(buf[self._start:i + 1])
+                    if day is not None:
+                        if not self._emitted and self._top == "{" and self._list_key != "days":
+                            self.repairs.append("wrapper")
+                        days.append(day)
+                        self._emitted += 1
+                    self._start = None
+                elif ch == "]" and self._list_depth is not None and self._depth == self._list_depth - 1:
+                    self._list_depth = None
+                    # a wrapper's list without day objects: keep looking for another
+                    self._done = self._top == "[" or self._emitted > 0
+                if self._depth == 0:
+                    self._done = True
+            i += 1
+
+        if self._done:
+            self._buffer = ""
+            self._pos = 0
+            return days
+        # drop text that can no longer be part of a day object; an object
+        # that may still turn out to be a lone day is kept whole
+        keep = 0
+        if self._top == "[" or self._emitted:
+            keep = self._start if self._start is not None else i
+        self._buffer = buf[keep:]
+        self._pos = i - keep
+        if self._start is not None:
+            self._start -= keep
+        if self._key_start is not None:
+            self._key_start -= keep
+        return days
+
+    def finish(self) -> List[dict]:
+        """
+        Call once the text has ended: a lone day, or the day left open by a
+        truncated answer, if any part of it is usable.
+        """
+        if self._top == "{" and not self._emitted and self._start is None:
+            text, self._buffer = self._buffer, ""
+            try:
+                value, repairs = repair_json(text)
+                days = _day_list(value, repairs)
+            except ValueError:
+                return []
+            self.repairs.extend(repairs)
+            return [day for day in days if isinstance(day, dict)]
+        if self._start is None:
+            return []
+        try:
+            day, repairs = repair_json(self._buffer)
+        except ValueError:
+            return []
+        self._start = None
+        self._buffer = ""
+        self.repairs.extend(repairs)
+        return [day] if isinstance(day, dict) else []
+
+    def _load_day(self, text: str) -> Optional[dict]:
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            pass
+        try:
+            day, repairs = repair_json(text)
+        except ValueError:
+            self.repairs.append("dropped_day")
+            return None
+        self.repairs.extend(repairs)
+        return day
@@ -0,0 +1,115 @@
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional, Tuple
+
+from sqlalchemy import literal, not_, or_
+from sqlalchemy.dialects.postgresql import JSONPATH
+
+# Small filter language over Service.features (JSONB):
+#
+#   amenities contains wifi        -> features @> '{"amenities": ["wifi"]}'
+#   contains wifi                  -> features @> '["wifi"]'   (list-shaped features)
+#   vehicle.ac = true              -> features @> '{"vehicle": {"ac": true}}'
+#   room_types.suite != false      -> NOT (features @> '{"room_types": {"suite": false}}')
+#   has vehicle.gps                -> features @? '$."vehicle"."gps"'
+#
+# Values are JSON literals (true, 4, "two words") or bare words. Every
+# operator except != compiles to @> or @?, which the GIN index on features serves.
+
+_PATH = r"[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*"
+_EXPRESSION = re.compile(
+    rf"^\s*(?:(?P<has>has)\s+(?P<has_path>{_PATH})"
+    rf"|(?:(?P<path>{_PATH})\s+)?(?P<op>contains|=|!=)\s+(?P<value>.+?))\s*$",
+    re.IGNORECASE
+)
+
+
+def _parse_value(raw: str) -> Any:
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw
+
+
+def _nest(path: Tuple[str, ...], value: Any) -> Any:
+    for key in reversed(path):
+        value = {key: value}
+    return value
+
+
+@dataclass(frozen=True)
+class FeatureFilter:
+    path: Tuple[str, ...]
+    op: str  # "contains", "=", "!=", "has"
+    value: Any = None
+
+    def __str__(self) -> str:
+        path = ".".join(self.path)
+        if self.op == "has":
+            return f"has {path}"
+        value = self.value if _is_bare_word(self.value) else json.dumps(self.value)
+        return f"{path + ' ' if path else ''}{self.op} {value}"
+
+    def to_sql(self, column):
+        """SQL condition on a JSONB column."""
+        if self.op == "has":
+            jsonpath = "$" + "".join(f'."{key}"' for key in self.path)
+            return column.op("@?")(literal(jsonpath, JSONPATH))
+        if self.op == "contains":
+            condition = column.contains(_nest(self.path, [self.value]))
+        else:
+            condition = column.contains(_nest(self.path, self.value))
+        if self.op == "!=":
+            # rows without features have no value to conflict with
+            return or_(column.is_(None), not_(condition))
+        return condition
+
+    def matches(self, features: Any) -> bool:
+        """Python mirror of to_sql, for in-memory candidates."""
+        node = features
+        for key in self.path:
+            if not isinstance(node, dict) or key not in node:
+                return self.op == "!="
+            node = node[key]
+        if self.op == "has":
+            return True
+        # to_sql nests the value under the path, so only an empty path compares at the top level
+        hit = _contains(node, [self.value] if self.op == "contains" else self.value, top=not self.path)
+        return not hit if self.op == "!=" else hit
+
+
+def _is_bare_word(value: Any) -> bool:
+    """True for strings that parse back to themselves without quotes."""
+    return isinstance(value, str) and value == value.strip() and _parse_value(value) == value
+
+
+def _contains(node: Any, value: Any, top: bool = False) -> bool:
+    """JSONB @> semantics for one value; `top` marks the whole document."""
+    if isinstance(value, dict):
+        return isinstance(node, dict) and all(k in node and _contains(node[k], v) for k, v in value.items())
+    if isinstance(value, list):
+        return isinstance(node, list) and all(any(_contains(n, v) for n in node) for v in value)
+    if isinstance(node, list):
+        # only a top-level array contains a bare primitive it holds
+        return top and any(_contains(n, value) for n in node)
+    if isinstance(node, bool) or isinstance(value, bool):
+        return node is value
+    return node == value
+
+
+def parse_feature_filter(expression: str) -> FeatureFilter:
+    match = _EXPRESSION.match(expression or "")
+    if not match:
+        raise ValueError(f"Invalid feature filter: {expression!r}")
+    if match.group("has"):
+        return FeatureFilter(tuple(match.group("has_path").split(".")), "has")
+    path = tuple(match.group("path").split(".")) if match.group("path") else ()
+    op = match.group("op").lower()
+    if not path and op != "contains":
+        raise ValueError(f"Feature filter needs a path for '{op}': {expression!r}")
+    return FeatureFilter(path, op, _parse_value(match.group("value")))
+
+
+def parse_feature_filters(expressions: Optional[Iterable[str]]) -> List[FeatureFilter]:
+    return [parse_feature_filter(expression) for expression in expressions or []]
@@ -0,0 +1,83 @@
+import math
+from typing import List, Optional, Tuple
+
+# Geohash cells are base32 strings; a shared prefix means a shared cell, so a
+# btree index on the geohash turns "points near X" into a few prefix range scans.
+# The alphabet is in ASCII order, which keeps prefix ranges contiguous under
+# the C collation.
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 9  # ~4.8 m x 4.8 m cells
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # even bits refine longitude
+    while len(chars) < precision:
+        rng, value = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def cell_size_degrees(precision: int) -> Tuple[float, float]:
+    """(height, width) in degrees of a geohash cell at `precision`."""
+    total_bits = 5 * precision
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def precision_for_radius(latitude: float, radius_km: float) -> Optional[int]:
+    """
+    Longest geohash precision whose cells are at least `radius_km` on each
+    side, so a cell and its 8 neighbours cover the whole search circle.
+    None when even single-character cells are too small.
+    """
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = cell_size_degrees(precision)
+        width_km = width * KM_PER_DEGREE * math.cos(math.radians(min(abs(latitude), 89.0)))
+        if height * KM_PER_DEGREE >= radius_km and width_km >= radius_km:
+            return precision
+    return None
+
+
+def covering_prefixes(latitude: float, longitude: float, radius_km: float) -> Optional[List[str]]:
+    """Geohash prefixes (centre cell plus neighbours) covering a radius search."""
+    precision = precision_for_radius(latitude, radius_km)
+    if precision is None:
+        return None
+    height, width = cell_size_degrees(precision)
+    prefixes = set()
+    for dy in (-1, 0, 1):
+        lat = latitude + dy * height
+        if lat > 90 or lat < -90:
+            continue
+        for dx in (-1, 0, 1):
+            lon = (longitude + dx * width + 180) % 360 - 180
+            prefixes.add(encode_geohash(lat, lon, precision))
+    return sorted(prefixes)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
@@ -0,0 +1,109 @@
+import json
+import re
+from typing import Any, List, Optional, Tuple
+
+# Local fixes for the ways LLMs usually break JSON, so a damaged answer can
+# still be used without asking the model again. Each applied fix is reported
+# by name so callers can count them:
+#
+#   wrapper         ```json ... ``` fences or prose before/after the JSON
+#   trailing_comma  [1, 2,] / {"a": 1,}
+#   truncated       output cut off mid-way; the unfinished element is
+#                   dropped and open brackets are closed
+
+_FENCE = re.compile(r"```(?:json|JSON)?\s*(.*?)(?:```|$)", re.DOTALL)
+_CLOSERS = {"[": "]", "{": "}"}
+
+
+def _strip_wrapping(text: str) -> Tuple[str, bool]:
+    stripped = text.strip()
+    fence = _FENCE.search(stripped)
+    if fence:
+        stripped = fence.group(1).strip()
+    starts = [i for i in (stripped.find("["), stripped.find("{")) if i >= 0]
+    if not starts:
+        return stripped, bool(fence)
+    start = min(starts)
+    body = stripped[start:]
+    return body, bool(fence) or start > 0
+
+
+def _scan(text: str):
+    """
+    Walk the JSON text, tracking brackets outside strings. Returns the text
+    up to the end of the top-level value with trailing commas removed,
+    whether any were removed, the brackets still open at the end, the last
+    safe cut (after a value closes or before a separator inside a container,
+    with the brackets open there), whether the text ended inside a string
+    and whether anything followed the top-level value.
+    """
+    out = []
+    stack: List[str] = []
+    in_string = escape = False
+    removed_comma = False
+    safe: Optional[Tuple[int, List[str]]] = None
+    end = len(text)
+    for i, ch in enumerate(text):
+        if in_string:
+            out.append(ch)
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in _CLOSERS:
+            stack.append(_CLOSERS[ch])
+        elif ch in "]}":
+            # a comma right before a closer is a trailing comma
+            j = len(out) - 1
+            while j >= 0 and out[j].isspace():
+                j -= 1
+            if j >= 0 and out[j] == ",":
+                del out[j]
+                removed_comma = True
+            if stack:
+                stack.pop()
+            out.append(ch)
+            if not stack:
+                end = i + 1  # top-level value complete; anything after it is wrapping
+                break
+            safe = (len(out), list(stack))
+            continue
+        elif ch == "," and stack:
+            safe = (len(out), list(stack))  # everything before a separator is complete
+        out.append(ch)
+    return "".join(out), removed_comma, stack, safe, in_string, text[end:].strip() != ""
+
+
+def repair_json(text: str) -> Tuple[Any, List[str]]:
+    """
+    Parse `text` as JSON, applying the fixes above when a plain parse fails.
+    Returns (value, names of the fixes applied). Raises ValueError when the
+    text cannot be recovered.
+    """
+    repairs: List[str] = []
+    try:
+        return json.loads(text), repairs
+    except (TypeError, ValueError):
+        pass
+
+    body, wrapped = _strip_wrapping(text or "")
+    cleaned, removed_comma, stack, safe, in_string, trailing = _scan(body)
+    if wrapped or trailing:
+        repairs.append("wrapper")
+    if removed_comma:
+        repairs.append("trailing_comma")
+    if stack or in_string:
+        if safe is None:
+            raise ValueError("Truncated JSON with no complete element")
+        cut, open_stack = safe
+        cleaned = cleaned[:cut].rstrip().rstrip(",") + "".join(reversed(open_stack))
+        repairs.append("truncated")
+    try:
+        return json.loads(cleaned), repairs
+    except ValueError as e:
+        raise ValueError(f"Unrepairable JSON: {e}")
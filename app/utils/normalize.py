@@ -1,6 +1,60 @@
+import re
+import unicodedata
+
 def normalize_to_dict(obj):
     if isinstance(obj, dict):
         return obj
     elif hasattr(obj, 'dict'):
         return obj.dict()
-    return obj
\ No newline at end of file
+    return obj
+
+
+def normalize_location(value: str) -> str:
+    """
+    Python mirror of Service.location_key: lowercase, every run of
+    non-alphanumeric characters collapsed to one space, trimmed.
+    """
+    if not value:
+        return ""
+    value = unicodedata.normalize("NFKC", value).lower()
+    return re.sub(r"[\W_]+", " ", value).strip()
+
+
+def location_city_key(value: str) -> str:
+    """
+    Normalized city part of a free-text location ("Paris, France" -> "paris").
+    """
+    if not value:
+        return ""
+    return normalize_location(value.split(",")[0])
+
+
+_TERM_SPLIT = re.compile(r"[^a-z0-9]+")
+
+
+def text_terms(value) -> frozenset:
+    """Lowercase alphanumeric words longer than two characters."""
+    if not value:
+        return frozenset()
+    return frozenset(t for t in _TERM_SPLIT.split(str(value).lower()) if len(t) > 2)
+
+
+def feature_terms(features) -> frozenset:
+    """
+    Flatten a service's JSON features (dict keys, nested values, lists)
+    into one set of terms for preference matching.
+    """
+    parts = []
+    stack = [features]
+    while stack:
+        value = stack.pop()
+        if value is None or value is True or value is False:
+            continue
+        if isinstance(value, dict):
+            parts.extend(str(k) for k in value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple, set)):
+            stack.extend(value)
+        else:
+            parts.append(str(value))
+    return text_terms(" ".join(parts))
@@ -0,0 +1,119 @@
+from typing import List, Optional
+
+# Fractional (lexicographic) ordering keys.
+# Keys are base62 strings compared as plain strings, so a new key can always be
+# generated between two neighbours and a move only rewrites the moved row.
+# Keys never end in the smallest digit, which guarantees there is room below them.
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+# Keys longer than this mean a list has had many inserts at the same spot
+# and should be rebalanced.
+REBALANCE_KEY_LENGTH = 12
+
+
+def _midpoint(a: str, b: Optional[str]) -> str:
+    """Return a key strictly between a ("" = start) and b (None = end)."""
+    if b:
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else DIGITS[0]) == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else BASE
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    if b is not None and len(b) > 1:
+        return b[0]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def _validate(key: Optional[str]) -> None:
+    if key is None:
+        return
+    if not key or key[-1] == DIGITS[0] or any(ch not in DIGITS for ch in key):
+        raise ValueError(f"Invalid ordering key: {key!r}")
+
+
+def key_between(a: Optional[str], b: Optional[str]) -> str:
+    """
+    Generate a key that sorts after `a` and before `b`.
+    `a=None` means the start of the list, `b=None` means the end.
+    """
+    _validate(a)
+    _validate(b)
+    if a is not None and b is not None and a >= b:
+        raise ValueError(f"Ordering keys out of order: {a!r} >= {b!r}")
+    if a is not None and b is None:
+        return key_after(a)
+    return _midpoint(a or "", b)
+
+
+def _encode(value: int, length: int) -> str:
+    chars = []
+    for _ in range(length):
+        value, rem = divmod(value, BASE)
+        chars.append(DIGITS[rem])
+    return "".join(reversed(chars))
+
+
+def key_after(a: str) -> str:
+    """
+    Generate a key that sorts after `a`, for appending to the end of a list.
+    Steps `a` up by one in its last digit; only when its length runs out is
+    the key extended, and then to twice its length, so a list that is only
+    ever appended to keeps keys of a few characters.
+    """
+    _validate(a)
+    value = 0
+    for ch in a:
+        value = value * BASE + DIGITS.index(ch)
+    value += 1
+    if value % BASE == 0:
+        value += 1
+    if value < BASE ** len(a):
+        return _encode(value, len(a))
+    return a + _encode(1, len(a))
+
+
+def keys_between(a: Optional[str], b: Optional[str], n: int) -> List[str]:
+    """
+    Generate `n` ascending keys between `a` and `b`.
+    Keys between two neighbours are produced by bisection so their length
+    grows with log(n); keys after the last one (`b=None`) step up from `a`.
+    """
+    if n <= 0:
+        return []
+    if a is not None and b is None:
+        keys = [key_after(a)]
+        for _ in range(n - 1):
+            keys.append(key_after(keys[-1]))
+        return keys
+    if n == 1:
+        return [key_between(a, b)]
+    mid = key_between(a, b)
+    left = n // 2
+    return keys_between(a, mid, left) + [mid] + keys_between(mid, b, n - left - 1)
+
+
+def evenly_spaced_keys(n: int) -> List[str]:
+    """
+    Generate `n` short, evenly spaced keys for a rebalance.
+    Keys only use the lower half of the key space so appending after the
+    last one stays short.
+    """
+    if n <= 0:
+        return []
+    length = 1
+    while BASE ** length < 4 * (n + 1):
+        length += 1
+    step = BASE ** length // (2 * (n + 1))
+
+    return [_encode(i * step, length).rstrip(DIGITS[0]) for i in range(1, n + 1)]
+
+
+def needs_rebalance(key: Optional[str]) -> bool:
+    return key is not None and len(key) > REBALANCE_KEY_LENGTH
@@ -0,0 +1,62 @@
+# Wall clock of AI itinerary previews by trip length and chunk size, against
+# a stub LLM whose latency grows with the number of days it writes. Not
+# collected by default; run with
+#   python -m pytest tests/benchmark_ai_chunks.py -s -q
+
+import asyncio
+import json
+import re
+import time
+from datetime import date, timedelta
+from unittest.mock import AsyncMock
+
+from app.core.config import settings
+from app.services.itineraries import planner_service
+
+BASE_LATENCY = 0.3  # seconds before the first token
+PER_DAY_LATENCY = 0.15  # seconds per generated day
+TRIP_DAYS = [7, 14, 21]
+CHUNK_SIZES = [None, 7, 4, 2]  # None = the whole trip in one completion
+START = date(2026, 6, 1)
+
+
+async def _stub_completion(prompt: str, **kwargs) -> str:
+    match = re.search(r"Plan only days (\d+) to (\d+)", prompt)
+    if match:
+        first, last = int(match.group(1)), int(match.group(2))
+    else:
+        first, last = 1, int(re.search(r"Plan a (\d+)-day", prompt).group(1))
+    await asyncio.sleep(BASE_LATENCY + PER_DAY_LATENCY * (last - first + 1))
+    return json.dumps([
+        {
+            "day_number": day,
+            "title": f"Day {day}",
+            "description": "",
+            "date": str(START + timedelta(days=day - 1)),
+            "activities": [{"time": "09:00", "title": "Walk", "description": ""}],
+        }
+        for day in range(first, last + 1)
+    ])
+
+
+def test_chunked_generation_wall_clock(monkeypatch):
+    monkeypatch.setattr(planner_service, "get_ai_completion", _stub_completion)
+    monkeypatch.setattr(planner_service, "record_parse", AsyncMock())
+    monkeypatch.setattr(planner_service, "count_parse_failure", AsyncMock())
+
+    async def preview(days: int, chunk_days: int) -> float:
+        started = time.perf_counter()
+        result = await planner_service.generate_preview_days("Lisbon", days, START, chunk_days=chunk_days)
+        elapsed = time.perf_counter() - started
+        assert [day.day_number for day in result] == list(range(1, days + 1))
+        assert [day.date for day in result] == [START + timedelta(days=i) for i in range(days)]
+        return elapsed
+
+    print(
+        f"\nstub LLM: {BASE_LATENCY}s + {PER_DAY_LATENCY}s per day, "
+        f"{settings.AI_ITINERARY_PARALLEL_CHUNKS} parallel chunks, wall clock in seconds"
+    )
+    print("  days | " + " | ".join(f"{'single' if size is None else f'chunk {size}':>7}" for size in CHUNK_SIZES))
+    for days in TRIP_DAYS:
+        timings = [asyncio.run(preview(days, size or days)) for size in CHUNK_SIZES]
+        print(f"  {days:>4} | " + " | ".join(f"{seconds:>7.2f}" for seconds in timings))
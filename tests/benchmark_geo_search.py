@@ -0,0 +1,103 @@
+# Radius search benchmark: geohash prefix covers and the catalog's radius
+# filter on a synthetic catalog. Not collected by default; run with
+#   python -m pytest tests/benchmark_geo_search.py -s -q
+# and compare the printed timings.
+
+import math
+import time
+
+import numpy as np
+
+from app.services.recommendations.catalog import ServiceCatalog
+from app.utils.geo import EARTH_RADIUS_KM, covering_prefixes, encode_geohash, haversine_km
+
+SERVICES = 500_000
+WITHOUT_COORDINATES = 0.1
+CITIES = ["lisbon", "porto", "faro", "coimbra", "braga", "evora", "sintra", "cascais", "lagos", "aveiro"]
+LISBON = (38.7223, -9.1393)
+RADII_KM = [0.5, 5, 25, 100, 500]
+
+
+def _catalog(n: int) -> ServiceCatalog:
+    rng = np.random.default_rng(7)
+    catalog = ServiceCatalog()
+    catalog.ids = np.arange(1, n + 1, dtype=np.int64)
+    catalog.price = np.round(rng.uniform(20, 400, n), 2)
+    catalog.latitude = rng.uniform(37.0, 42.0, n)
+    catalog.longitude = rng.uniform(-9.5, -6.5, n)
+    missing = rng.random(n) < WITHOUT_COORDINATES
+    catalog.latitude[missing] = np.nan
+    catalog.longitude[missing] = np.nan
+    catalog.type_code = np.full(n, catalog._code_type("hotel"), dtype=np.int32)
+    location_ids = [catalog._code_location(city) for city in CITIES]
+    catalog.location_id = np.array([location_ids[i % len(CITIES)] for i in range(n)], dtype=np.int32)
+    catalog.provider_id = np.ones(n, dtype=np.int64)
+    catalog.available = np.ones(n, dtype=bool)
+    return catalog
+
+
+def _timed(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def _points_inside(rng, latitude: float, longitude: float, radius_km: float, n: int):
+    """Random points strictly inside the circle (destination-point formula)."""
+    bearing = rng.uniform(0, 2 * math.pi, n)
+    angular = radius_km * 0.999 * np.sqrt(rng.random(n)) / EARTH_RADIUS_KM
+    lat1, lon1 = math.radians(latitude), math.radians(longitude)
+    lat2 = np.arcsin(np.sin(lat1) * np.cos(angular) + np.cos(lat1) * np.sin(angular) * np.cos(bearing))
+    lon2 = lon1 + np.arctan2(
+        np.sin(bearing) * np.sin(angular) * np.cos(lat1), np.cos(angular) - np.sin(lat1) * np.sin(lat2)
+    )
+    return np.degrees(lat2), (np.degrees(lon2) + 180) % 360 - 180
+
+
+def test_prefix_cover_has_no_gaps():
+    rng = np.random.default_rng(11)
+    checked = 0
+    for _ in range(600):
+        latitude, longitude = rng.uniform(-80, 80), rng.uniform(-180, 180)
+        radius_km = float(rng.choice(RADII_KM))
+        prefixes = covering_prefixes(latitude, longitude, radius_km)
+        if prefixes is None:
+            continue  # served by the latitude band instead
+        precision = len(prefixes[0])
+        for lat, lon in zip(*_points_inside(rng, latitude, longitude, radius_km, 100)):
+            assert haversine_km(latitude, longitude, lat, lon) <= radius_km
+            assert encode_geohash(lat, lon, precision) in prefixes, (latitude, longitude, radius_km, lat, lon)
+            checked += 1
+    print(f"\n{checked} points inside the radius, none outside the prefix cover")
+
+
+def test_radius_filter():
+    catalog = _catalog(SERVICES)
+    latitude, longitude = LISBON
+    near = (latitude, longitude, 25.0)
+
+    def full_scan():
+        distances = catalog.distance_km(latitude, longitude)
+        return np.flatnonzero(distances <= 25.0)
+
+    banded = catalog._radius_mask(*near)
+    assert np.array_equal(np.flatnonzero(banded), full_scan())
+
+    timings = {
+        "candidate_rows, text only": _timed(lambda: catalog.candidate_rows("lisbon")),
+        "candidate_rows, text + 25 km": _timed(lambda: catalog.candidate_rows("lisbon", near=near)),
+        "25 km mask, latitude band": _timed(lambda: catalog._radius_mask(*near)),
+        "25 km mask, haversine on every row": _timed(full_scan),
+    }
+    print(f"\n{SERVICES} services, {WITHOUT_COORDINATES:.0%} without coordinates, best of 5:")
+    for name, ms in timings.items():
+        print(f"  {name:<36} {ms:8.1f} ms")
+
+    for radius_km in RADII_KM:
+        prefixes = covering_prefixes(latitude, longitude, radius_km)
+        us = _timed(lambda: [covering_prefixes(latitude, longitude, radius_km) for _ in range(1000)])
+        cover = f"{len(prefixes)} prefixes of length {len(prefixes[0])}" if prefixes else "latitude band"
+        print(f"  {f'covering_prefixes({radius_km:g} km)':<36} {us:8.1f} us  {cover}")
@@ -0,0 +1,77 @@
+# Ranking benchmark on a synthetic catalog. Not collected by default; run with
+#   python -m pytest tests/benchmark_rule_engine.py -s -q
+# and compare the printed timings.
+
+import time
+
+import numpy as np
+
+from app.services.recommendations.catalog import CatalogCandidates, CatalogProvider, ServiceCatalog
+from app.services.recommendations.rule_engine import PreferenceProfile, group_and_select_top_services
+
+CANDIDATES = 100_000
+TYPES = ["hotel", "bus", "rental", "package"]
+TERMS = ["wifi", "pool", "spa", "museum", "hiking", "beach", "nightlife", "vegan", "relaxed", "parking"]
+
+
+def _catalog(n: int) -> ServiceCatalog:
+    rng = np.random.default_rng(7)
+    catalog = ServiceCatalog()
+    catalog.ids = np.arange(1, n + 1, dtype=np.int64)
+    catalog.price = np.round(rng.uniform(20, 400, n), 2)
+    catalog.rating = np.round(rng.uniform(1, 5, n), 1)
+    catalog.rating[rng.random(n) < 0.1] = np.nan
+    catalog.latitude = np.full(n, np.nan)
+    catalog.longitude = np.full(n, np.nan)
+    catalog.type_code = np.array([catalog._code_type(TYPES[i % len(TYPES)]) for i in range(n)], dtype=np.int32)
+    catalog.provider_id = np.ones(n, dtype=np.int64)
+    catalog.available = np.ones(n, dtype=bool)
+    catalog.titles = [f"Service {i}" for i in range(n)]
+    catalog.types = [TYPES[i % len(TYPES)] for i in range(n)]
+    catalog.locations = ["Lisbon"] * n
+    term_sets = [frozenset(rng.choice(TERMS, 3, replace=False)) for _ in range(200)]
+    catalog.feature_terms = [term_sets[i % len(term_sets)] for i in range(n)]
+    catalog.features = [sorted(terms) for terms in catalog.feature_terms]
+    catalog.providers = {1: CatalogProvider(id=1, name="Provider", contact_phone=None)}
+    return catalog
+
+
+def _timed(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def _price_sort(services, top_n: int = 3):
+    grouped = {}
+    for service in services:
+        grouped.setdefault(service.type, []).append(service)
+    return {t: sorted(items, key=lambda s: s.price or float("inf"))[:top_n] for t, items in grouped.items()}
+
+
+def test_rank_catalog_candidates():
+    catalog = _catalog(CANDIDATES)
+    rows = np.arange(CANDIDATES)[np.argsort(catalog.price, kind="stable")]
+    profile = PreferenceProfile.from_term_counts({"wifi": 3, "pool": 2, "hiking": 1}, 4, 120.0, 180.0)
+
+    from_columns = group_and_select_top_services(CatalogCandidates(catalog, rows), profile=profile)
+    from_objects = group_and_select_top_services(catalog.materialize(rows), profile=profile)
+    assert from_columns == from_objects
+
+    services = catalog.materialize(rows)
+    timings = {
+        "price sort, rows prebuilt": _timed(lambda: _price_sort(services)),
+        "price sort over materialized rows": _timed(lambda: _price_sort(catalog.materialize(rows))),
+        "scoring over materialized rows": _timed(
+            lambda: group_and_select_top_services(catalog.materialize(rows), profile=profile)
+        ),
+        "scoring over catalog columns": _timed(
+            lambda: group_and_select_top_services(CatalogCandidates(catalog, rows), profile=profile)
+        ),
+    }
+    print(f"\n{CANDIDATES} candidates, best of 5:")
+    for name, ms in timings.items():
+        print(f"  {name:<36} {ms:8.1f} ms")
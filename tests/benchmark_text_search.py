@@ -0,0 +1,109 @@
+# /services/search latency on a synthetic catalog. Needs an empty scratch
+# Postgres database: the tables are created and loaded inside one transaction
+# that is rolled back at the end. Not collected by default; run with
+#   TEST_DATABASE_URL=postgresql+asyncpg://... python -m pytest tests/benchmark_text_search.py -s -q
+# SEARCH_BENCH_ROWS sets the catalog size (default 1,000,000).
+
+import os
+import statistics
+import time
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.database import Base
+from app.models import Service, ServiceProvider, User
+from app.services.service.text_search import search_services
+
+ROWS = int(os.environ.get("SEARCH_BENCH_ROWS", 1_000_000))
+PROVIDERS = 1_000
+REPEAT = 20
+# each title takes three of these, so a single word matches ~6% of the catalog
+WORDS = [
+    "quiet", "beach", "mountain", "lodge", "city", "central", "river", "garden", "family", "luxury",
+    "budget", "historic", "modern", "harbour", "forest", "lake", "island", "desert", "valley", "coastal",
+    "villa", "cabin", "hostel", "suite", "studio", "express", "coach", "shuttle", "scooter", "bike",
+    "kayak", "surf", "yoga", "wine", "food", "market", "castle", "temple", "museum", "safari",
+    "diving", "hiking", "skiing", "spa", "sunset", "panorama", "boutique", "rustic", "eco", "retreat",
+]
+QUERIES = {
+    "rare term (1 in 10k)": "lighthouse",
+    "one word (~6%)": "harbour",
+    "two words (~0.4%)": "quiet beach",
+    "phrase": '"mountain lodge"',
+    "exclusion": "villa -spa",
+    "every row": "comfortable",
+}
+
+
+async def _load(session: AsyncSession) -> None:
+    await session.execute(
+        text("INSERT INTO service_providers (name) SELECT 'Provider ' || g FROM generate_series(1, :n) g"),
+        {"n": PROVIDERS},
+    )
+    # the search_vector trigger fills the document on insert
+    await session.execute(
+        text("""
+            INSERT INTO services (provider_id, type, title, description, location, price, is_available)
+            SELECT
+                p.ids[1 + g % :providers],
+                (ARRAY['hotel', 'bus', 'rental', 'package'])[1 + g % 4],
+                initcap(w.words[1 + (g * 7) % 50] || ' ' || w.words[1 + (g * 13 + 3) % 50] || ' '
+                    || w.words[1 + (g * 31 + 5) % 50])
+                    || CASE WHEN g % 10000 = 0 THEN ' Lighthouse' ELSE '' END,
+                'Comfortable stay near the ' || w.words[1 + (g * 17 + 11) % 50],
+                'Lisbon',
+                20 + g % 380,
+                g % 10 <> 0
+            FROM generate_series(1, :rows) g,
+                 (SELECT array_agg(id ORDER BY id) AS ids FROM service_providers) p,
+                 (SELECT CAST(:words AS text[]) AS words) w
+        """),
+        {"providers": PROVIDERS, "rows": ROWS, "words": WORDS},
+    )
+    await session.execute(text("ANALYZE services"))
+
+
+async def _timed(session: AsyncSession, repeat: int = REPEAT, **kwargs) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await search_services(session, **kwargs)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+@pytest.mark.asyncio
+async def test_search_latency():
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_async_engine(url)
+    try:
+        async with engine.connect() as conn:
+            await conn.begin()
+            tables = [model.__table__ for model in (User, ServiceProvider, Service)]
+            await conn.run_sync(Base.metadata.create_all, tables=tables)
+            session = AsyncSession(bind=conn)
+
+            started = time.perf_counter()
+            await _load(session)
+            print(f"\nloaded {ROWS} services in {time.perf_counter() - started:.1f} s; median of {REPEAT}, 20 per page:")
+
+            for name, q in QUERIES.items():
+                rows, next_cursor = await search_services(session, q)
+                assert rows, q
+                first_page = await _timed(session, q=q)
+                line = f"  {name:<22} {q!r:<20} page 1 {first_page:8.2f} ms"
+                for _ in range(8):  # walk to page 10's cursor
+                    if next_cursor is None:
+                        break
+                    _, next_cursor = await search_services(session, q, cursor=next_cursor)
+                if next_cursor:
+                    line += f"   page 10 {await _timed(session, q=q, cursor=next_cursor):8.2f} ms"
+                print(line)
+                session.expunge_all()
+            await conn.rollback()
+    finally:
+        await engine.dispose()
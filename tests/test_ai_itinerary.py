@@ -0,0 +1,34 @@
+import json
+from datetime import date
+
+import pytest
+
+from app.utils.ai_itinerary import DayStreamParser, day_preview_from_dict, parse_itinerary
+
+
+def _day(title):
+    return {"title": title, "activities": [{"time": "09:00", "title": f"{title} breakfast"}]}
+
+
+ANSWERS = [
+    json.dumps([_day("A"), _day("B")]),
+    json.dumps({"days": [_day("A"), _day("B")]}),
+    "```json\n" + json.dumps({"itinerary": [_day("A"), _day("B")]}) + "\n```",
+    json.dumps({"notes": ["x"], "days": [_day("A")]}),
+    json.dumps(_day("Arrive")),
+    json.dumps({"name": "Arrive", "events": [{"name": "Breakfast"}]}),
+    json.dumps({"days": [_day("A"), _day("B")]})[:-20],
+]
+
+
+@pytest.mark.parametrize("answer", ANSWERS)
+@pytest.mark.parametrize("chunk_size", [1, 7, 10000])
+def test_stream_parser_finds_the_same_days_as_parse_itinerary(answer, chunk_size):
+    parser = DayStreamParser()
+    days = []
+    for offset in range(0, len(answer), chunk_size):
+        days += parser.feed(answer[offset:offset + chunk_size])
+    days += parser.finish()
+
+    expected, _ = parse_itinerary(answer, date(2026, 1, 1))
+    assert [day_preview_from_dict(day).title for day in days] == [day.title for day in expected]
@@ -0,0 +1,122 @@
+import os
+import uuid
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.database import Base
+from app.models import ChecklistAssignment, ChecklistCompletion, Trip, TripChecklist, User
+from app.schemas.trip.checklist import BulkAssignmentCreate, ChecklistResponse
+from app.services.trips.checklist_service import bulk_assign_tasks, clone_template_into_trip, get_trip_checklist
+
+
+def _session(*results):
+    """AsyncSession stand-in whose execute() returns `results` in order."""
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=list(results))
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+    return session
+
+
+def _rows(values):
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = values
+    return result
+
+
+def _scalar(value):
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = value
+    return result
+
+
+@pytest.mark.asyncio
+async def test_bulk_assign_tasks_returns_newly_assigned_ids():
+    session = _session(_rows([3, 5]))
+    data = BulkAssignmentCreate(task_ids=[3, 4, 5], assigned_to=7, notes="pack")
+
+    assert await bulk_assign_tasks(session, trip_id=1, bulk_data=data, assigned_by=2) == [3, 5]
+    assert session.execute.await_count == 1
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_clone_template_appends_cloned_tasks_after_the_last_key():
+    # template lookup, list lock, last position, INSERT ... SELECT
+    session = _session(_scalar(9), MagicMock(), _scalar("V"), _rows([11, 12, 13]))
+    session.scalar = AsyncMock(return_value=3)
+
+    assert await clone_template_into_trip(session, trip_id=1, template_id=9, created_by=2) == [11, 12, 13]
+
+    lock = str(session.execute.await_args_list[1].args[0])
+    assert "pg_advisory_xact_lock" in lock
+    insert = session.execute.await_args_list[3].args[0].compile(dialect=postgresql.dialect())
+    assert "row_number() OVER (ORDER BY checklist_template_items.id)" in str(insert)
+    assert [value for value in insert.params.values() if isinstance(value, str)] == ["W", "X", "Y"]
+    session.commit.assert_awaited_once()
+
+
+async def _seed_checklist(session, tasks: int, members: int) -> int:
+    """One trip with `tasks` tasks, each assigned to three of `members` users and completed by one."""
+    tag = uuid.uuid4().hex[:8]
+    users = [User(email=f"{tag}-{i}@example.com", username=f"{tag}-{i}") for i in range(members)]
+    session.add_all(users)
+    await session.flush()
+    trip = Trip(
+        title="Porto", start_date=date(2026, 6, 1), end_date=date(2026, 6, 7),
+        location="Porto", budget=1000, trip_type="leisure", creator_id=users[0].id,
+    )
+    session.add(trip)
+    await session.flush()
+    for i in range(tasks):
+        assignees = [users[(i + k) % members] for k in range(3)]
+        session.add(TripChecklist(
+            trip_id=trip.id, title=f"Task {i}", created_by=users[i % members].id, position=f"a{i:04d}",
+            assignments=[ChecklistAssignment(assigned_to=u.id, assigned_by=users[0].id) for u in assignees],
+            completions=[ChecklistCompletion(completed_by=assignees[0].id)],
+        ))
+    await session.flush()
+    session.expunge_all()
+    return trip.id
+
+
+@pytest.mark.asyncio
+async def test_trip_checklist_loads_in_four_queries():
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_async_engine(url)
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    try:
+        async with engine.connect() as conn:
+            await conn.begin()
+            tables = [model.__table__ for model in (User, Trip, TripChecklist, ChecklistAssignment, ChecklistCompletion)]
+            await conn.run_sync(Base.metadata.create_all, tables=tables)
+            session = AsyncSession(bind=conn)
+            trip_id = await _seed_checklist(session, tasks=300, members=20)
+
+            event.listen(engine.sync_engine, "before_cursor_execute", count)
+            try:
+                items = await get_trip_checklist(session, trip_id, sort="position")
+                payload = [ChecklistResponse.model_validate(item) for item in items]
+            finally:
+                event.remove(engine.sync_engine, "before_cursor_execute", count)
+            await conn.rollback()
+    finally:
+        await engine.dispose()
+
+    # tasks, assignments, completions, users: independent of task and member counts
+    assert len(statements) == 4, statements
+    assert len(payload) == 300
+    assert all(task.creator_name and len(task.assignments) == 3 for task in payload)
+    assert all(a.assigned_user_name and a.assigner_name for task in payload for a in task.assignments)
+    assert all(c.user_name for task in payload for c in task.completions)
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+from sqlalchemy import literal, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.utils.feature_filter import parse_feature_filter
+
+# (filter, features, what Postgres returns for the filter's to_sql)
+CASES = [
+    ("amenities contains wifi", {"amenities": ["wifi", "pool"]}, True),
+    ("amenities contains wifi", {"amenities": "wifi"}, False),
+    ("amenities = wifi", {"amenities": ["wifi", "pool"]}, False),
+    ("amenities = wifi", {"amenities": "wifi"}, True),
+    ("amenities contains [\"wifi\"]", {"amenities": ["wifi"]}, False),
+    ("contains wifi", ["wifi", "pool"], True),
+    ("contains wifi", {"wifi": True}, False),
+    ("vehicle.ac = true", {"vehicle": {"ac": True}}, True),
+    ("vehicle.ac = true", {"vehicle": {"ac": 1}}, False),
+    ("vehicle.ac = true", {"vehicle": {"ac": "true"}}, False),
+    ("vehicle.seats = 4", {"vehicle": {"seats": 4.0}}, True),
+    ("vehicle = {\"ac\": true}", {"vehicle": {"ac": True, "gps": False}}, True),
+    ("room_types.suite != false", {"room_types": {"suite": False}}, False),
+    ("room_types.suite != false", {"room_types": {"suite": True}}, True),
+    ("room_types.suite != false", {}, True),
+    ("has vehicle.gps", {"vehicle": {"gps": None}}, True),
+    ("has vehicle.gps", {"vehicle": {"ac": True}}, False),
+]
+
+
+@pytest.mark.parametrize("expression, features, expected", CASES)
+def test_matches_follows_jsonb_containment(expression, features, expected):
+    assert parse_feature_filter(expression).matches(features) is expected
+
+
+@pytest.mark.asyncio
+async def test_matches_agrees_with_sql():
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_async_engine(url)
+    try:
+        async with engine.connect() as conn:
+            for expression, features, _ in CASES:
+                feature_filter = parse_feature_filter(expression)
+                in_sql = await conn.scalar(select(feature_filter.to_sql(literal(features, JSONB))))
+                assert feature_filter.matches(features) is in_sql, expression
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.parametrize("expression", [
+    'x = "true"', 'x = "1"', 'x = "null"', 'x = "two words"', "x = wifi", "x = 4", "x = true",
+])
+def test_str_parses_back_to_the_same_filter(expression):
+    feature_filter = parse_feature_filter(expression)
+    assert parse_feature_filter(str(feature_filter)) == feature_filter
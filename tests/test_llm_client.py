@@ -0,0 +1,130 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.core import llm_client
+from app.core.config import settings
+from app.core.llm_client import LLMClient, cancel_on_disconnect
+
+MESSAGES = [{"role": "user", "content": "Plan a day in Porto"}]
+
+
+def _completion(content: str = "ok") -> dict:
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "stub-model",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 5, "completion_tokens": 1, "total_tokens": 6},
+    }
+
+
+class StubServer:
+    """In-process /v1/chat/completions: answers with `statuses` in turn (200 once they run out)."""
+
+    def __init__(self, statuses=(), delay: float = 0.0):
+        self.statuses = list(statuses)
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/v1/chat/completions"
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status != 200:
+            return httpx.Response(status, json={"error": {"message": "stub failure"}})
+        return httpx.Response(200, json=_completion())
+
+    def client(self, **kwargs) -> LLMClient:
+        http = httpx.AsyncClient(transport=httpx.MockTransport(self))
+        return LLMClient(base_url="http://stub/v1", api_key="test", model="stub-model", http_client=http, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_RETRY_BASE_SECONDS", 0.001)
+    monkeypatch.setattr(llm_client, "record_usage", AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped_per_client():
+    server = StubServer(delay=0.05)
+    client = server.client(max_concurrency=2)
+
+    answers = await asyncio.gather(*(client.complete(MESSAGES) for _ in range(6)))
+
+    assert answers == ["ok"] * 6
+    assert server.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_503_is_retried_until_it_succeeds():
+    server = StubServer(statuses=[503, 503])
+    client = server.client(max_retries=2)
+
+    assert await client.complete(MESSAGES) == "ok"
+    assert server.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_503_after_the_last_retry_maps_to_502():
+    server = StubServer(statuses=[503] * 5)
+    client = server.client(max_retries=2)
+
+    with pytest.raises(HTTPException) as raised:
+        await client.complete(MESSAGES)
+    assert raised.value.status_code == 502
+    assert server.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_client_errors_map_to_502_without_retries():
+    server = StubServer(statuses=[400])
+    client = server.client(max_retries=2)
+
+    with pytest.raises(HTTPException) as raised:
+        await client.complete(MESSAGES)
+    assert raised.value.status_code == 502
+    assert server.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_timeouts_map_to_504():
+    server = StubServer(delay=1.0)
+    client = server.client(timeout=0.05, max_retries=1)
+
+    with pytest.raises(HTTPException) as raised:
+        await client.complete(MESSAGES)
+    assert raised.value.status_code == 504
+    assert server.calls == 2
+
+
+class _DisconnectedRequest:
+    async def is_disconnected(self) -> bool:
+        return True
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_the_call_with_499():
+    server = StubServer(delay=1.0)
+    client = server.client()
+    call = asyncio.ensure_future(client.complete(MESSAGES))
+
+    with pytest.raises(HTTPException) as raised:
+        await cancel_on_disconnect(_DisconnectedRequest(), call, poll_interval=0.01)
+    assert raised.value.status_code == 499
+    with pytest.raises(asyncio.CancelledError):
+        await call
+    assert server.in_flight == 0
@@ -0,0 +1,122 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.llm_router import LLMRouter, Route
+
+MESSAGES = [{"role": "user", "content": "Plan a day in Porto"}]
+
+
+class StubEndpoint:
+    """Route client that answers after an injected latency, or fails."""
+
+    def __init__(self, model: str, latency: float = 0.0, fail: bool = False, gate: asyncio.Event = None):
+        self.model = model
+        self.latency = latency
+        self.fail = fail
+        self.gate = gate
+        self.started_at = []
+        self.opened = 0  # streams that produced their first delta
+        self.closed = 0
+
+    async def _wait(self) -> None:
+        self.started_at.append(time.monotonic())
+        if self.gate is not None:
+            await self.gate.wait()
+        else:
+            await asyncio.sleep(self.latency)
+        if self.fail:
+            raise HTTPException(status_code=502, detail="AI model is temporarily unavailable.")
+
+    async def complete(self, messages, **kwargs) -> str:
+        await self._wait()
+        return self.model
+
+    async def stream(self, messages, **kwargs):
+        try:
+            await self._wait()
+            self.opened += 1
+            yield f"{self.model}:1"
+            yield f"{self.model}:2"
+        finally:
+            self.closed += 1
+
+    async def aclose(self) -> None:
+        pass
+
+
+def _router(*endpoints: StubEndpoint, hedge: bool = True) -> LLMRouter:
+    return LLMRouter([Route(endpoint.model, endpoint) for endpoint in endpoints], hedge=hedge)
+
+
+def _seed(route: Route, seconds: float, samples: int = 20, first_token: bool = False) -> None:
+    for _ in range(samples):
+        route.stats.record(seconds, first_token=first_token)
+
+
+@pytest.fixture(autouse=True)
+def no_exploration(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_ROUTER_EXPLORE_RATE", 0.0)
+    monkeypatch.setattr(settings, "LLM_HEDGE_MIN_DELAY_SECONDS", 0.01)
+
+
+@pytest.mark.asyncio
+async def test_hedge_fires_after_p95_and_first_answer_wins():
+    slow, fast = StubEndpoint("slow", latency=1.0), StubEndpoint("fast", latency=0.01)
+    router = _router(slow, fast)
+    _seed(router.routes[0], 0.05)  # usually fast: p95 of 50 ms, so it stays first
+    _seed(router.routes[1], 0.2)
+
+    started = time.monotonic()
+    assert await router.complete(MESSAGES) == "fast"
+    elapsed = time.monotonic() - started
+
+    hedged_after = fast.started_at[0] - slow.started_at[0]
+    assert 0.05 <= hedged_after < 0.2
+    assert elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_losing_stream_is_closed_through_discard():
+    gate = asyncio.Event()
+    first, second = StubEndpoint("first", gate=gate), StubEndpoint("second", gate=gate)
+    router = _router(first, second)
+    _seed(router.routes[0], 0.01, first_token=True)
+    # both streams are open and answer in the same tick: one wins, the other is discarded
+    asyncio.get_running_loop().call_later(0.1, gate.set)
+
+    deltas = router.stream(MESSAGES)
+    head = await deltas.__anext__()
+    winner, loser = (first, second) if head.startswith("first") else (second, first)
+    assert len(second.started_at) == 1
+    await asyncio.sleep(0)
+    # the loser got as far as its first delta, so it was closed by discard, not cancelled
+    assert loser.opened == 1 and loser.closed == 1 and winner.closed == 0
+
+    assert [head] + [delta async for delta in deltas] == [f"{winner.model}:1", f"{winner.model}:2"]
+    assert winner.closed == 1
+
+
+@pytest.mark.asyncio
+async def test_failing_route_fails_over_to_the_next():
+    broken, healthy = StubEndpoint("broken", fail=True), StubEndpoint("healthy", latency=0.01)
+    router = _router(broken, healthy)
+
+    assert await router.complete(MESSAGES) == "healthy"
+    assert router.routes[0].stats.error_rate() == 1.0
+    assert len(healthy.started_at) == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_route_is_demoted_by_expected_latency():
+    slow, fast = StubEndpoint("slow", latency=0.05), StubEndpoint("fast", latency=0.01)
+    router = _router(slow, fast, hedge=False)
+    _seed(router.routes[0], 0.5, samples=5)
+    _seed(router.routes[1], 0.05, samples=5)
+
+    assert [route.name for route in router.ranked()] == ["fast", "slow"]
+    assert await router.complete(MESSAGES) == "fast"
+    assert slow.started_at == []